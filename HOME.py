@@ -1,5 +1,8 @@
 import streamlit as st
 
+from utils.aquecimento import iniciar_aquecimento
+from utils.imagens import imagem_cabecalho
+
 # Caminho para a imagem local
 image_path = './image/genn.png'
 
@@ -7,8 +10,13 @@ image_path = './image/genn.png'
 # image_url = 'https://url.da.sua/imagem.png'
 
 # Adicionando a imagem ao sidebar
-st.sidebar.image(image_path, use_column_width=True)
+st.sidebar.image(imagem_cabecalho(image_path), use_column_width=True)
 
 # Se estiver usando uma URL
 # st.sidebar.image(image_url, use_column_width=True)
 
+# Pré-carregar todas as planilhas e os agregados padrão em segundo plano (uma única vez
+# por processo), para o primeiro acesso a cada contrato já encontrar os caches prontos.
+# Chamado depois do logo, para a primeira pintura não esperar pela thread.
+iniciar_aquecimento()
+
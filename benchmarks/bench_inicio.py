@@ -0,0 +1,187 @@
+# Benchmark do início das páginas: para HOME.py e cada arquivo de pages/, mede num
+# processo novo o tempo de importação dos módulos da página (só as instruções de
+# import do topo do arquivo) e quais módulos pesados ela carrega, e em outro processo
+# novo a primeira pintura (tempo até o primeiro elemento exibido) e o tempo total da
+# primeira execução ("fria") e de um rerun ("quente"), com o `streamlit` falso e as
+# planilhas lidas de CSVs locais (apontadas no próprio processo filho, dentro da
+# execução fria, que paga a importação de utils.fontes como a página pagaria).
+#
+# Uso: python -m benchmarks.bench_inicio --dados DIR [--saida relatorio.json]
+#          [--comparar anterior.json] [--repeticoes N] [paginas ...]
+#
+# Cada medida é a menor entre as repetições. DIR é o mesmo de benchmarks.bench_paginas.
+import argparse
+import ast
+import dataclasses
+import datetime
+import glob
+import json
+import os
+import platform
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+from benchmarks import streamlit_falso
+from benchmarks.bench_paginas import RAIZ, _commit, _formatar_tempo
+
+# Módulos pesados acompanhados na importação de cada página
+MODULOS_PESADOS = ["pandas", "pyarrow", "altair", "numpy", "PIL"]
+
+# Medidas do relatório: (chave, título)
+MEDIDAS = [
+    ("importacao", "import ms"),
+    ("fria_pintura", "1ª pintura fria"),
+    ("fria_total", "total fria"),
+    ("quente_pintura", "1ª pintura quente"),
+    ("quente_total", "total quente"),
+]
+
+
+# Função para rodar, no processo filho, só as instruções de import do topo da página
+def _importar(pagina):
+    with open(os.path.join(RAIZ, pagina), encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+    imports = ast.Module(
+        body=[no for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))], type_ignores=[]
+    )
+    codigo = compile(imports, pagina, "exec")
+
+    inicio = time.perf_counter()
+    exec(codigo, {"__name__": "__main__"})
+    return {
+        "importacao": time.perf_counter() - inicio,
+        "modulos": [modulo for modulo in MODULOS_PESADOS if modulo in sys.modules],
+    }
+
+
+# Função para apontar cada planilha para o <nome>.csv de `dados`, no processo filho
+def _apontar_planilhas(dados):
+    import utils.fontes as fontes
+
+    for nome, fonte in list(fontes.FONTES.items()):
+        fontes.FONTES[nome] = dataclasses.replace(fonte, url=os.path.join(dados, f"{nome}.csv"))
+
+
+# Função para rodar, no processo filho, a página duas vezes (fria e quente)
+def _executar(pagina, dados):
+    resultado = {"erro": None}
+    for fase in ("fria", "quente"):
+        streamlit_falso.primeira_pintura = None
+        inicio = time.perf_counter()
+        if fase == "fria":
+            _apontar_planilhas(dados)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                runpy.run_path(os.path.join(RAIZ, pagina), run_name="__main__")
+        except Exception as e:
+            resultado["erro"] = resultado["erro"] or f"{type(e).__name__}: {e}"
+        fim = time.perf_counter()
+        pintura = streamlit_falso.primeira_pintura
+        resultado[f"{fase}_pintura"] = None if pintura is None else pintura - inicio
+        resultado[f"{fase}_total"] = fim - inicio
+    return resultado
+
+
+# Função para medir uma página num processo novo, no modo "importacao" ou "execucao"
+def _medir_em_processo(modo, pagina, dados):
+    ambiente = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="bench-snapshots-") as diretorio_snapshots:
+        ambiente["DASHBOARDS_SNAPSHOTS"] = diretorio_snapshots
+        processo = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_inicio", "--dados", dados, "--filho", modo, pagina],
+            cwd=RAIZ, env=ambiente, capture_output=True, text=True,
+        )
+    if processo.returncode != 0:
+        return {"erro": processo.stderr.strip().splitlines()[-1] if processo.stderr.strip() else "falhou"}
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+# Função para medir uma página `repeticoes` vezes em processos novos (vale a menor)
+def medir_pagina(pagina, dados, repeticoes):
+    resultado = {chave: None for chave, _ in MEDIDAS}
+    resultado.update(modulos=[], erro=None)
+    for _ in range(repeticoes):
+        for modo in ("importacao", "execucao"):
+            medida = _medir_em_processo(modo, pagina, dados)
+            resultado["erro"] = resultado["erro"] or medida.pop("erro", None)
+            resultado["modulos"] = medida.pop("modulos", resultado["modulos"])
+            for chave, valor in medida.items():
+                if valor is not None and (resultado[chave] is None or valor < resultado[chave]):
+                    resultado[chave] = valor
+    return resultado
+
+
+def imprimir_relatorio(relatorio):
+    cabecalho = "".join(f" {titulo:>17}" for _, titulo in MEDIDAS)
+    print(f"{'página':<42}{cabecalho}  módulos pesados na importação")
+    for pagina, medida in relatorio["paginas"].items():
+        tempos = "".join(f" {_formatar_tempo(medida[chave]):>17}" for chave, _ in MEDIDAS)
+        print(f"{pagina:<42}{tempos}  {', '.join(medida['modulos']) or '-'}")
+        if medida["erro"]:
+            print(f"{'':<42} erro: {medida['erro']}")
+
+
+# Função para comparar duas execuções medida a medida (variação em relação à anterior)
+def imprimir_comparacao(anterior, atual):
+    print(f"\nComparação com {anterior['commit'] or '?'} ({anterior['data']})")
+    print(f"{'página':<42} {'medida':<18} {'antes':>10} {'depois':>10} {'variação':>9}")
+    for pagina, medida in atual["paginas"].items():
+        base = anterior["paginas"].get(pagina)
+        if base is None:
+            continue
+        for chave, titulo in MEDIDAS:
+            antes = (base.get(chave) or 0) * 1000
+            depois = (medida[chave] or 0) * 1000
+            variacao = f"{(depois - antes) / antes * 100:+.0f}%" if antes else "-"
+            print(f"{pagina:<42} {titulo:<18} {antes:>10.1f} {depois:>10.1f} {variacao:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do início das páginas do painel")
+    parser.add_argument("paginas", nargs="*", help="scripts a medir (padrão: HOME.py e pages/*.py)")
+    parser.add_argument("--dados", required=True, help="diretório com um <nome>.csv por planilha")
+    parser.add_argument("--saida", help="arquivo JSON onde gravar o relatório")
+    parser.add_argument("--comparar", help="relatório JSON anterior para comparar")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--filho", choices=["importacao", "execucao"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processo filho: mede uma única página e devolve o resultado numa linha JSON
+    if args.filho:
+        streamlit_falso.instalar()
+        sys.path.insert(0, RAIZ)
+        if args.filho == "importacao":
+            print(json.dumps(_importar(args.paginas[0])))
+        else:
+            print(json.dumps(_executar(args.paginas[0], os.path.abspath(args.dados))))
+        return
+
+    paginas = args.paginas or ["HOME.py"] + sorted(
+        os.path.relpath(caminho, RAIZ) for caminho in glob.glob(os.path.join(RAIZ, "pages", "*.py"))
+    )
+    dados = os.path.abspath(args.dados)
+    relatorio = {
+        "commit": _commit(),
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "dados": dados,
+        "repeticoes": args.repeticoes,
+        "paginas": {pagina: medir_pagina(pagina, dados, args.repeticoes) for pagina in paginas},
+    }
+
+    imprimir_relatorio(relatorio)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            imprimir_comparacao(json.load(arquivo), relatorio)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
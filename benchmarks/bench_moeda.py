@@ -0,0 +1,65 @@
+# Benchmark do conversor de moeda: conversão célula a célula (como as páginas faziam)
+# contra a conversão vetorizada de utils.moeda, em 100 mil e 1 milhão de linhas.
+#
+# Uso: python -m benchmarks.bench_moeda
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.moeda import converter_moeda
+
+COLUNAS = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
+
+
+# Gera colunas com valores "R$ 1.234,56", vazios, negativos e linhas "TOTAL"
+def gerar_valores(linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    tabela = {}
+    for col in COLUNAS:
+        valores = rng.uniform(0, 50000, linhas)
+        texto = pd.Series(valores).map(
+            lambda v: "R$ " + f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        )
+        sorteio = rng.random(linhas)
+        negativos = (sorteio >= 0.05) & (sorteio < 0.07)
+        texto[negativos] = "-" + texto[negativos]
+        texto[sorteio < 0.05] = np.nan
+        texto[sorteio > 0.999] = "TOTAL"
+        tabela[col] = texto
+    return pd.DataFrame(tabela)
+
+
+# Conversão original: uma chamada Python por célula
+def converter_por_celula(tabela):
+    resultado = tabela.copy()
+    for col in COLUNAS:
+        resultado[col] = tabela[col].apply(
+            lambda x: pd.to_numeric(
+                str(x).replace("R$", "").replace(".", "").replace(",", "."),
+                errors="coerce",
+            )
+        )
+    return resultado
+
+
+def medir(funcao, tabela, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(tabela)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    print(f"{'linhas':>10} {'por célula (s)':>16} {'vetorizado (s)':>16} {'ganho':>8}")
+    for linhas in [100_000, 1_000_000]:
+        tabela = gerar_valores(linhas)
+        antes = medir(converter_por_celula, tabela, repeticoes=1)
+        depois = medir(converter_moeda, tabela)
+        print(f"{linhas:>10} {antes:>16.3f} {depois:>16.3f} {antes / depois:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# Benchmark das páginas: roda HOME.py e cada arquivo de pages/ com um `streamlit`
+# falso e as planilhas lidas de CSVs locais, medindo o tempo total, o tempo de cada
+# seção (download, leitura, preparação, derivados, gráficos, tabelas e o restante da
+# página) e o pico de memória. Cada página roda "fria" (sem nenhum cache, como o
+# primeiro acesso ao processo) e "quente" (rerun com os caches já preenchidos).
+#
+# Uso: python -m benchmarks.bench_paginas --dados DIR [--saida relatorio.json]
+#          [--comparar anterior.json] [--repeticoes N] [--clicar-botoes] [paginas ...]
+#
+# DIR precisa ter um <nome>.csv para cada planilha de utils.fontes (os CSVs podem ser
+# gerados por benchmarks.gerar_planilhas). O relatório JSON de uma execução pode ser
+# passado em --comparar numa execução seguinte para ver a variação de cada medida.
+import argparse
+import dataclasses
+import datetime
+import glob
+import json
+import os
+import platform
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+
+from benchmarks import streamlit_falso
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ordem das seções no relatório; "página" é o tempo que sobra no código da própria página
+SECOES = ["download", "leitura", "preparação", "snapshot", "derivados", "gráficos", "tabelas", "página"]
+
+
+# Cronômetro por seção. O tempo de uma seção aninhada em outra conta só para a mais
+# interna. Só a thread principal é medida; o tempo que ela passa esperando as threads
+# de download fica na seção em que ela estava.
+class Cronometro:
+    def __init__(self):
+        self.tempos = defaultdict(float)
+        self._pilha = []
+        self._marca = None
+
+    @contextmanager
+    def secao(self, nome):
+        if threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        agora = time.perf_counter()
+        if self._pilha:
+            self.tempos[self._pilha[-1]] += agora - self._marca
+        self._pilha.append(nome)
+        self._marca = agora
+        try:
+            yield
+        finally:
+            agora = time.perf_counter()
+            self.tempos[self._pilha.pop()] += agora - self._marca
+            self._marca = agora
+
+
+# Cronômetro em uso na execução atual (trocado a cada rodada)
+_cronometro = Cronometro()
+
+
+@contextmanager
+def _medir(nome):
+    with _cronometro.secao(nome):
+        yield
+
+
+# Função para envolver `funcao` numa seção do cronômetro
+def _cronometrar(nome, funcao):
+    def medida(*args, **kwargs):
+        with _medir(nome):
+            return funcao(*args, **kwargs)
+
+    medida.__wrapped__ = funcao
+    return medida
+
+
+# Função para apontar as planilhas para os CSVs locais e instrumentar o carregador,
+# as agregações e a montagem dos gráficos. O atualizador e o aquecimento em segundo
+# plano são desligados.
+def _preparar_ambiente(dados):
+    import pandas as pd
+
+    import utils.aquecimento as aquecimento
+    import utils.carregamento as carregamento
+    import utils.fontes as fontes
+    import utils.graficos as graficos
+    import utils.indices as indices
+    import utils.metricas as metricas
+
+    faltando = [nome for nome in fontes.FONTES if not os.path.exists(os.path.join(dados, f"{nome}.csv"))]
+    if faltando:
+        sys.exit(f"CSV ausente em {dados}: {', '.join(f'{nome}.csv' for nome in faltando)}")
+
+    for nome, fonte in list(fontes.FONTES.items()):
+        fontes.FONTES[nome] = dataclasses.replace(
+            fonte,
+            url=os.path.join(dados, f"{nome}.csv"),
+            preparar=_cronometrar("preparação", fonte.preparar),
+        )
+
+    carregamento.iniciar_atualizador = lambda: None
+    aquecimento.iniciar_aquecimento = lambda: None
+    carregamento._requisitar = _cronometrar("download", carregamento._requisitar)
+    carregamento.carregar_fontes = _cronometrar("download", carregamento.carregar_fontes)
+    carregamento.salvar_snapshot = _cronometrar("snapshot", carregamento.salvar_snapshot)
+    carregamento.salvar_csv = _cronometrar("snapshot", carregamento.salvar_csv)
+    carregamento.ler_snapshot = _cronometrar("snapshot", carregamento.ler_snapshot)
+    carregamento.calcular_derivado = _cronometrar("derivados", carregamento.calcular_derivado)
+    pd.read_csv = _cronometrar("leitura", pd.read_csv)
+
+    for modulo in (metricas, indices):
+        for nome in dir(modulo):
+            objeto = getattr(modulo, nome)
+            if callable(objeto) and not isinstance(objeto, type) and getattr(objeto, "__module__", None) == modulo.__name__:
+                setattr(modulo, nome, _cronometrar("derivados", objeto))
+    graficos.contar_por_dia = _cronometrar("derivados", graficos.contar_por_dia)
+    graficos.especificar_grafico = _cronometrar("gráficos", graficos.especificar_grafico)
+
+
+# Função para esvaziar os caches do processo e os snapshots, como num processo novo
+def _limpar_caches(diretorio_snapshots):
+    import utils.carregamento as carregamento
+    import utils.graficos as graficos
+    import utils.imagens as imagens
+
+    carregamento._estado.clear()
+    carregamento._derivados.clear()
+    graficos._especificacoes.clear()
+    imagens._imagens.clear()
+    for caminho in glob.glob(os.path.join(diretorio_snapshots, "*")):
+        if os.path.isdir(caminho):
+            shutil.rmtree(caminho)
+        else:
+            os.remove(caminho)
+
+
+# Função para rodar uma página uma vez. Devolve o tempo total, o tempo por seção,
+# o pico de memória (MB, só quando `memoria`) e o erro, se a página falhar.
+def _rodar(pagina, st, memoria=False):
+    global _cronometro
+    _cronometro = Cronometro()
+    if memoria:
+        tracemalloc.start()
+
+    erro = None
+    inicio = time.perf_counter()
+    try:
+        with _cronometro.secao("página"), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            runpy.run_path(os.path.join(RAIZ, pagina), run_name="__main__")
+    except Exception as e:
+        erro = f"{type(e).__name__}: {e}"
+    total = time.perf_counter() - inicio
+
+    pico = None
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return total, dict(_cronometro.tempos), pico, erro
+
+
+# Função para medir uma página fria e quente: `repeticoes` rodadas de cada (vale a
+# menor), mais uma rodada de cada com tracemalloc para o pico de memória
+def medir_pagina(pagina, st, diretorio_snapshots, repeticoes):
+    resultado = {}
+    for fase in ("fria", "quente"):
+        resultado[fase] = {"tempo": None, "secoes": {}, "pico_mb": None, "erro": None}
+
+    for _ in range(repeticoes):
+        _limpar_caches(diretorio_snapshots)
+        st.session_state.clear()
+        for fase in ("fria", "quente"):
+            total, secoes, _, erro = _rodar(pagina, st)
+            atual = resultado[fase]
+            if atual["tempo"] is None or total < atual["tempo"]:
+                atual.update(tempo=total, secoes=secoes)
+            atual["erro"] = atual["erro"] or erro
+
+    _limpar_caches(diretorio_snapshots)
+    st.session_state.clear()
+    for fase in ("fria", "quente"):
+        resultado[fase]["pico_mb"] = _rodar(pagina, st, memoria=True)[2]
+    return resultado
+
+
+# Função para descobrir o commit atual (vazio fora de um repositório git)
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _formatar_tempo(segundos):
+    return "-" if segundos is None else f"{segundos * 1000:.1f}"
+
+
+def imprimir_relatorio(relatorio):
+    print(f"{'página':<42} {'fase':<7} {'total ms':>10} {'pico MB':>9}  seções (ms)")
+    for pagina, fases in relatorio["paginas"].items():
+        for fase, medida in fases.items():
+            secoes = "  ".join(
+                f"{secao}={medida['secoes'][secao] * 1000:.1f}" for secao in SECOES if secao in medida["secoes"]
+            )
+            pico = "-" if medida["pico_mb"] is None else f"{medida['pico_mb']:.1f}"
+            print(f"{pagina:<42} {fase:<7} {_formatar_tempo(medida['tempo']):>10} {pico:>9}  {secoes}")
+            if medida["erro"]:
+                print(f"{'':<42} erro: {medida['erro']}")
+
+
+# Função para comparar duas execuções medida a medida (variação em relação à anterior)
+def imprimir_comparacao(anterior, atual):
+    print(f"\nComparação com {anterior['commit'] or '?'} ({anterior['data']})")
+    print(f"{'página':<42} {'fase':<7} {'medida':<12} {'antes':>10} {'depois':>10} {'variação':>9}")
+    for pagina, fases in atual["paginas"].items():
+        for fase, medida in fases.items():
+            base = anterior["paginas"].get(pagina, {}).get(fase)
+            if base is None:
+                continue
+            linhas = [("total ms", base["tempo"], medida["tempo"], 1000)]
+            linhas += [
+                (secao, base["secoes"].get(secao), medida["secoes"].get(secao), 1000)
+                for secao in SECOES
+                if secao in base["secoes"] or secao in medida["secoes"]
+            ]
+            linhas.append(("pico MB", base["pico_mb"], medida["pico_mb"], 1))
+            for nome, antes, depois, escala in linhas:
+                antes = (antes or 0) * escala
+                depois = (depois or 0) * escala
+                variacao = f"{(depois - antes) / antes * 100:+.0f}%" if antes else "-"
+                print(f"{pagina:<42} {fase:<7} {nome:<12} {antes:>10.1f} {depois:>10.1f} {variacao:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das páginas do painel")
+    parser.add_argument("paginas", nargs="*", help="scripts a medir (padrão: HOME.py e pages/*.py)")
+    parser.add_argument("--dados", required=True, help="diretório com um <nome>.csv por planilha")
+    parser.add_argument("--saida", help="arquivo JSON onde gravar o relatório")
+    parser.add_argument("--comparar", help="relatório JSON anterior para comparar")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--clicar-botoes", action="store_true", help="todos os botões voltam clicados")
+    args = parser.parse_args()
+
+    paginas = args.paginas or ["HOME.py"] + sorted(
+        os.path.relpath(caminho, RAIZ) for caminho in glob.glob(os.path.join(RAIZ, "pages", "*.py"))
+    )
+
+    # O streamlit falso e o diretório de snapshots precisam estar no lugar antes dos imports de utils
+    st = streamlit_falso.instalar(clicar_botoes=args.clicar_botoes)
+    streamlit_falso.medir = _medir
+    diretorio_snapshots = tempfile.mkdtemp(prefix="bench-snapshots-")
+    os.environ["DASHBOARDS_SNAPSHOTS"] = diretorio_snapshots
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+    _preparar_ambiente(os.path.abspath(args.dados))
+
+    relatorio = {
+        "commit": _commit(),
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "dados": os.path.abspath(args.dados),
+        "repeticoes": args.repeticoes,
+        "clicar_botoes": args.clicar_botoes,
+        "paginas": {},
+    }
+    for pagina in paginas:
+        relatorio["paginas"][pagina] = medir_pagina(pagina, st, diretorio_snapshots, args.repeticoes)
+    # Pico de memória residente do processo inteiro (ru_maxrss vem em KB no Linux)
+    relatorio["pico_processo_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    imprimir_relatorio(relatorio)
+    print(f"\nPico de memória do processo: {relatorio['pico_processo_mb']:.0f} MB")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            imprimir_comparacao(json.load(arquivo), relatorio)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
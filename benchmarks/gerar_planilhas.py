@@ -0,0 +1,409 @@
+# Gerador de planilhas sintéticas com o mesmo layout das planilhas publicadas de cada
+# contrato (BANRISUL, CORREIOS, SERPRO, TRE-RS e as quatro da SOP), para medir como as
+# páginas escalam de 10 mil a 10 milhões de linhas sem depender do Google Sheets.
+#
+# Os CSVs reproduzem o que as páginas recebem de verdade: datas "dd/mm/aaaa", valores
+# "R$ 1.234,56" (com vazios, zeros e alguns negativos), o vocabulário de status de cada
+# contrato e a distribuição desigual dos dados. Poucos orçamentistas, disciplinas e
+# prédios concentram a maior parte das OS, o volume cresce ao longo do tempo e quase
+# nada é recebido no fim de semana. Datas e valores seguem o andamento da OS: uma OS
+# recebida ainda não tem orçamento e só as finalizadas têm data de finalização. Uma
+# pequena parte dos textos vem com espaços sobrando ou acentos decompostos, como os
+# digitados à mão na planilha.
+#
+# Uso: python -m benchmarks.gerar_planilhas DIR [--linhas 100000] [--semente 0]
+#          [planilhas ...]
+#
+# Grava um <nome>.csv por planilha de utils.fontes em DIR (todas, se nenhuma for
+# indicada), no formato lido por benchmarks.bench_paginas --dados DIR.
+import argparse
+import os
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Linhas geradas e gravadas por vez (limita a memória nas planilhas de milhões de linhas)
+LINHAS_POR_BLOCO = 250_000
+
+# Período das OS e formato das datas nas planilhas
+INICIO = pd.Timestamp("2023-01-02")
+FIM = pd.Timestamp("2024-12-31")
+FORMATO_DATA = "%d/%m/%Y"
+
+# Layout comum das planilhas de OS; "LOCAL" e "PRÉDIO" mudam de nome em cada contrato
+COLUNAS_OS = [
+    "ID", "CONTRATO", "OS", "MCU", "NORMAL / URGENTE", "FISCAL", "PREVENTIVA / CORRETIVA",
+    "DISCIPLINAS", "DESCRIÇÃO DO SERVIÇO", "DESCRIÇÃO DETALHADA", "LOCAL", "PRÉDIO",
+    "MUNICÍPIO", "DATA RECEBIDO", "PRAZO DE ATENDIMENTO", "PREVISÃO DE INÍCIO",
+    "PREVISÃO DE FINALIZAÇÃO", "STATUS*", "DATA DE ATUALIZAÇÃO", "VALOR ORÇADO", "DATA ORÇADO",
+    "ORÇAMENTISTA", "VALOR INSUMO", "VALOR MÃO DE OBRA", "PERCENTUAL FD", "VALOR FD",
+    "VALOR GASTO", "VALOR APROVADO", "DATA APROVADO", "LUCRO BRUTO", "VALOR PAGO",
+    "DESCRIÇÃO DA EXECUÇÃO", "EXECUTADO", "EXECUTADO (%)", "DATA EXECUÇÃO (INÍCIO)",
+    "DATA FINALIZADO", "NOTA FISCAL", "DATA DE EMISSÃO DA NF", "GLOSA", "MEDIÇÃO",
+    "QUANTIDADE DE REVISÕES", "VISTORIA TECNICO", "VISTORIA DATA", "LEVANTAMENTO",
+    "ASSINATURA DE FINALIZAÇÃO", "FD", "RM", "COMPRAS STATUS", "PRAZO P/ ENTREGA",
+    "OBS: COMPRAS", "SOLICITANTE", "SC", "OC", "RESPONSAVEL TÉCNICO", "OBSERVAÇÃO",
+]
+
+# Status de cada contrato com o peso de cada um e a etapa da OS que ele representa
+# (0 recebida, 1 orçada, 2 em execução, 3 finalizada). As finalizadas são a maioria.
+STATUS = {
+    "banrisul": {
+        "RECEBIDO": (6, 0), "LEVANTAMENTO": (3, 0), "EM ORÇAMENTO": (4, 0), "VERIFICAR": (1, 0),
+        "EM ESPERA": (2, 0), "ORÇADO": (6, 1), "PROGRAMADO": (3, 1), "PREVENTIVA": (2, 1),
+        "COMPRAS": (4, 2), "EXECUÇÃO": (7, 2), "EXECUTADO": (18, 3), "FINALIZADO": (30, 3),
+        "NOTA FISCAL": (8, 3), "MEDIÇÃO": (6, 3),
+    },
+    "correios": {
+        "RECEBIDO": (5, 0), "LEVANTAMENTO": (4, 0), "ORÇADO RECEBIDO": (9, 1),
+        "SOLICITAÇÃO DE MATERIAL": (4, 2), "COMPRAS": (4, 2), "EXECUÇÃO": (8, 2),
+        "EXECUTADO": (12, 3), "FINALIZADO": (34, 3), "ASSINADO": (20, 3),
+    },
+    "serpro": {
+        "RECEBIDO": (6, 0), "LEVANTAMENTO": (5, 0), "ORÇADO RECEBIDO": (10, 1),
+        "SOLICITAÇÃO DE MATERIAL": (5, 2), "COMPRAS": (5, 2), "EXECUÇÃO": (9, 2),
+        "EXECUTADO": (15, 3), "FINALIZADO": (45, 3),
+    },
+    "trers": {
+        "RECEBIDO": (7, 0), "EM ORÇAMENTO": (5, 0), "ORÇADO": (8, 1), "APROVADO": (8, 1),
+        "EXECUÇÃO": (10, 2), "EXECUTADO": (20, 3), "FINALIZADO": (38, 3), "CANCELADO": (4, 3),
+    },
+}
+
+# Contratos de cada planilha de OS (o primeiro concentra a maior parte das OS)
+CONTRATOS = {
+    "banrisul": ["0100215/2023", "0200215/2023"],
+    "correios": ["9912345678", "9912345679"],
+    "serpro": ["SERPRO 045/2023"],
+    "trers": ["TRE-RS 012/2023", "TRE-RS 031/2024"],
+}
+
+# Nomes das colunas de local e prédio em cada contrato
+COLUNAS_LOCAL = {
+    "banrisul": ("LOCAL", "PRÉDIO"),
+    "correios": ("LOCAL CORREIOS", "PREDIO CORREIOS"),
+    "serpro": ("LOCAL", "PRÉDIO"),
+    "trers": ("LOCAL", "PRÉDIO"),
+}
+
+DISCIPLINAS = [
+    "CIVIL", "ELÉTRICA", "HIDRÁULICA", "PINTURA", "ALVENARIA", "COBERTURA", "SERRALHERIA",
+    "MARCENARIA", "VIDRAÇARIA", "IMPERMEABILIZAÇÃO", "DRYWALL", "COMUNICAÇÃO VISUAL",
+    "INSUMOS E EQUIPAMENTOS", "PERSIANA", "EXTINTOR", "AR CONDICIONADO",
+]
+ORCAMENTISTAS = [
+    "JOÃO PEDRO", "ANA PAULA", "MÁRCIO", "LUCIANA", "FERNANDO", "PATRÍCIA", "RODRIGO", "JÉSSICA",
+]
+MUNICIPIOS = [
+    "PORTO ALEGRE", "CANOAS", "CAXIAS DO SUL", "PELOTAS", "SANTA MARIA", "NOVO HAMBURGO",
+    "SÃO LEOPOLDO", "GRAVATAÍ", "PASSO FUNDO", "RIO GRANDE", "VIAMÃO", "ALVORADA",
+    "SANTA CRUZ DO SUL", "URUGUAIANA", "BAGÉ", "ERECHIM", "IJUÍ", "SANTO ÂNGELO",
+]
+SERVICOS = [
+    "TROCA DE LÂMPADAS", "REPARO EM INFILTRAÇÃO", "PINTURA DE FACHADA", "TROCA DE TORNEIRA",
+    "REVISÃO DO QUADRO ELÉTRICO", "CONSERTO DE PORTA", "DESENTUPIMENTO", "TROCA DE VIDRO",
+    "MANUTENÇÃO DE CALHAS", "INSTALAÇÃO DE PERSIANA", "RECARGA DE EXTINTORES",
+    "REPARO NO FORRO", "TROCA DE FECHADURA", "REGULARIZAÇÃO DE PISO",
+]
+RESPONSAVEIS = ["ENG. CARLOS", "ENG. BEATRIZ", "ARQ. RENATA", "TÉC. GUSTAVO", "TÉC. SIMONE"]
+
+# Status da planilha de OAT da SOP; "ARQUIVADO" fica de fora dos que a página mostra
+STATUS_OAT = {
+    "RECEBIDO": 8, "EM ORÇAMENTO": 6, "CANCELADO": 2, "VISTORIA": 5, "CORREÇÃO ORÇAMENTO": 3,
+    "APROVADO": 10, "ENVIADO": 7, "ARQUIVADO": 1,
+}
+
+# Colunas das planilhas da SOP (as mesmas de utils.fontes)
+COLUNAS_ETAPAS_SOP = [
+    "ETAPA 1 (CR.F.FINANCEIRO) 30 DIAS", "ETAPA 2 (CR.F.FINANCEIRO) 60 DIAS",
+    "ETAPA 3 (CR.F.FINANCEIRO) 90 DIAS", "ETAPA 4 (CR.F.FINANCEIRO) 120 DIAS",
+    "ETAPA 5 (CR.F.FINANCEIRO) 150 DIAS", "ETAPA 6 (CR.F.FINANCEIRO) 180 DIAS",
+    "VALOR DO CONTRATO",
+]
+COLUNAS_MEDICAO_SOP = [
+    "MEDIÇÃO JUNHO", "MEDIÇÃO JULHO", "MEDIÇÃO AGOSTO", "MEDIÇÃO SETEMBRO",
+    "MEDIÇÃO OUTUBRO", "MEDIÇÃO NOVEMBRO", "MEDIÇÃO DEZEMBRO",
+]
+
+# Troca de pontos e vírgulas do formato americano ("1,234.56") para o brasileiro; no
+# americano, os valores ficam como o Python os formata
+_FORMATO_BR = str.maketrans(",.", ".,")
+_FORMATO_US = str.maketrans("", "")
+
+
+# Função para sortear `n` posições de uma lista com peso decrescente (lei de Zipf):
+# o primeiro item aparece bem mais que o segundo, que aparece mais que o terceiro...
+def sortear_zipf(rng, itens, n, expoente=1.1):
+    pesos = 1.0 / np.arange(1, len(itens) + 1) ** expoente
+    return rng.choice(len(itens), size=n, p=pesos / pesos.sum())
+
+
+# Função para sortear `n` valores de um dicionário {valor: peso}
+def sortear_pesos(rng, pesos, n):
+    valores = list(pesos)
+    p = np.array([pesos[valor] for valor in valores], dtype=float)
+    return np.array(valores, dtype=object)[rng.choice(len(valores), size=n, p=p / p.sum())]
+
+
+# Função para sujar uma parte dos textos como na digitação manual: espaço sobrando no
+# fim ou acentos decompostos (NFD), que a preparação precisa normalizar
+def sujar_textos(rng, textos, proporcao=0.02):
+    textos = textos.copy()
+    sorteio = rng.random(len(textos))
+    espaco = sorteio < proporcao / 2
+    decomposto = (sorteio >= proporcao / 2) & (sorteio < proporcao)
+    textos[espaco] = [f"{texto} " for texto in textos[espaco]]
+    textos[decomposto] = [unicodedata.normalize("NFD", texto) for texto in textos[decomposto]]
+    return textos
+
+
+# Função para formatar valores como "R$ 1.234,56" ("-R$ 1.234,56" quando negativos); com
+# `formato=_FORMATO_US`, como "R$ 1,234.56"
+def formatar_moeda(valores, formato=_FORMATO_BR):
+    return np.array(
+        [
+            ("-R$ " if valor < 0 else "R$ ") + f"{abs(valor):,.2f}".translate(formato)
+            for valor in valores.tolist()
+        ],
+        dtype=object,
+    )
+
+
+# Função para gerar uma coluna de valores monetários com distribuição log-normal
+# (muitos serviços pequenos e poucos muito caros), vazios, zeros e alguns negativos
+def gerar_valores(rng, n, mediana=3000.0, vazios=0.05, maximo=None, formato=_FORMATO_BR):
+    valores = np.round(rng.lognormal(np.log(mediana), 1.0, n), 2)
+    if maximo is not None:
+        valores = np.minimum(valores, maximo)
+    sorteio = rng.random(n)
+    valores[sorteio < 0.01] = 0.0
+    valores[(sorteio >= 0.01) & (sorteio < 0.015)] *= -1
+    texto = formatar_moeda(valores, formato)
+    texto[rng.random(n) < vazios] = ""
+    return texto, valores
+
+
+# Dias que podem aparecer nas planilhas (com folga para as esperas depois do período),
+# já formatados; a última posição é a célula vazia das datas ausentes
+_DIAS = pd.date_range(INICIO - pd.Timedelta(days=400), FIM + pd.Timedelta(days=400))
+_DIAS_FORMATADOS = np.append(_DIAS.strftime(FORMATO_DATA).to_numpy(dtype=object), "")
+
+
+# Função para formatar datas como "dd/mm/aaaa" (NaT vira célula vazia) consultando os
+# dias já formatados, sem formatar célula a célula
+def formatar_datas(datas):
+    deslocamento = (datas - _DIAS[0]).days.to_numpy(dtype="float64")
+    vazio = len(_DIAS)
+    posicao = np.where(np.isnan(deslocamento) | (deslocamento < 0) | (deslocamento >= vazio), vazio, deslocamento)
+    return _DIAS_FORMATADOS[posicao.astype(np.int64)]
+
+
+# Função para sortear as datas de recebimento: o volume cresce ao longo do período e
+# quase todas as OS recebidas no fim de semana passam para a sexta-feira anterior
+def sortear_recebimento(rng, n):
+    dias = (FIM - INICIO).days
+    datas = INICIO + pd.to_timedelta((rng.random(n) ** 0.7 * dias).astype(np.int64), unit="D")
+    dia_semana = datas.dayofweek.to_numpy()
+    recuar = np.where(dia_semana >= 5, dia_semana - 4, 0) * (rng.random(n) < 0.9)
+    return datas - pd.to_timedelta(recuar, unit="D")
+
+
+# Função para somar a `datas` uma espera sorteada (em dias), só onde `mascara` é verdadeira
+def avancar(rng, datas, media_dias, mascara):
+    espera = pd.to_timedelta(np.ceil(rng.exponential(media_dias, len(datas))), unit="D")
+    return (datas + espera).where(mascara)
+
+
+# Função para gerar um bloco de `n` OS de um contrato, a partir do número `primeira`
+def gerar_os(rng, contrato, primeira, n):
+    status = sortear_pesos(rng, {s: peso for s, (peso, _) in STATUS[contrato].items()}, n)
+    etapa = pd.Series(status).map({s: etapa for s, (_, etapa) in STATUS[contrato].items()}).to_numpy()
+
+    recebido = sortear_recebimento(rng, n)
+    orcado = avancar(rng, recebido, 6, etapa >= 1)
+    aprovado = avancar(rng, orcado, 4, etapa >= 1)
+    inicio_execucao = avancar(rng, aprovado, 7, etapa >= 2)
+    finalizado = avancar(rng, inicio_execucao, 12, etapa >= 3)
+    atualizacao = recebido
+    for data in (orcado, inicio_execucao, finalizado):
+        atualizacao = data.where(data.notna(), atualizacao)
+
+    # Valores só existem a partir do orçamento; insumo e mão de obra dividem o orçado
+    valor_orcado, orcado_num = gerar_valores(rng, n)
+    valor_orcado[etapa < 1] = ""
+    fracao_insumo = rng.uniform(0.3, 0.7, n)
+    valor_insumo = formatar_moeda(np.round(orcado_num * fracao_insumo, 2))
+    valor_mao_de_obra = formatar_moeda(np.round(orcado_num * (1 - fracao_insumo), 2))
+    valor_insumo[(etapa < 1) | (rng.random(n) < 0.08)] = ""
+    valor_mao_de_obra[(etapa < 1) | (rng.random(n) < 0.08)] = ""
+    valor_aprovado = np.where(etapa >= 1, formatar_moeda(np.round(orcado_num * 0.97, 2)), "")
+    valor_pago = np.where(etapa >= 3, formatar_moeda(np.round(orcado_num * 0.95, 2)), "")
+    valor_gasto, _ = gerar_valores(rng, n, mediana=1800.0, vazios=0.4)
+    valor_fd, _ = gerar_valores(rng, n, mediana=300.0, vazios=0.6)
+    lucro, _ = gerar_valores(rng, n, mediana=900.0, vazios=0.5)
+
+    predios = [f"PRÉDIO {i:03d}" for i in range(1, 201)]
+    locais = [f"UNIDADE {i:03d}" for i in range(1, 121)]
+    coluna_local, coluna_predio = COLUNAS_LOCAL[contrato]
+    ids = np.arange(primeira, primeira + n)
+    anos = recebido.year.to_numpy()
+    servico = np.array(SERVICOS, dtype=object)[sortear_zipf(rng, SERVICOS, n, 0.8)]
+    nf = np.where(etapa >= 3, [f"NF {i:07d}" for i in ids], "")
+
+    return pd.DataFrame({
+        "ID": ids,
+        "CONTRATO": np.array(CONTRATOS[contrato], dtype=object)[sortear_zipf(rng, CONTRATOS[contrato], n)],
+        "OS": [f"{ano}/{i:07d}" for ano, i in zip(anos, ids)],
+        "MCU": rng.integers(10000, 99999, n),
+        "NORMAL / URGENTE": sujar_textos(rng, np.where(rng.random(n) < 0.82, "NORMAL", "URGENTE").astype(object)),
+        "FISCAL": np.array(RESPONSAVEIS, dtype=object)[rng.integers(0, len(RESPONSAVEIS), n)],
+        "PREVENTIVA / CORRETIVA": np.where(rng.random(n) < 0.25, "PREVENTIVA", "CORRETIVA"),
+        "DISCIPLINAS": sujar_textos(rng, np.array(DISCIPLINAS, dtype=object)[sortear_zipf(rng, DISCIPLINAS, n)]),
+        "DESCRIÇÃO DO SERVIÇO": servico,
+        "DESCRIÇÃO DETALHADA": [f"{texto} - SOLICITAÇÃO Nº {i}" for texto, i in zip(servico, ids)],
+        "LOCAL": np.array(locais, dtype=object)[sortear_zipf(rng, locais, n, 0.9)],
+        "PRÉDIO": sujar_textos(rng, np.array(predios, dtype=object)[sortear_zipf(rng, predios, n, 0.9)]),
+        "MUNICÍPIO": sujar_textos(rng, np.array(MUNICIPIOS, dtype=object)[sortear_zipf(rng, MUNICIPIOS, n, 1.3)]),
+        "DATA RECEBIDO": formatar_datas(recebido),
+        "PRAZO DE ATENDIMENTO": formatar_datas(recebido + pd.Timedelta(days=30)),
+        "PREVISÃO DE INÍCIO": formatar_datas(avancar(rng, recebido, 10, etapa >= 1)),
+        "PREVISÃO DE FINALIZAÇÃO": formatar_datas(avancar(rng, recebido, 30, etapa >= 1)),
+        "STATUS*": sujar_textos(rng, status),
+        "DATA DE ATUALIZAÇÃO": formatar_datas(atualizacao),
+        "VALOR ORÇADO": valor_orcado,
+        "DATA ORÇADO": formatar_datas(orcado),
+        "ORÇAMENTISTA": sujar_textos(
+            rng, np.where(etapa >= 1, np.array(ORCAMENTISTAS, dtype=object)[sortear_zipf(rng, ORCAMENTISTAS, n)], "")
+        ),
+        "VALOR INSUMO": valor_insumo,
+        "VALOR MÃO DE OBRA": valor_mao_de_obra,
+        "PERCENTUAL FD": np.where(etapa >= 1, "5%", ""),
+        "VALOR FD": valor_fd,
+        "VALOR GASTO": valor_gasto,
+        "VALOR APROVADO": valor_aprovado,
+        "DATA APROVADO": formatar_datas(aprovado),
+        "LUCRO BRUTO": lucro,
+        "VALOR PAGO": valor_pago,
+        "DESCRIÇÃO DA EXECUÇÃO": np.where(etapa >= 2, servico, ""),
+        "EXECUTADO": np.where(etapa >= 3, "SIM", "NÃO"),
+        "EXECUTADO (%)": np.where(etapa >= 3, "100%", np.where(etapa == 2, "50%", "0%")),
+        "DATA EXECUÇÃO (INÍCIO)": formatar_datas(inicio_execucao),
+        "DATA FINALIZADO": formatar_datas(finalizado),
+        "NOTA FISCAL": nf,
+        "DATA DE EMISSÃO DA NF": formatar_datas(avancar(rng, finalizado, 5, nf != "")),
+        "GLOSA": np.where(rng.random(n) < 0.03, "SIM", ""),
+        "MEDIÇÃO": np.where(etapa >= 3, [f"{data.month:02d}/{data.year}" if data == data else "" for data in finalizado], ""),
+        "QUANTIDADE DE REVISÕES": rng.poisson(0.4, n),
+        "VISTORIA TECNICO": np.array(RESPONSAVEIS, dtype=object)[rng.integers(0, len(RESPONSAVEIS), n)],
+        "VISTORIA DATA": formatar_datas(avancar(rng, recebido, 3, rng.random(n) < 0.6)),
+        "LEVANTAMENTO": np.where(rng.random(n) < 0.5, "SIM", ""),
+        "ASSINATURA DE FINALIZAÇÃO": np.where(etapa >= 3, "ASSINADO", ""),
+        "FD": np.where(rng.random(n) < 0.3, "SIM", ""),
+        "RM": np.where(etapa >= 2, [f"RM {i}" for i in ids], ""),
+        "COMPRAS STATUS": np.where(etapa == 2, "AGUARDANDO ENTREGA", np.where(etapa >= 3, "ENTREGUE", "")),
+        "PRAZO P/ ENTREGA": formatar_datas(avancar(rng, orcado, 15, etapa == 2)),
+        "OBS: COMPRAS": "",
+        "SOLICITANTE": np.array(RESPONSAVEIS, dtype=object)[rng.integers(0, len(RESPONSAVEIS), n)],
+        "SC": np.where(etapa >= 2, [f"SC {i}" for i in ids], ""),
+        "OC": np.where(etapa >= 2, [f"OC {i}" for i in ids], ""),
+        "RESPONSAVEL TÉCNICO": np.array(RESPONSAVEIS, dtype=object)[sortear_zipf(rng, RESPONSAVEIS, n)],
+        "OBSERVAÇÃO": np.where(rng.random(n) < 0.2, "VERIFICAR COM O FISCAL", ""),
+    })[COLUNAS_OS].rename(columns={"LOCAL": coluna_local, "PRÉDIO": coluna_predio})
+
+
+# Função para gerar a linha única de totais e saldos dos lotes da SOP
+def gerar_sop_ois(rng, primeira, n):
+    valores, _ = gerar_valores(rng, 4, mediana=2_500_000.0, vazios=0)
+    return pd.DataFrame([valores], columns=["V.TOTAL LOTE 1", "V.TOTAL LOTE 4", "SALDO LOTE 1", "SALDO LOTE 4"])
+
+
+# Função para gerar os contratos da SOP com o valor de cada etapa financeira. Os valores
+# ficam abaixo de R$ 1 milhão, como nas etapas das escolas, e seguem o formato que a
+# preparação da planilha lê ("R$ 1,234.56": vírgulas removidas, ponto decimal).
+def gerar_sop_etapas(rng, primeira, n):
+    escolas = [f"ESCOLA {i:04d}" for i in range(1, max(n // 5, 1) + 1)]
+    etapas = {
+        col: gerar_valores(rng, n, mediana=60000.0, vazios=0.03, maximo=999_999.99, formato=_FORMATO_US)[0]
+        for col in COLUNAS_ETAPAS_SOP
+    }
+    return pd.DataFrame({
+        "ID": np.arange(primeira, primeira + n),
+        "Nº CONTRATO": [f"{i:04d}/2024" for i in range(primeira, primeira + n)],
+        "STATUS": sortear_pesos(rng, {"EM EXECUÇÃO": 6, "CONCLUÍDO": 3, "PARALISADO": 1}, n),
+        "PREDIO": np.array(escolas, dtype=object)[sortear_zipf(rng, escolas, n, 0.8)],
+        **etapas,
+    })
+
+
+# Função para gerar as medições mensais por escola (a linha "TOTAL" é acrescentada no fim)
+def gerar_sop_medicoes(rng, primeira, n):
+    medicoes = {col: gerar_valores(rng, n, mediana=40000.0, vazios=0.1)[0] for col in COLUNAS_MEDICAO_SOP}
+    return pd.DataFrame({"ESCOLA": [f"ESCOLA {i:04d}" for i in range(primeira, primeira + n)], **medicoes})
+
+
+# Função para gerar as OAT da SOP (status com espaços sobrando, como na planilha)
+def gerar_sop_oat(rng, primeira, n):
+    lotes = ["1", "4", "2", "3"]
+    return pd.DataFrame({
+        "STATUS": sujar_textos(rng, sortear_pesos(rng, STATUS_OAT, n), proporcao=0.1),
+        "PREDIO": [f"ESCOLA {i:04d}" for i in sortear_zipf(rng, range(max(n // 3, 1)), n, 0.8) + 1],
+        "LOTE": np.array(lotes, dtype=object)[sortear_zipf(rng, lotes, n)],
+        "MUNICIPIO": np.array(MUNICIPIOS, dtype=object)[sortear_zipf(rng, MUNICIPIOS, n, 1.3)],
+    })
+
+
+# Geradores de cada planilha, pelo nome usado em utils.fontes
+GERADORES = {
+    "banrisul": lambda rng, primeira, n: gerar_os(rng, "banrisul", primeira, n),
+    "correios": lambda rng, primeira, n: gerar_os(rng, "correios", primeira, n),
+    "serpro": lambda rng, primeira, n: gerar_os(rng, "serpro", primeira, n),
+    "trers": lambda rng, primeira, n: gerar_os(rng, "trers", primeira, n),
+    "sop_ois": gerar_sop_ois,
+    "sop_etapas": gerar_sop_etapas,
+    "sop_medicoes": gerar_sop_medicoes,
+    "sop_oat": gerar_sop_oat,
+}
+
+
+# Função para gravar uma planilha com `linhas` linhas em blocos. A planilha de OIS tem
+# sempre uma linha; a de medições termina com a linha de totais. Como na exportação do
+# Google Sheets, só os campos com vírgula vão entre aspas.
+def gravar_planilha(caminho, nome, linhas, semente):
+    rng = np.random.default_rng([semente, list(GERADORES).index(nome)])
+    if nome == "sop_ois":
+        linhas = 1
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        for primeira in range(0, linhas, LINHAS_POR_BLOCO):
+            bloco = GERADORES[nome](rng, primeira + 1, min(LINHAS_POR_BLOCO, linhas - primeira))
+            if nome == "correios":
+                # Na planilha dos Correios o cabeçalho do ID vem com um espaço na frente
+                bloco = bloco.rename(columns={"ID": " ID"})
+            bloco.to_csv(arquivo, header=primeira == 0, index=False)
+        if nome == "sop_medicoes":
+            pd.DataFrame([["TOTAL"] * (len(COLUNAS_MEDICAO_SOP) + 1)]).to_csv(arquivo, header=False, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera planilhas sintéticas no layout de cada contrato")
+    parser.add_argument("destino", help="diretório onde gravar os CSVs")
+    parser.add_argument("planilhas", nargs="*", help=f"planilhas a gerar (padrão: todas): {', '.join(GERADORES)}")
+    parser.add_argument("--linhas", type=int, default=100_000, help="linhas de cada planilha")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+    desconhecidas = [nome for nome in args.planilhas if nome not in GERADORES]
+    if desconhecidas:
+        parser.error(f"planilha desconhecida: {', '.join(desconhecidas)}")
+
+    os.makedirs(args.destino, exist_ok=True)
+    for nome in args.planilhas or list(GERADORES):
+        caminho = os.path.join(args.destino, f"{nome}.csv")
+        inicio = time.perf_counter()
+        gravar_planilha(caminho, nome, args.linhas, args.semente)
+        tamanho = os.path.getsize(caminho) / 1e6
+        print(f"{nome:<14} {tamanho:>10.1f} MB {time.perf_counter() - inicio:>8.1f} s  {caminho}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# Módulo `streamlit` falso para rodar as páginas sem servidor nem navegador.
+# Os widgets devolvem o valor padrão (o botão pode ser forçado a "clicado"), os
+# elementos de layout são contêineres vazios e a saída é descartada, mas gráficos e
+# tabelas passam pela mesma serialização que o Streamlit faria antes de enviá-los,
+# para que o custo deles apareça nas medições. O Altair, o pandas e o pyarrow só são
+# importados quando a página exibe o primeiro gráfico ou tabela, como no Streamlit.
+import sys
+import time
+import types
+from contextlib import contextmanager
+
+# Seções medidas pelo benchmark; `medir(nome)` devolve um gerenciador de contexto.
+# O padrão não mede nada e é trocado pelo cronômetro do benchmark.
+medir = None
+
+
+@contextmanager
+def _sem_medicao(nome):
+    yield
+
+
+# Instante (perf_counter) em que a página exibiu o primeiro elemento; None até lá
+primeira_pintura = None
+
+
+def _pintar():
+    global primeira_pintura
+    if primeira_pintura is None:
+        primeira_pintura = time.perf_counter()
+
+
+# Estado da sessão: dicionário que também aceita acesso por atributo
+class EstadoSessao(dict):
+    def __getattr__(self, nome):
+        try:
+            return self[nome]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def __setattr__(self, nome, valor):
+        self[nome] = valor
+
+    def __delattr__(self, nome):
+        del self[nome]
+
+
+# Função para serializar uma tabela como o Streamlit faz antes de enviá-la (Arrow).
+# Como no Streamlit, colunas de objetos com tipos misturados viram texto quando a
+# conversão direta falha.
+def _serializar_tabela(dados):
+    import pandas as pd
+    import pyarrow as pa
+
+    if isinstance(dados, pd.Series):
+        dados = dados.to_frame()
+    if isinstance(dados, pd.DataFrame):
+        with (medir or _sem_medicao)("tabelas"):
+            try:
+                pa.Table.from_pandas(dados)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                objetos = dados.select_dtypes("object").columns
+                pa.Table.from_pandas(dados.astype({coluna: str for coluna in objetos}))
+
+
+# Contêiner falso: colunas, abas, sidebar e o próprio módulo expõem os mesmos elementos
+class Conteiner:
+    def __init__(self, modulo):
+        self._modulo = modulo
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+    def __getattr__(self, nome):
+        return getattr(self._modulo, nome)
+
+
+def _nada(*args, **kwargs):
+    return None
+
+
+def _exibir(*args, **kwargs):
+    _pintar()
+
+
+def instalar(clicar_botoes=False):
+    st = types.ModuleType("streamlit")
+    st.session_state = EstadoSessao()
+    st.query_params = {}
+    st.clicar_botoes = clicar_botoes
+
+    def columns(spec, *args, **kwargs):
+        quantidade = spec if isinstance(spec, int) else len(spec)
+        return [Conteiner(st) for _ in range(quantidade)]
+
+    def tabs(nomes, *args, **kwargs):
+        return [Conteiner(st) for _ in nomes]
+
+    def conteiner(*args, **kwargs):
+        return Conteiner(st)
+
+    def button(*args, **kwargs):
+        return st.clicar_botoes
+
+    def checkbox(label, value=False, key=None, **kwargs):
+        return st.session_state.get(key, value) if key else value
+
+    def selectbox(label, options, index=0, key=None, **kwargs):
+        opcoes = list(options)
+        if key and key in st.session_state:
+            return st.session_state[key]
+        return opcoes[index] if opcoes and index is not None else None
+
+    def radio(label, options, index=0, key=None, **kwargs):
+        return selectbox(label, options, index, key)
+
+    def multiselect(label, options, default=None, key=None, **kwargs):
+        return st.session_state.get(key, list(default or [])) if key else list(default or [])
+
+    def valor_padrao(padrao):
+        def widget(label, value=None, key=None, **kwargs):
+            if key and key in st.session_state:
+                return st.session_state[key]
+            if value is None:
+                return kwargs.get("min_value", padrao)
+            return value
+        return widget
+
+    # O Streamlit extrai os dados do gráfico sem o limite de linhas do Altair
+    def altair_chart(grafico, *args, **kwargs):
+        import altair as alt
+
+        _pintar()
+        with (medir or _sem_medicao)("gráficos"), alt.data_transformers.enable("default", max_rows=None):
+            grafico.to_dict()
+
+    def vega_lite_chart(*args, **kwargs):
+        _pintar()
+
+    def dataframe(dados=None, *args, **kwargs):
+        _pintar()
+        _serializar_tabela(dados)
+
+    def write(*args, **kwargs):
+        _pintar()
+        for dado in args:
+            _serializar_tabela(dado)
+
+    # Decoradores de cache e fragmentos apenas chamam a função decorada
+    def decorador(funcao=None, **kwargs):
+        if funcao is None:
+            return lambda f: f
+        return funcao
+
+    st.columns = columns
+    st.tabs = tabs
+    st.container = st.expander = st.empty = st.form = st.spinner = st.status = conteiner
+    st.button = st.form_submit_button = st.download_button = button
+    st.checkbox = st.toggle = checkbox
+    st.selectbox = selectbox
+    st.radio = radio
+    st.multiselect = multiselect
+    st.date_input = valor_padrao(None)
+    st.text_input = st.text_area = valor_padrao("")
+    st.number_input = st.slider = valor_padrao(0)
+    st.altair_chart = altair_chart
+    st.vega_lite_chart = vega_lite_chart
+    st.dataframe = st.table = st.data_editor = dataframe
+    st.write = write
+    st.cache_data = st.cache_resource = st.fragment = decorador
+    for nome in ["set_page_config", "rerun", "stop"]:
+        setattr(st, nome, _nada)
+    for nome in [
+        "markdown", "title", "header", "subheader", "caption", "text", "metric", "image",
+        "error", "warning", "info", "success", "exception", "divider", "plotly_chart",
+        "line_chart", "bar_chart", "json", "code",
+    ]:
+        setattr(st, nome, _exibir)
+    st.sidebar = Conteiner(st)
+
+    sys.modules["streamlit"] = st
+    return st
@@ -1,98 +1,78 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
 from datetime import datetime
-import os
+from functools import partial
+
+from utils.carregamento import calcular_derivado, carregar_fonte, carregar_indices
+from utils.graficos import contar_por_dia, especificar_grafico
+from utils.imagens import imagem_cabecalho
+from utils.importacao import alt, pd
+from utils.indices import filtrar_intervalo
+from utils.metricas import (
+    COLUNAS_CUBO,
+    calcular_metricas_diarias,
+    fatiar_cubo,
+    montar_cubo,
+)
+from utils.perfil import exibir_perfil, iniciar_perfil, marcar
+from utils.tabelas import exibir_tabela_paginada
 
 # Configurar layout da página para largura completa
 st.set_page_config(layout="wide")
 
+# Perfil desta execução da página (só com ?perfil=1 na URL ou DASHBOARDS_PERFIL=1)
+iniciar_perfil("BANRISUL")
+marcar("cabeçalho")
+
 # Caminho relativo para a imagem
 image_path = "image/banr.png"
 
 # Exibir a imagem se o arquivo existir
 try:
-    st.image(image_path, use_column_width=True)
+    st.image(imagem_cabecalho(image_path), use_column_width=True)
 except FileNotFoundError:
     st.error("Erro ao abrir a imagem. Verifique o caminho do arquivo.")
 
-# URL do arquivo CSV do Google Sheets
-url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTlBXGpJ6j2i-C6edJ-eB4X2DD-7KA7Ys1bIR-tCFeYt6B-7S30bcY_bd0TUtEbttDiMBtexpD-2C4-/pub?gid=1319816246&single=true&output=csv"
-
-
-# Função para carregar e limpar os dados do CSV
-def carregar_dados(url):
+# Função para obter a planilha do Banrisul já tipada pelo carregador compartilhado
+def carregar_dados():
     try:
-        tabela = pd.read_csv(url)
-        date_columns = ["DATA RECEBIDO", "DATA FINALIZADO", "DATA ORÇADO"]
-        for col in date_columns:
-            if col in tabela.columns:
-                tabela[col] = pd.to_datetime(
-                    tabela[col], format="%d/%m/%Y", dayfirst=True, errors="coerce"
-                )
-
-        # Convertendo colunas de valores para numérico
-        valor_columns = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
-        for col in valor_columns:
-            if col in tabela.columns:
-                tabela[col] = tabela[col].apply(
-                    lambda x: pd.to_numeric(
-                        str(x).replace("R$", "").replace(".", "").replace(",", "."),
-                        errors="coerce",
-                    )
-                )
-
-        return tabela
+        return carregar_fonte("banrisul")
 
     except Exception as e:
         st.error(f"Ocorreu um erro ao carregar o arquivo CSV: {e}")
         return None
 
 
-# Função para calcular métricas com base em contrato e datas
-def calcular_metricas(tabela, contrato, data_inicio, data_fim, data_dia):
-    data_inicio = pd.to_datetime(data_inicio)
-    data_fim = pd.to_datetime(data_fim)
-    data_dia = pd.to_datetime(data_dia)
+# Status das OS ainda em aberto
+STATUS_ABERTO = [
+    "RECEBIDO",
+    "ORÇADO",
+    "COMPRAS",
+    "EXECUÇÃO",
+    "VERIFICAR",
+    "PREVENTIVA",
+    "LEVANTAMENTO",
+    "EM ORÇAMENTO",
+    "EM ESPERA",
+    "PROGRAMADO",
+]
 
-    filtro_contrato = (
-        tabela if contrato == "Todos" else tabela[tabela["CONTRATO"] == contrato]
-    )
-    filtro_periodo = filtro_contrato[
-        (filtro_contrato["DATA RECEBIDO"] >= data_inicio)
-        & (filtro_contrato["DATA RECEBIDO"] <= data_fim)
-    ]
 
-    total_os_recebidas_dia = filtro_contrato[
-        filtro_contrato["DATA RECEBIDO"].dt.date == data_dia.date()
-    ].shape[0]
-    total_executadas_dia = filtro_contrato[
-        (filtro_contrato["DATA FINALIZADO"].dt.date == data_dia.date())
-        & (filtro_contrato["STATUS*"] == "EXECUTADO")
-    ].shape[0]
-
-    return {
-        "total_os_recebidas": filtro_periodo.shape[0],
-        "total_os_recebidas_dia": total_os_recebidas_dia,
-        "total_executadas_dia": total_executadas_dia,
-    }
+# Função para obter o cubo de métricas do Banrisul (remontado só quando a planilha muda)
+def carregar_cubo():
+    return calcular_derivado("banrisul", montar_cubo, colunas=COLUNAS_CUBO)
 
 
 # Função para filtrar ocorrências abertas e finalizadas
 def filtrar_ocorrencias(
-    tabela, disciplinas, status_aberto, status_finalizado, contrato
+    cubo, disciplinas, status_aberto, status_finalizado, contrato
 ):
-    abertas = tabela[
-        tabela["DISCIPLINAS"].isin(disciplinas)
-        & tabela["STATUS*"].isin(status_aberto)
-        & ((tabela["CONTRATO"] == contrato) | (contrato == "Todos"))
-    ]
-    finalizadas = tabela[
-        tabela["DISCIPLINAS"].isin(disciplinas)
-        & tabela["STATUS*"].isin(status_finalizado)
-        & ((tabela["CONTRATO"] == contrato) | (contrato == "Todos"))
-    ]
-    return len(abertas), len(finalizadas)
+    abertas = fatiar_cubo(
+        cubo, "recebido", contrato, status=status_aberto, disciplinas=disciplinas
+    )
+    finalizadas = fatiar_cubo(
+        cubo, "recebido", contrato, status=status_finalizado, disciplinas=disciplinas
+    )
+    return int(abertas["QUANTIDADE"].sum()), int(finalizadas["QUANTIDADE"].sum())
 
 
 # Função para calcular percentual de finalização
@@ -102,23 +82,11 @@ def calcular_percentual(abertas, finalizadas):
 
 
 # Função para exibir resultados por lote
-def exibir_resultados_lote(tabela, contrato, disciplinas, titulo):
-    status_aberto = [
-        "RECEBIDO",
-        "ORÇADO",
-        "COMPRAS",
-        "EXECUÇÃO",
-        "VERIFICAR",
-        "PREVENTIVA",
-        "LEVANTAMENTO",
-        "EM ORÇAMENTO",
-        "EM ESPERA",
-        "PROGRAMADO",
-    ]
+def exibir_resultados_lote(cubo, contrato, disciplinas, titulo):
     status_finalizado = ["FINALIZADO", "NOTA FISCAL", "EXECUTADO", "MEDIÇÃO"]
 
     abertas, finalizadas = filtrar_ocorrencias(
-        tabela, disciplinas, status_aberto, status_finalizado, contrato
+        cubo, disciplinas, STATUS_ABERTO, status_finalizado, contrato
     )
     percentual = calcular_percentual(abertas, finalizadas)
 
@@ -134,12 +102,19 @@ def exibir_resultados_lote(tabela, contrato, disciplinas, titulo):
 
 
 # Função para exibir tabela de disciplinas finalizadas hoje
-def exibir_tabelas(tabela, data_inicio, data_fim, data_dia, contrato):
-    data_dia = pd.to_datetime(data_dia)
-
-    filtro_tabela = tabela[
-        (tabela["DATA FINALIZADO"].dt.date == data_dia.date())
-        & ((tabela["CONTRATO"] == contrato) | (contrato == "Todos"))
+def exibir_tabelas(tabela, indices, data_inicio, data_fim, data_dia, contrato):
+    data_dia = pd.to_datetime(data_dia).normalize()
+
+    filtro_tabela = filtrar_intervalo(
+        tabela,
+        indices,
+        "DATA FINALIZADO",
+        data_dia,
+        data_dia + pd.Timedelta(days=1),
+        incluir_fim=False,
+    )
+    filtro_tabela = filtro_tabela[
+        (filtro_tabela["CONTRATO"] == contrato) | (contrato == "Todos")
     ]
 
     total_disciplina_finalizadas = (
@@ -162,7 +137,9 @@ def exibir_tabelas(tabela, data_inicio, data_fim, data_dia, contrato):
 
 
 # Função para exibir métricas de lote
-def exibir_metricas_lote(tabela, data_inicio, data_fim, data_dia):
+def exibir_metricas_lote(metricas):
+    lote1 = metricas.contrato("0100215/2023")
+    lote2 = metricas.contrato("0200215/2023")
     metricas_lote = {
         "Métrica": [
             "Total de OS Recebidas Hoje - Lote 01",
@@ -173,32 +150,12 @@ def exibir_metricas_lote(tabela, data_inicio, data_fim, data_dia):
             "Total de OS Finalizadas Hoje - Lote 02",
         ],
         "Quantidade": [
-            calcular_metricas(tabela, "0100215/2023", data_inicio, data_fim, data_dia)[
-                "total_os_recebidas_dia"
-            ],
-            calcular_metricas(
-                tabela,
-                "0100215/2023",
-                datetime(2024, 8, 1).date(),
-                datetime(2024, 8, 31).date(),
-                data_dia,
-            )["total_os_recebidas"],
-            calcular_metricas(tabela, "0200215/2023", data_inicio, data_fim, data_dia)[
-                "total_os_recebidas_dia"
-            ],
-            calcular_metricas(
-                tabela,
-                "0200215/2023",
-                datetime(2024, 8, 1).date(),
-                datetime(2024, 8, 31).date(),
-                data_dia,
-            )["total_os_recebidas"],
-            calcular_metricas(tabela, "0100215/2023", data_inicio, data_fim, data_dia)[
-                "total_executadas_dia"
-            ],
-            calcular_metricas(tabela, "0200215/2023", data_inicio, data_fim, data_dia)[
-                "total_executadas_dia"
-            ],
+            lote1.recebidas_dia,
+            lote1.recebidas_periodo["agosto"],
+            lote2.recebidas_dia,
+            lote2.recebidas_periodo["agosto"],
+            lote1.executadas_dia,
+            lote2.executadas_dia,
         ],
     }
 
@@ -207,7 +164,8 @@ def exibir_metricas_lote(tabela, data_inicio, data_fim, data_dia):
 
 
 # Função principal para exibir a página "Diário"
-def diario(url):
+def diario():
+    marcar("diário")
     st.markdown(
         """
         <style>
@@ -243,13 +201,12 @@ def diario(url):
         unsafe_allow_html=True,
     )
 
-    tabela = carregar_dados(url)
+    tabela = carregar_dados()
     if tabela is not None:
+        cubo = carregar_cubo()
         contratos_interesse = ["0100215/2023", "0200215/2023"]
-        filtro_contratos = tabela["CONTRATO"].isin(contratos_interesse)
-        dados_filtrados = tabela[filtro_contratos]
-
-        contagem_os = dados_filtrados["CONTRATO"].value_counts()
+        contagem_os = fatiar_cubo(cubo, "recebido").groupby("CONTRATO", observed=True)["QUANTIDADE"].sum()
+        contagem_os = contagem_os[contagem_os.index.isin(contratos_interesse)]
         total_os = contagem_os.sum()
 
         st.markdown(
@@ -257,18 +214,10 @@ def diario(url):
             unsafe_allow_html=True,
         )
 
-        tabela["DATA RECEBIDO"] = pd.to_datetime(
-            tabela["DATA RECEBIDO"], format="%d/%m/%Y", dayfirst=True, errors="coerce"
-        )
-        tabela["DATA FINALIZADO"] = pd.to_datetime(
-            tabela["DATA FINALIZADO"], format="%d/%m/%Y", dayfirst=True, errors="coerce"
+        agosto_2024 = fatiar_cubo(
+            cubo, "recebido", inicio=datetime(2024, 8, 1), fim=datetime(2024, 8, 31)
         )
-
-        agosto_2024 = tabela[
-            (tabela["DATA RECEBIDO"].dt.month == 8)
-            & (tabela["DATA RECEBIDO"].dt.year == 2024)
-        ]
-        total_os_agosto = agosto_2024.shape[0]
+        total_os_agosto = agosto_2024["QUANTIDADE"].sum()
 
         col1, col2, col3, col4, col5 = st.columns(5, gap="small")
 
@@ -324,7 +273,7 @@ def diario(url):
         col1, col2, col3, col4 = st.columns(4, gap="large")
         with col1:
             exibir_resultados_lote(
-                tabela,
+                cubo,
                 "0100215/2023",
                 [
                     "ALVENARIA",
@@ -346,11 +295,11 @@ def diario(url):
             )
         with col2:
             exibir_resultados_lote(
-                tabela, "0100215/2023", ["ELÉTRICA"], "Elétrica lote 1"
+                cubo, "0100215/2023", ["ELÉTRICA"], "Elétrica lote 1"
             )
         with col3:
             exibir_resultados_lote(
-                tabela,
+                cubo,
                 "0200215/2023",
                 [
                     "ALVENARIA",
@@ -372,7 +321,7 @@ def diario(url):
             )
         with col4:
             exibir_resultados_lote(
-                tabela, "0200215/2023", ["ELÉTRICA"], "Elétrica Lote 2"
+                cubo, "0200215/2023", ["ELÉTRICA"], "Elétrica Lote 2"
             )
 
         st.markdown("<div class='horizontal-line'></div>", unsafe_allow_html=True)
@@ -400,22 +349,16 @@ def diario(url):
                 unsafe_allow_html=True,
             )
 
-            total_os_recebidas_dia = (
-                calcular_metricas(
-                    tabela, "0100215/2023", data_inicio, data_fim, data_dia
-                )["total_os_recebidas_dia"]
-                + calcular_metricas(
-                    tabela, "0200215/2023", data_inicio, data_fim, data_dia
-                )["total_os_recebidas_dia"]
-            )
-            total_os_finalizadas_dia = (
-                calcular_metricas(
-                    tabela, "0100215/2023", data_inicio, data_fim, data_dia
-                )["total_executadas_dia"]
-                + calcular_metricas(
-                    tabela, "0200215/2023", data_inicio, data_fim, data_dia
-                )["total_executadas_dia"]
+            # Todas as métricas do dia, para todos os contratos, recortadas do cubo
+            metricas = calcular_metricas_diarias(
+                cubo,
+                data_dia,
+                {"agosto": (datetime(2024, 8, 1).date(), datetime(2024, 8, 31).date())},
             )
+            lote1 = metricas.contrato("0100215/2023")
+            lote2 = metricas.contrato("0200215/2023")
+            total_os_recebidas_dia = lote1.recebidas_dia + lote2.recebidas_dia
+            total_os_finalizadas_dia = lote1.executadas_dia + lote2.executadas_dia
 
             metricas_totais = {
                 "Métrica": [
@@ -439,79 +382,38 @@ def diario(url):
             """,
                 unsafe_allow_html=True,
             )
-            exibir_metricas_lote(tabela, data_inicio, data_fim, data_dia)
-            exibir_tabelas(tabela, data_inicio, data_fim, data_dia, contrato)
-
-
-# Função para carregar e limpar dados do CSV
-def carregar_dados_2(url):
-    df = pd.read_csv(url)
-    df_filtered = df[
-        [
-            "CONTRATO",
-            "VALOR ORÇADO",
-            "DATA ORÇADO",
-            "VALOR INSUMO",
-            "VALOR MÃO DE OBRA",
-            "STATUS*",
-            "ORÇAMENTISTA",
-        ]
-    ].copy()
-
-    df_filtered["DATA ORÇADO"] = pd.to_datetime(
-        df_filtered["DATA ORÇADO"], format="%d/%m/%Y", errors="coerce"
-    )
-
-    def convert_to_numeric(value):
-        if isinstance(value, str):
-            value = value.replace("R$", "").replace(".", "").replace(",", ".")
-        return pd.to_numeric(value, errors="coerce")
-
-    for col in ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]:
-        df_filtered[col] = df_filtered[col].apply(convert_to_numeric)
-
-    df_filtered = df_filtered[
-        df_filtered["DATA ORÇADO"].dt.year.isin([2023, 2024, 2025, 2026, 2027])
-    ]
-    df_filtered["AnoMes"] = (
-        df_filtered["DATA ORÇADO"].dt.to_period("M").dt.to_timestamp()
-    )
-    df_filtered["Dia"] = df_filtered["DATA ORÇADO"].dt.date
-
-    return df_filtered
+            exibir_metricas_lote(metricas)
+            exibir_tabelas(
+                tabela, carregar_indices("banrisul"), data_inicio, data_fim, data_dia, contrato
+            )
 
 
 # Função para calcular métricas financeiras
-def calcular_metricas_financeiras(df, contrato):
-    df_contrato = df[df["CONTRATO"] == contrato]
-    data_atual = datetime.now().date()
-    mes_atual = datetime.now().month
-    ano_atual = datetime.now().year
-    df_today = df_contrato[df_contrato["Dia"] == data_atual]
+def calcular_metricas_financeiras(cubo, contrato):
+    data_atual = pd.Timestamp(datetime.now().date())
+    inicio_mes = data_atual.replace(day=1)
+    fim_mes = inicio_mes + pd.offsets.MonthEnd(0)
+    df_contrato = fatiar_cubo(
+        cubo, "orcado", contrato, datetime(2023, 1, 1), datetime(2027, 12, 31)
+    )
+    df_today = df_contrato[df_contrato["DIA"] == data_atual]
     df_month = df_contrato[
-        (df_contrato["DATA ORÇADO"].dt.month == mes_atual)
-        & (df_contrato["DATA ORÇADO"].dt.year == ano_atual)
+        (df_contrato["DIA"] >= inicio_mes) & (df_contrato["DIA"] <= fim_mes)
     ]
     df_finalizado = df_contrato[
         df_contrato["STATUS*"].isin(["FINALIZADO", "EXECUTADO"])
     ]
 
-    valor_orcado_hoje = df_today["VALOR ORÇADO"].sum() if not df_today.empty else 0
-    valor_insumo_hoje = df_today["VALOR INSUMO"].sum() if not df_today.empty else 0
-    valor_mao_de_obra_hoje = (
-        df_today["VALOR MÃO DE OBRA"].sum() if not df_today.empty else 0
-    )
-    orcamentos_hoje = df_today.shape[0] if not df_today.empty else 0
+    valor_orcado_hoje = df_today["VALOR ORÇADO"].sum()
+    valor_insumo_hoje = df_today["VALOR INSUMO"].sum()
+    valor_mao_de_obra_hoje = df_today["VALOR MÃO DE OBRA"].sum()
+    orcamentos_hoje = int(df_today["QUANTIDADE"].sum())
 
-    valor_orcado_mes = df_month["VALOR ORÇADO"].sum() if not df_month.empty else 0
-    valor_insumo_mes = df_month["VALOR INSUMO"].sum() if not df_month.empty else 0
-    valor_mao_de_obra_mes = (
-        df_month["VALOR MÃO DE OBRA"].sum() if not df_month.empty else 0
-    )
+    valor_orcado_mes = df_month["VALOR ORÇADO"].sum()
+    valor_insumo_mes = df_month["VALOR INSUMO"].sum()
+    valor_mao_de_obra_mes = df_month["VALOR MÃO DE OBRA"].sum()
 
-    valor_total_orcado = (
-        df_finalizado["VALOR ORÇADO"].sum() if not df_finalizado.empty else 0
-    )
+    valor_total_orcado = df_finalizado["VALOR ORÇADO"].sum()
 
     return (
         valor_orcado_hoje,
@@ -557,6 +459,7 @@ def exibir_metricas_tabela(metrics, title):
 
 # Função principal para exibir a página "Orçamento"
 def orcamento():
+    marcar("orçamento")
     st.markdown(
         """
         <style>
@@ -579,10 +482,10 @@ def orcamento():
         unsafe_allow_html=True,
     )
 
-    df_filtered = carregar_dados_2(url)
+    cubo = carregar_cubo()
 
-    metrics_lote1 = calcular_metricas_financeiras(df_filtered, "0100215/2023")
-    metrics_lote2 = calcular_metricas_financeiras(df_filtered, "0200215/2023")
+    metrics_lote1 = calcular_metricas_financeiras(cubo, "0100215/2023")
+    metrics_lote2 = calcular_metricas_financeiras(cubo, "0200215/2023")
 
     col3, col4 = st.columns(2)
     with col3:
@@ -594,66 +497,27 @@ def orcamento():
 
 
 if __name__ == "__main__":
-    diario(url)
+    diario()
     orcamento()
 
 if __name__ == "__main__":
     orcamento()
-def carregar_dados(url):
-    try:
-        tabela = pd.read_csv(url)
-        date_columns = ["DATA RECEBIDO", "DATA FINALIZADO", "DATA ORÇADO"]
-        for col in date_columns:
-            if col in tabela.columns:
-                tabela[col] = pd.to_datetime(
-                    tabela[col], format="%d/%m/%Y",
-                    dayfirst=True,
-                    errors="coerce"
-                )
-
-        # Convertendo colunas de valores para numérico
-        valor_columns = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
-        for col in valor_columns:
-            if col in tabela.columns:
-                tabela[col] = tabela[col].apply(lambda x: pd.to_numeric(str(x).replace("R$", "").replace(".", "").replace(",", "."), errors="coerce"))
-
-        return tabela
 
-    except Exception as e:
-        st.error(f"Ocorreu um erro ao carregar o arquivo CSV: {e}")
-        return None
-
-def calcular_metricas(tabela, data_inicio, data_fim, contrato):
-    if contrato != "Todos":
-        tabela = tabela[tabela["CONTRATO"] == contrato]
-
-    filtro_recebidas = tabela[
-        (tabela["DATA RECEBIDO"] >= data_inicio) &
-        (tabela["DATA RECEBIDO"] <= data_fim)
-    ]
-    filtro_finalizadas = tabela[
-        (tabela["DATA FINALIZADO"] >= data_inicio) &
-        (tabela["DATA FINALIZADO"] <= data_fim) &
-        (tabela["STATUS*"].isin(["EXECUTADO", "FINALIZADO"]))
-    ]
-    filtro_orcamentos = tabela[
-        (tabela["DATA ORÇADO"] >= data_inicio) &
-        (tabela["DATA ORÇADO"] <= data_fim)
-    ]
-    filtro_abertas = tabela[
-        (tabela["STATUS*"].isin([
-            "RECEBIDO", "ORÇADO", "COMPRAS", "EXECUÇÃO",
-            "VERIFICAR", "PREVENTIVA", "LEVANTAMENTO",
-            "EM ORÇAMENTO", "EM ESPERA", "PROGRAMADO"
-        ])) &
-        (tabela["DATA RECEBIDO"] >= data_inicio) &
-        (tabela["DATA RECEBIDO"] <= data_fim)
-    ]
+def calcular_metricas(cubo, data_inicio, data_fim, contrato):
+    filtro_recebidas = fatiar_cubo(cubo, "recebido", contrato, data_inicio, data_fim)
+    filtro_finalizadas = fatiar_cubo(
+        cubo, "finalizado", contrato, data_inicio, data_fim,
+        status=["EXECUTADO", "FINALIZADO"]
+    )
+    filtro_orcamentos = fatiar_cubo(cubo, "orcado", contrato, data_inicio, data_fim)
+    filtro_abertas = fatiar_cubo(
+        cubo, "recebido", contrato, data_inicio, data_fim, status=STATUS_ABERTO
+    )
 
-    total_recebidas = filtro_recebidas.shape[0]
-    total_finalizadas = filtro_finalizadas.shape[0]
-    total_orcamentos = filtro_orcamentos.shape[0]
-    total_abertas = filtro_abertas.shape[0]
+    total_recebidas = int(filtro_recebidas["QUANTIDADE"].sum())
+    total_finalizadas = int(filtro_finalizadas["QUANTIDADE"].sum())
+    total_orcamentos = int(filtro_orcamentos["QUANTIDADE"].sum())
+    total_abertas = int(filtro_abertas["QUANTIDADE"].sum())
 
     valor_orcado = filtro_orcamentos["VALOR ORÇADO"].sum()
     valor_insumo = filtro_orcamentos["VALOR INSUMO"].sum()
@@ -673,19 +537,17 @@ def calcular_metricas(tabela, data_inicio, data_fim, contrato):
         "percentual_finalizadas": percentual_finalizadas
     }
 
-def exibir_grafico(tabela, data_inicio, data_fim, contrato):
+def exibir_grafico(tabela, indices, data_inicio, data_fim, contrato):
+    filtro_recebidas = filtrar_intervalo(tabela, indices, "DATA RECEBIDO", data_inicio, data_fim)
     if contrato != "Todos":
-        tabela = tabela[tabela["CONTRATO"] == contrato]
+        filtro_recebidas = filtro_recebidas[filtro_recebidas["CONTRATO"] == contrato]
 
-    filtro_recebidas = tabela[
-        (tabela["DATA RECEBIDO"] >= data_inicio) &
-        (tabela["DATA RECEBIDO"] <= data_fim)
-    ]
+    recebidas_por_dia = contar_por_dia(filtro_recebidas, "DATA RECEBIDO")
 
-    grafico = alt.Chart(filtro_recebidas).mark_bar(color='#1E90FF').encode(
+    grafico = alt.Chart(recebidas_por_dia).mark_bar(color='#1E90FF').encode(
         x='DATA RECEBIDO:T',
-        y='count():Q',
-        tooltip=['DATA RECEBIDO:T', 'count():Q']
+        y='Quantidade:Q',
+        tooltip=['DATA RECEBIDO:T', 'Quantidade:Q']
     ).properties(
         width=400,
         height=400
@@ -693,16 +555,12 @@ def exibir_grafico(tabela, data_inicio, data_fim, contrato):
 
     return grafico
 
-def exibir_grafico_pizza(tabela, data_inicio, data_fim, contrato):
+def exibir_grafico_pizza(tabela, indices, data_inicio, data_fim, contrato):
+    filtro_recebidas = filtrar_intervalo(tabela, indices, "DATA RECEBIDO", data_inicio, data_fim)
     if contrato != "Todos":
-        tabela = tabela[tabela["CONTRATO"] == contrato]
+        filtro_recebidas = filtro_recebidas[filtro_recebidas["CONTRATO"] == contrato]
 
-    filtro_recebidas = tabela[
-        (tabela["DATA RECEBIDO"] >= data_inicio) &
-        (tabela["DATA RECEBIDO"] <= data_fim)
-    ]
-
-    pizza_data = filtro_recebidas.groupby('NORMAL / URGENTE').size().reset_index(name='count')
+    pizza_data = filtro_recebidas.groupby('NORMAL / URGENTE', observed=True).size().reset_index(name='count')
 
     grafico_pizza = alt.Chart(pizza_data).mark_arc(innerRadius=50).encode(
         theta=alt.Theta(field="count", type="quantitative"),
@@ -717,13 +575,10 @@ def exibir_grafico_pizza(tabela, data_inicio, data_fim, contrato):
 
     return grafico_pizza
 
-def exibir_grafico_disciplinas(tabela, data_inicio, data_fim):
-    filtro_orcamentos_agosto = tabela[
-        (tabela["DATA ORÇADO"] >= data_inicio) &
-        (tabela["DATA ORÇADO"] <= data_fim)
-    ]
+def exibir_grafico_disciplinas(cubo, data_inicio, data_fim):
+    filtro_orcamentos_agosto = fatiar_cubo(cubo, "orcado", inicio=data_inicio, fim=data_fim)
 
-    disciplina_totais = filtro_orcamentos_agosto.groupby('DISCIPLINAS')['VALOR ORÇADO'].sum().reset_index()
+    disciplina_totais = filtro_orcamentos_agosto.groupby('DISCIPLINAS', observed=True)['VALOR ORÇADO'].sum().reset_index()
 
     grafico_disciplinas = alt.Chart(disciplina_totais).mark_bar().encode(
         x='DISCIPLINAS',
@@ -745,6 +600,7 @@ def renderizar_imagem(path):
     return f'<img src="data:image/png;base64,{img_str}" class="img-fluid" alt="Responsive image">'
 
 def semana():
+    marcar("semana")
     st.markdown(
         """
         <style>
@@ -804,8 +660,10 @@ def semana():
         unsafe_allow_html=True,
     )
 
-    tabela = carregar_dados(url)
+    tabela = carregar_dados()
     if tabela is not None:
+        cubo = carregar_cubo()
+        indices = carregar_indices("banrisul")
         contratos_interesse = ["0100215/2023", "0200215/2023", "Todos"]
 
         # Filtros de data e contrato na mesma linha dos gráficos
@@ -818,19 +676,29 @@ def semana():
         data_inicio = pd.to_datetime(data_inicio)
         data_fim = pd.to_datetime(data_fim)
 
-        # Exibir gráficos
+        # Exibir gráficos (montados só quando o período ou o contrato ainda não foram exibidos)
         with col1:
-            grafico_pizza = exibir_grafico_pizza(tabela, data_inicio, data_fim, contrato)
-            st.altair_chart(grafico_pizza, use_container_width=True)
+            st.vega_lite_chart(
+                especificar_grafico(
+                    "banrisul", "urgencia_semana", partial(exibir_grafico_pizza, tabela, indices),
+                    data_inicio, data_fim, contrato
+                ),
+                use_container_width=True
+            )
         with col2:
-            grafico = exibir_grafico(tabela, data_inicio, data_fim, contrato)
-            st.altair_chart(grafico, use_container_width=True)
+            st.vega_lite_chart(
+                especificar_grafico(
+                    "banrisul", "recebidas_semana", partial(exibir_grafico, tabela, indices),
+                    data_inicio, data_fim, contrato
+                ),
+                use_container_width=True
+            )
 
         st.write("---")
 
         # Exibir métricas
         st.subheader("Métricas")
-        metricas = calcular_metricas(tabela, data_inicio, data_fim, contrato)
+        metricas = calcular_metricas(cubo, data_inicio, data_fim, contrato)
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         with col1:
             st.markdown(
@@ -873,8 +741,12 @@ def semana():
 
         # Gráfico de valores por disciplina
         st.subheader("Gráfico de Valores por Disciplina")
-        grafico_disciplinas = exibir_grafico_disciplinas(tabela, data_inicio, data_fim)
-        st.altair_chart(grafico_disciplinas, use_container_width=True)
+        st.vega_lite_chart(
+            especificar_grafico(
+                "banrisul", "disciplinas_semana", partial(exibir_grafico_disciplinas, cubo), data_inicio, data_fim
+            ),
+            use_container_width=True
+        )
 
         # Botões para mostrar/ocultar tabelas
         st.subheader("Orçamentos Feitos no Mês de Agosto")
@@ -885,18 +757,18 @@ def semana():
             st.session_state.mostrar_orcamentos = not st.session_state.mostrar_orcamentos
 
         if st.session_state.mostrar_orcamentos:
-            filtro_orcamentos_agosto = tabela[
-                (tabela["DATA ORÇADO"] >= data_inicio) &
-                (tabela["DATA ORÇADO"] <= data_fim)
-            ]
+            filtro_orcamentos_agosto = filtrar_intervalo(
+                tabela, indices, "DATA ORÇADO", data_inicio, data_fim
+            )
 
-            st.table(
+            exibir_tabela_paginada(
                 filtro_orcamentos_agosto[
                     [
                         "CONTRATO", "OS", "DISCIPLINAS", "ORÇAMENTISTA", "DATA ORÇADO", 
                         "VALOR INSUMO", "VALOR MÃO DE OBRA", "VALOR ORÇADO"
                     ]
-                ]
+                ],
+                "orcamentos_agosto",
             )
 
         st.subheader("Serviços Finalizados no Mês de Agosto")
@@ -907,26 +779,31 @@ def semana():
             st.session_state.mostrar_finalizados = not st.session_state.mostrar_finalizados
 
         if st.session_state.mostrar_finalizados:
-            filtro_finalizados_agosto = tabela[
-                (tabela["DATA FINALIZADO"] >= data_inicio) &
-                (tabela["DATA FINALIZADO"] <= data_fim) &
-                (tabela["STATUS*"].isin(["EXECUTADO", "FINALIZADO"]))
+            filtro_finalizados_agosto = filtrar_intervalo(
+                tabela, indices, "DATA FINALIZADO", data_inicio, data_fim
+            )
+            filtro_finalizados_agosto = filtro_finalizados_agosto[
+                filtro_finalizados_agosto["STATUS*"].isin(["EXECUTADO", "FINALIZADO"])
             ]
 
             # Calcular dias de atraso
             filtro_finalizados_agosto["DIAS DE ATRASO"] = (filtro_finalizados_agosto["DATA FINALIZADO"] - filtro_finalizados_agosto["DATA RECEBIDO"]).dt.days - 30
             filtro_finalizados_agosto["DIAS DE ATRASO"] = filtro_finalizados_agosto["DIAS DE ATRASO"].apply(lambda x: x if x > 0 else 0)
 
-            st.table(
+            exibir_tabela_paginada(
                 filtro_finalizados_agosto[
                     [
                         "OS", "RESPONSAVEL TÉCNICO", "DISCIPLINAS",
                         "STATUS*", "DATA RECEBIDO", "PRAZO DE ATENDIMENTO",
                         "DATA FINALIZADO", "PRÉDIO", "DIAS DE ATRASO"
                     ]
-                ]
+                ],
+                "finalizados_agosto",
             )
 
 
 if __name__ == "__main__":
     semana()
+
+# Exibir o perfil da execução (só com o perfil ligado)
+exibir_perfil()
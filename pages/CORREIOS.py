@@ -1,15 +1,24 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
 from datetime import datetime
-from PIL import Image
+
+from utils.carregamento import carregar_fonte, carregar_fonte_completa, carregar_indices, carregar_periodo, detalhar
+from utils.consultas import consultar
+from utils.graficos import contar_por_dia, especificar_grafico
+from utils.imagens import imagem_cabecalho
+from utils.importacao import alt, pd
+from utils.indices import filtrar_intervalo
+from utils.perfil import exibir_perfil, iniciar_perfil, marcar
+from utils.tabelas import exibir_tabela_paginada
 
 # Configurar layout da página para largura completa
 st.set_page_config(layout="wide")
 
-# Carregar e redimensionar a imagem
-imagem2 = Image.open("./image/corr.png")
-imagem2 = imagem2.resize((200, 200))
+# Perfil desta execução da página (só com ?perfil=1 na URL ou DASHBOARDS_PERFIL=1)
+iniciar_perfil("CORREIOS")
+marcar("cabeçalho")
+
+# Carregar a imagem já redimensionada (preparada uma vez por processo)
+imagem2 = imagem_cabecalho("./image/corr.png", (200, 200))
 
 # Definir estilo customizado
 st.markdown(
@@ -54,35 +63,13 @@ with col1:
 with col3:
     st.markdown('<div class="text">Contrato Correios</div>', unsafe_allow_html=True)
 
-# Função para carregar dados com cache de 60 segundos
-@st.cache_data(ttl=60)
-def load_data(url):
-    return pd.read_csv(url)
-
-# Carregar dados do Google Sheets CSV
-url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTfXp-_Anw2MhzZAfBhLrITSzXy_AVm-K81tFSRLz4xBhuWq7KIdYDFqtdJZ9zGOJpV32H4qPeJ4BrD/pub?gid=1596975483&single=true&output=csv"
-data = load_data(url)
-
-# Remover espaços em branco ao redor dos nomes das colunas
-data.columns = data.columns.str.strip()
-
-# Certificar-se de que a coluna 'VALOR ORÇADO' seja numérica
-data['VALOR ORÇADO'] = data['VALOR ORÇADO'].str.replace('R$', '').str.replace('.', '').str.replace(',', '.').str.strip()
-data['VALOR ORÇADO'] = pd.to_numeric(data['VALOR ORÇADO'], errors='coerce')
-data['VALOR ORÇADO'].fillna(0, inplace=True)
-
-# Converter colunas de datas para o formato datetime
-data['DATA RECEBIDO'] = pd.to_datetime(data['DATA RECEBIDO'], format='%d/%m/%Y', errors='coerce')
-data['DATA ORÇADO'] = pd.to_datetime(data['DATA ORÇADO'], format='%d/%m/%Y', errors='coerce')
-data['DATA EXECUÇÃO (INÍCIO)'] = pd.to_datetime(data['DATA EXECUÇÃO (INÍCIO)'], format='%d/%m/%Y', errors='coerce')
-data['DATA FINALIZADO'] = pd.to_datetime(data['DATA FINALIZADO'], format='%d/%m/%Y', errors='coerce')
-
-# Remover espaços em branco ao redor dos valores nas colunas de interesse
-data['ORÇAMENTISTA'] = data['ORÇAMENTISTA'].str.strip()
-data['STATUS*'] = data['STATUS*'].str.strip()
-
-# Gráfico de Altair para quantidade de OS recebidas por dia em 2023 e 2024
-os_counts = data[data['DATA RECEBIDO'].dt.year.isin([2023, 2024])].groupby([data['DATA RECEBIDO'].dt.date.rename('Data'), data['DATA RECEBIDO'].dt.year.rename('Ano')]).size().reset_index(name='Contagem')
+marcar("OS por dia")
+# Gráfico de Altair para quantidade de OS recebidas por dia em 2023 e 2024 (só as
+# linhas desses anos são lidas, pelas partições de "DATA RECEBIDO")
+recebidas = carregar_periodo("correios", datetime(2023, 1, 1), datetime(2025, 1, 1), colunas=['DATA RECEBIDO'])
+os_counts = recebidas.groupby([recebidas['DATA RECEBIDO'].dt.normalize().rename('Data'), recebidas['DATA RECEBIDO'].dt.year.rename('Ano')]).size().reset_index(name='Contagem')
+# Dias como texto AAAA-MM-DD, como o .dt.date gerava: o Vega-Lite lê essas datas em UTC
+os_counts['Data'] = os_counts['Data'].dt.strftime('%Y-%m-%d')
 
 col15, col16 = st.columns([3, 1])
 
@@ -94,8 +81,9 @@ with col16:
 
     st.metric(label="Total de OS Recebidas", value=total_os)
 
-with col15:
-    line_chart = alt.Chart(os_counts).mark_line().encode(
+# Função para montar o gráfico de linhas das OS recebidas por dia
+def grafico_os_dia():
+    return alt.Chart(os_counts).mark_line().encode(
         x=alt.X('Data:T', title='Data'),
         y=alt.Y('Contagem:Q', title='Quantidade de OS Recebidas'),
         color=alt.Color('Ano:N', title='Ano')
@@ -103,46 +91,57 @@ with col15:
         width=1000,
         height=400
     )
-    
+
+with col15:
     st.subheader("Quantidade de OS Recebidas por Dia (2023 e 2024)")
-    st.altair_chart(line_chart, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("correios", "os_dia", grafico_os_dia), use_container_width=True)
 
     st.write("---")
         
-# Agrupar dados pela coluna STATUS* e contar ocorrências
-status_counts = data['STATUS*'].value_counts().reset_index()
-status_counts.columns = ['STATUS*', 'Contagem']
-
-# Criar gráfico de barras usando Altair baseado na coluna STATUS*
-status_chart = alt.Chart(status_counts).mark_bar().encode(
-    x=alt.X('STATUS*:N', title='Status'),
-    y=alt.Y('Contagem:Q', title='Contagem'),
-    color=alt.Color('STATUS*:N', legend=alt.Legend(title="Status")),
-    tooltip=['STATUS*', 'Contagem']
-).properties(
-    title='Distribuição de Status'
-)
+marcar("carregamento")
+# Carregar dados do Google Sheets (já tipados pelo carregador compartilhado, só com as
+# colunas usadas pelos gráficos; as tabelas de dados leem a planilha completa). Fica
+# depois das OS por dia, que num processo novo leem só as partições de 2023 e 2024
+# sem esperar pela planilha inteira.
+data = carregar_fonte("correios")
+
+marcar("status")
+# Função para montar o gráfico de distribuição de status
+def grafico_status():
+    # Agrupar dados pela coluna STATUS* e contar ocorrências
+    status_counts = consultar("correios", "contagem", coluna='STATUS*')
+
+    # Criar gráfico de barras usando Altair baseado na coluna STATUS*
+    status_chart = alt.Chart(status_counts).mark_bar().encode(
+        x=alt.X('STATUS*:N', title='Status'),
+        y=alt.Y('Contagem:Q', title='Contagem'),
+        color=alt.Color('STATUS*:N', legend=alt.Legend(title="Status")),
+        tooltip=['STATUS*', 'Contagem']
+    ).properties(
+        title='Distribuição de Status'
+    )
 
-# Adicionar rótulos de contagem sobre as barras
-text = status_chart.mark_text(
-    align='center',
-    baseline='middle',
-    dy=-10  # Deslocar texto para cima das barras
-).encode(
-    text='Contagem:Q'
-)
+    # Adicionar rótulos de contagem sobre as barras
+    text = status_chart.mark_text(
+        align='center',
+        baseline='middle',
+        dy=-10  # Deslocar texto para cima das barras
+    ).encode(
+        text='Contagem:Q'
+    )
 
-# Combinar gráfico de barras e rótulos de texto
-final_chart = (status_chart + text).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_title(
-    fontSize=16
-)
+    # Combinar gráfico de barras e rótulos de texto
+    final_chart = (status_chart + text).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_title(
+        fontSize=16
+    )
+    return final_chart
 
 # Exibir o gráfico
 st.write("## Distribuição de Status")
-st.altair_chart(final_chart, use_container_width=True)
+st.vega_lite_chart(especificar_grafico("correios", "status", grafico_status), use_container_width=True)
 
 # Inicializar estado da sessão para controlar a visibilidade da tabela
 if 'show_table' not in st.session_state:
@@ -152,52 +151,62 @@ if 'show_table' not in st.session_state:
 def toggle_table():
     st.session_state.show_table = not st.session_state.show_table
 
-# Botão para alternar a tabela
-if st.button('Mostrar/Ocultar Tabela de Dados', key='toggle_table'):
-    toggle_table()
+# Tabela de dados num fragmento: o botão (e a paginação da tabela) reexecuta só esta
+# seção, sem recarregar a planilha nem remontar os demais gráficos da página
+@st.fragment
+def exibir_tabela_dados():
+    # Botão para alternar a tabela
+    if st.button('Mostrar/Ocultar Tabela de Dados', key='toggle_table'):
+        toggle_table()
 
-# Mostrar ou ocultar a tabela com base no estado
-if st.session_state.show_table:
-    st.write("## Dados")
-    st.dataframe(data)
+    # Mostrar ou ocultar a tabela com base no estado
+    if st.session_state.show_table:
+        st.write("## Dados")
+        exibir_tabela_paginada(carregar_fonte_completa("correios"), "dados")
+
+exibir_tabela_dados()
 
 # Adicionar separador
 st.write("---")
 
-# Criar gráfico de barras usando Altair baseado na coluna DISCIPLINAS
-disciplina_counts = data['DISCIPLINAS'].value_counts().reset_index()
-disciplina_counts.columns = ['DISCIPLINAS', 'Contagem']
-
-disciplina_chart = alt.Chart(disciplina_counts).mark_bar().encode(
-    x=alt.X('DISCIPLINAS:N', title='Disciplinas'),
-    y=alt.Y('Contagem:Q', title='Contagem'),
-    color=alt.Color('DISCIPLINAS:N', legend=alt.Legend(title="Disciplinas")),
-    tooltip=['DISCIPLINAS', 'Contagem']
-).properties(
-    title='Distribuição de Disciplinas'
-)
+marcar("disciplinas")
+# Função para montar o gráfico de distribuição de disciplinas
+def grafico_disciplinas():
+    # Criar gráfico de barras usando Altair baseado na coluna DISCIPLINAS
+    disciplina_counts = consultar("correios", "contagem", coluna='DISCIPLINAS')
+
+    disciplina_chart = alt.Chart(disciplina_counts).mark_bar().encode(
+        x=alt.X('DISCIPLINAS:N', title='Disciplinas'),
+        y=alt.Y('Contagem:Q', title='Contagem'),
+        color=alt.Color('DISCIPLINAS:N', legend=alt.Legend(title="Disciplinas")),
+        tooltip=['DISCIPLINAS', 'Contagem']
+    ).properties(
+        title='Distribuição de Disciplinas'
+    )
 
-# Adicionar rótulos de contagem sobre as barras
-disciplina_text = disciplina_chart.mark_text(
-    align='center',
-    baseline='middle',
-    dy=-10  # Deslocar texto para cima das barras
-).encode(
-    text='Contagem:Q'
-)
+    # Adicionar rótulos de contagem sobre as barras
+    disciplina_text = disciplina_chart.mark_text(
+        align='center',
+        baseline='middle',
+        dy=-10  # Deslocar texto para cima das barras
+    ).encode(
+        text='Contagem:Q'
+    )
 
-# Combinar gráfico de barras e rótulos de texto
-final_disciplina_chart = (disciplina_chart + disciplina_text).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_title(
-    fontSize=16
-)
+    # Combinar gráfico de barras e rótulos de texto
+    final_disciplina_chart = (disciplina_chart + disciplina_text).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_title(
+        fontSize=16
+    )
+    return final_disciplina_chart
 
 # Exibir o gráfico de disciplinas
 st.write("## Distribuição de Disciplinas")
-st.altair_chart(final_disciplina_chart, use_container_width=True)
+st.vega_lite_chart(especificar_grafico("correios", "disciplinas", grafico_disciplinas), use_container_width=True)
 
+marcar("métricas por status")
 # Filtrar dados pelos diferentes status
 status_list = ["ORÇADO RECEBIDO", "SOLICITAÇÃO DE MATERIAL", "COMPRAS", "EXECUÇÃO", "LEVANTAMENTO", "RECEBIDO", "FINALIZADO", "ASSINADO"]
 
@@ -247,9 +256,8 @@ for col, (status, count) in zip(cols, status_counts.items()):
     col.markdown(f'<div class="metric"><div class="label">{status}</div><div class="value">{count}</div></div>', unsafe_allow_html=True)
 
 # Calcular o valor orçado por status
-valor_orcado_status = data.groupby('STATUS*')['VALOR ORÇADO'].sum().reset_index()
-valor_orcado_status['VALOR ORÇADO'] = pd.to_numeric(valor_orcado_status['VALOR ORÇADO'], errors='coerce')
-valor_orcado_status['VALOR ORÇADO'].fillna(0, inplace=True)
+valor_orcado_status = data.groupby('STATUS*', observed=True)['VALOR ORÇADO'].sum().reset_index()
+valor_orcado_status['VALOR ORÇADO'] = pd.to_numeric(valor_orcado_status['VALOR ORÇADO'], errors='coerce').fillna(0)
 
 # Adicionar CSS para personalizar métricas de valor orçado por status
 st.markdown(
@@ -288,6 +296,7 @@ cols_valor = st.columns(len(valor_orcado_status))
 for col, (status, valor) in zip(cols_valor, valor_orcado_status.itertuples(index=False, name=None)):
     col.markdown(f'<div class="valor"><div class="label">{status}</div><div class="value">R${valor:,.2f}</div></div>', unsafe_allow_html=True)
 
+marcar("dados brutos")
 # Inicializar estado da sessão para controlar a visibilidade da tabela de dados brutos
 if 'show_raw_table' not in st.session_state:
     st.session_state.show_raw_table = False
@@ -296,132 +305,131 @@ if 'show_raw_table' not in st.session_state:
 def toggle_raw_table():
     st.session_state.show_raw_table = not st.session_state.show_raw_table
 
-# Botão para alternar a tabela de dados brutos
-if st.button('Mostrar/Ocultar Tabela de Dados Brutos', key='toggle_raw_table'):
-    toggle_raw_table()
-
-# Mostrar ou ocultar a tabela de dados brutos com base no estado
-if st.session_state.show_raw_table:
-    st.write("## Tabela de Dados Brutos Restantes para Execução")
-    selected_columns = [
-        'OS', 'DISCIPLINAS', 'DESCRIÇÃO DO SERVIÇO', 'LOCAL CORREIOS', 
-        'PREDIO CORREIOS', 'MUNICÍPIO', 'DATA RECEBIDO', 'PRAZO DE ATENDIMENTO', 
-        'PREVISÃO DE INÍCIO', 'PREVISÃO DE FINALIZAÇÃO'
-    ]
-    remaining_data = data[data['STATUS*'].isin(status_list)][selected_columns]
-    st.dataframe(remaining_data)
+# Fragmento da tabela de dados brutos (o botão reexecuta só esta seção)
+@st.fragment
+def exibir_dados_brutos():
+    # Botão para alternar a tabela de dados brutos
+    if st.button('Mostrar/Ocultar Tabela de Dados Brutos', key='toggle_raw_table'):
+        toggle_raw_table()
+
+    # Mostrar ou ocultar a tabela de dados brutos com base no estado
+    if st.session_state.show_raw_table:
+        st.write("## Tabela de Dados Brutos Restantes para Execução")
+        selected_columns = [
+            'OS', 'DISCIPLINAS', 'DESCRIÇÃO DO SERVIÇO', 'LOCAL CORREIOS', 
+            'PREDIO CORREIOS', 'MUNICÍPIO', 'DATA RECEBIDO', 'PRAZO DE ATENDIMENTO', 
+            'PREVISÃO DE INÍCIO', 'PREVISÃO DE FINALIZAÇÃO'
+        ]
+        completa = carregar_fonte_completa("correios")
+        remaining_data = completa[completa['STATUS*'].isin(status_list)][selected_columns]
+        st.dataframe(remaining_data)
+
+exibir_dados_brutos()
 
 st.write("---")
 
-# Gráfico de Pizza para Orçamentista e quantos orçamentos fizeram
-orcamentista_counts = data['ORÇAMENTISTA'].value_counts().reset_index()
-orcamentista_counts.columns = ['ORÇAMENTISTA', 'Contagem']
+marcar("orçamentistas")
+# Função para montar o gráfico de pizza para Orçamentista e quantos orçamentos fizeram
+def grafico_orcamentista():
+    orcamentista_counts = consultar("correios", "contagem", coluna='ORÇAMENTISTA')
 
-orcamentista_chart = alt.Chart(orcamentista_counts).mark_arc().encode(
-    theta=alt.Theta(field="Contagem", type="quantitative"),
-    color=alt.Color(field="ORÇAMENTISTA", type="nominal"),
-    tooltip=['ORÇAMENTISTA', 'Contagem']
-).properties(
-    title='Distribuição de Orçamentos por Orçamentista'
-)
-
-# Gráfico de Pizza para Normal/Urgente
-urgente_counts = data['NORMAL / URGENTE'].value_counts().reset_index()
-urgente_counts.columns = ['NORMAL / URGENTE', 'Contagem']
+    return alt.Chart(orcamentista_counts).mark_arc().encode(
+        theta=alt.Theta(field="Contagem", type="quantitative"),
+        color=alt.Color(field="ORÇAMENTISTA", type="nominal"),
+        tooltip=['ORÇAMENTISTA', 'Contagem']
+    ).properties(
+        title='Distribuição de Orçamentos por Orçamentista'
+    )
 
-urgente_chart = alt.Chart(urgente_counts).mark_arc().encode(
-    theta=alt.Theta(field="Contagem", type="quantitative"),
-    color=alt.Color(field="NORMAL / URGENTE", type="nominal"),
-    tooltip=['NORMAL / URGENTE', 'Contagem']
-).properties(
-    title='Distribuição de Normal/Urgente'
-)
+# Função para montar o gráfico de pizza para Normal/Urgente
+def grafico_urgente():
+    urgente_counts = consultar("correios", "contagem", coluna='NORMAL / URGENTE')
 
-# Gráfico de Barra para Orçamentos feitos no mês
-data['AnoMes'] = data['DATA ORÇADO'].dt.to_period('M')
+    return alt.Chart(urgente_counts).mark_arc().encode(
+        theta=alt.Theta(field="Contagem", type="quantitative"),
+        color=alt.Color(field="NORMAL / URGENTE", type="nominal"),
+        tooltip=['NORMAL / URGENTE', 'Contagem']
+    ).properties(
+        title='Distribuição de Normal/Urgente'
+    )
 
-orcamento_mes_counts = data.groupby('AnoMes').size().reset_index(name='Contagem')
-orcamento_mes_counts['AnoMes'] = orcamento_mes_counts['AnoMes'].astype(str)
+# Função para montar o gráfico de barra para Orçamentos feitos no mês
+def grafico_orcamento_mes():
+    orcamento_mes_counts = consultar("correios", "orcamentos_mes")
 
-orcamento_mes_chart = alt.Chart(orcamento_mes_counts).mark_bar().encode(
-    x=alt.X('AnoMes:N', title='Mês'),
-    y=alt.Y('Contagem:Q', title='Contagem de Orçamentos'),
-    color=alt.Color('AnoMes:N', legend=None),
-    tooltip=['AnoMes', 'Contagem']
-).properties(
-    title='Orçamentos Feitos no Mês'
-)
+    return alt.Chart(orcamento_mes_counts).mark_bar().encode(
+        x=alt.X('AnoMes:N', title='Mês'),
+        y=alt.Y('Contagem:Q', title='Contagem de Orçamentos'),
+        color=alt.Color('AnoMes:N', legend=None),
+        tooltip=['AnoMes', 'Contagem']
+    ).properties(
+        title='Orçamentos Feitos no Mês'
+    )
 
 col1, col2 = st.columns([3, 6])
 with col1:
-    st.altair_chart(urgente_chart, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("correios", "urgente", grafico_urgente), use_container_width=True)
 with col2:
-    st.altair_chart(orcamento_mes_chart, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("correios", "orcamento_mes", grafico_orcamento_mes), use_container_width=True)
+
+# Função para montar o gráfico de colunas com os orçamentos por mês do orçamentista selecionado
+def grafico_orcamento_mes_orcamentista(orcamentista):
+    orcamento_mes_orcamentista_counts = consultar(
+        "correios", "orcamentos_mes_orcamentista", orcamentista=orcamentista
+    )
 
-# Filtro para selecionar o orçamentista
+    return alt.Chart(orcamento_mes_orcamentista_counts).mark_bar().encode(
+        x=alt.X('AnoMes:N', title='Mês'),
+        y=alt.Y('Contagem:Q', title='Contagem de Orçamentos'),
+        color=alt.Color('AnoMes:N', legend=None),
+        tooltip=['AnoMes', 'Contagem']
+    ).properties(
+        title=f'Orçamentos Feitos no Mês por {orcamentista}'
+    )
+
+# Orçamentistas disponíveis no filtro
 orcamentista_list = data['ORÇAMENTISTA'].unique().tolist()
-selected_orcamentista = st.selectbox("Selecione o Orçamentista", orcamentista_list, key='orcamentista_filter_unique')
-
-# Filtrar dados com base no orçamentista selecionado
-filtered_data = data[data['ORÇAMENTISTA'] == selected_orcamentista]
-
-# Gráfico de Colunas para mostrar orçamentos por mês para o orçamentista selecionado
-orcamento_mes_orcamentista_counts = filtered_data.groupby('AnoMes').size().reset_index(name='Contagem')
-orcamento_mes_orcamentista_counts['AnoMes'] = orcamento_mes_orcamentista_counts['AnoMes'].astype(str)
-
-orcamento_mes_orcamentista_chart = alt.Chart(orcamento_mes_orcamentista_counts).mark_bar().encode(
-    x=alt.X('AnoMes:N', title='Mês'),
-    y=alt.Y('Contagem:Q', title='Contagem de Orçamentos'),
-    color=alt.Color('AnoMes:N', legend=None),
-    tooltip=['AnoMes', 'Contagem']
-).properties(
-    title=f'Orçamentos Feitos no Mês por {selected_orcamentista}'
-)
 
-col4, col5 = st.columns([1, 3])
-with col4:
-    st.altair_chart(orcamentista_chart, use_container_width=True)
-with col5:
-    st.altair_chart(orcamento_mes_orcamentista_chart, use_container_width=True)
+# Fragmento do filtro por orçamentista: trocar a seleção reexecuta só esta seção
+@st.fragment
+def exibir_orcamentista():
+    # Filtro para selecionar o orçamentista
+    selected_orcamentista = st.selectbox("Selecione o Orçamentista", orcamentista_list, key='orcamentista_filter_unique')
+
+    col4, col5 = st.columns([1, 3])
+    with col4:
+        st.vega_lite_chart(especificar_grafico("correios", "orcamentista", grafico_orcamentista), use_container_width=True)
+    with col5:
+        st.vega_lite_chart(
+            especificar_grafico(
+                "correios", "orcamento_mes_orcamentista", grafico_orcamento_mes_orcamentista, selected_orcamentista
+            ),
+            use_container_width=True
+        )
+
+exibir_orcamentista()
 
 st.write("---")
 
-# Função para converter valores monetários para float
-def convert_to_float(val):
-    if isinstance(val, str):
-        val = val.replace('R$', '').replace('.', '').replace(',', '.').strip()
-        return float(val) if val else 0.0
-    return val
-
-# Aplicar a função de conversão nas colunas de valores
-data['VALOR INSUMO'] = data['VALOR INSUMO'].apply(convert_to_float)
-data['VALOR MÃO DE OBRA'] = data['VALOR MÃO DE OBRA'].apply(convert_to_float)
-data['VALOR ORÇADO'] = data['VALOR ORÇADO'].apply(convert_to_float)
-
-# Calcular os valores mensais para insumo, mão de obra e valor orçado
-monthly_values = data.groupby('AnoMes').agg({
-    'VALOR INSUMO': 'sum',
-    'VALOR MÃO DE OBRA': 'sum',
-    'VALOR ORÇADO': 'sum'
-}).reset_index()
-monthly_values['AnoMes'] = monthly_values['AnoMes'].astype(str)
-
-# Gráfico de Colunas para mostrar valores de insumo, mão de obra e valor orçado por mês
-melted_values = monthly_values.melt(id_vars='AnoMes', var_name='Tipo', value_name='Valor')
-
-monthly_chart = alt.Chart(melted_values).mark_bar().encode(
-    x=alt.X('AnoMes:N', title='Mês'),
-    y=alt.Y('Valor:Q', title='Valor'),
-    color=alt.Color('Tipo:N', legend=alt.Legend(title="Tipo de Valor")),
-    tooltip=['AnoMes', 'Tipo', 'Valor']
-).properties(
-    title='Valores de Insumo, Mão de Obra e Valor Orçado por Mês'
-).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_title(
-    fontSize=16
-)
+marcar("valores mensais")
+# Função para montar o gráfico de colunas com valores de insumo, mão de obra e valor orçado por mês
+def grafico_valores_mensais():
+    monthly_values = consultar("correios", "valores_mensais")
+    melted_values = monthly_values.melt(id_vars='AnoMes', var_name='Tipo', value_name='Valor')
+
+    return alt.Chart(melted_values).mark_bar().encode(
+        x=alt.X('AnoMes:N', title='Mês'),
+        y=alt.Y('Valor:Q', title='Valor'),
+        color=alt.Color('Tipo:N', legend=alt.Legend(title="Tipo de Valor")),
+        tooltip=['AnoMes', 'Tipo', 'Valor']
+    ).properties(
+        title='Valores de Insumo, Mão de Obra e Valor Orçado por Mês'
+    ).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_title(
+        fontSize=16
+    )
 
 # Inicializar estado da sessão para controlar a visibilidade da tabela mensal
 if 'show_monthly_table' not in st.session_state:
@@ -431,31 +439,28 @@ if 'show_monthly_table' not in st.session_state:
 def toggle_monthly_table():
     st.session_state.show_monthly_table = not st.session_state.show_monthly_table
 
-# Botão para alternar a tabela mensal
-if st.button('Mostrar/Ocultar Tabela de Valores Mensais', key='toggle_monthly_table'):
-    toggle_monthly_table()
-
-# Mostrar ou ocultar a tabela de valores mensais com base no estado
-col6, col7 = st.columns([1, 3])
-with col6:
-    if st.session_state.show_monthly_table:
-        st.write("## Tabela de Valores Mensais")
-        st.dataframe(monthly_values)
-with col7:
-    st.write("## Valores de Insumo, Mão de Obra e Valor Orçado por Mês")
-    st.altair_chart(monthly_chart, use_container_width=True)
+# Fragmento dos valores mensais (o botão reexecuta só esta seção)
+@st.fragment
+def exibir_valores_mensais():
+    # Botão para alternar a tabela mensal
+    if st.button('Mostrar/Ocultar Tabela de Valores Mensais', key='toggle_monthly_table'):
+        toggle_monthly_table()
+
+    # Mostrar ou ocultar a tabela de valores mensais com base no estado
+    col6, col7 = st.columns([1, 3])
+    with col6:
+        if st.session_state.show_monthly_table:
+            st.write("## Tabela de Valores Mensais")
+            st.dataframe(consultar("correios", "valores_mensais"))
+    with col7:
+        st.write("## Valores de Insumo, Mão de Obra e Valor Orçado por Mês")
+        st.vega_lite_chart(especificar_grafico("correios", "valores_mensais", grafico_valores_mensais), use_container_width=True)
+
+exibir_valores_mensais()
 
 st.write("---")
 
-# Calcular o ticket médio por mês
-ticket_medio_mes = data.groupby('AnoMes')['VALOR ORÇADO'].mean().reset_index()
-ticket_medio_mes.columns = ['AnoMes', 'Ticket Médio']
-ticket_medio_mes['AnoMes'] = ticket_medio_mes['AnoMes'].astype(str)
-
-# Calcular o ticket médio por dia
-ticket_medio_dia = data.groupby('DATA ORÇADO')['VALOR ORÇADO'].mean().reset_index()
-ticket_medio_dia.columns = ['Data', 'Ticket Médio']
-
+marcar("ticket médio")
 # Classificar valores para colorir barras
 def classify_value(value):
     if value > 10000:
@@ -465,17 +470,21 @@ def classify_value(value):
     else:
         return 'Baixo'
 
-ticket_medio_dia['Classificação'] = ticket_medio_dia['Ticket Médio'].apply(classify_value)
-
-# Gráfico de colunas para o ticket médio por dia com zoom
-ticket_medio_dia_chart = alt.Chart(ticket_medio_dia).mark_bar().encode(
-    x=alt.X('Data:T', title='Dia'),
-    y=alt.Y('Ticket Médio:Q', title='Ticket Médio'),
-    color=alt.Color('Classificação:N', legend=None),
-    tooltip=['Data', 'Ticket Médio', 'Classificação']
-).properties(
-    title='Ticket Médio por Dia'
-)
+# Função para montar o gráfico de colunas para o ticket médio por dia com zoom
+def grafico_ticket_medio_dia():
+    # Calcular o ticket médio por dia
+    ticket_medio_dia = data.groupby('DATA ORÇADO')['VALOR ORÇADO'].mean().reset_index()
+    ticket_medio_dia.columns = ['Data', 'Ticket Médio']
+    ticket_medio_dia['Classificação'] = ticket_medio_dia['Ticket Médio'].apply(classify_value)
+
+    return alt.Chart(ticket_medio_dia).mark_bar().encode(
+        x=alt.X('Data:T', title='Dia'),
+        y=alt.Y('Ticket Médio:Q', title='Ticket Médio'),
+        color=alt.Color('Classificação:N', legend=None),
+        tooltip=['Data', 'Ticket Médio', 'Classificação']
+    ).properties(
+        title='Ticket Médio por Dia'
+    )
 
 # Inicializar estado da sessão para controlar a visibilidade da tabela de ticket médio
 if 'show_ticket_table' not in st.session_state:
@@ -485,86 +494,113 @@ if 'show_ticket_table' not in st.session_state:
 def toggle_ticket_table():
     st.session_state.show_ticket_table = not st.session_state.show_ticket_table
 
-# Botão para alternar a tabela de ticket médio
-if st.button('Mostrar/Ocultar Tabela de Ticket Médio', key='toggle_ticket_table'):
-    toggle_ticket_table()
+# Fragmento do ticket médio (o botão reexecuta só esta seção)
+@st.fragment
+def exibir_ticket_medio():
+    # Botão para alternar a tabela de ticket médio
+    if st.button('Mostrar/Ocultar Tabela de Ticket Médio', key='toggle_ticket_table'):
+        toggle_ticket_table()
 
-# Mostrar ou ocultar a tabela de ticket médio com base no estado
-col8, col9 = st.columns([1, 3])
-with col8:
-    if st.session_state.show_ticket_table:
-        st.dataframe(ticket_medio_mes)
-with col9:
-    st.altair_chart(ticket_medio_dia_chart, use_container_width=True)
+    # Mostrar ou ocultar a tabela de ticket médio com base no estado
+    col8, col9 = st.columns([1, 3])
+    with col8:
+        if st.session_state.show_ticket_table:
+            st.dataframe(consultar("correios", "ticket_medio_mensal"))
+    with col9:
+        st.vega_lite_chart(especificar_grafico("correios", "ticket_medio_dia", grafico_ticket_medio_dia), use_container_width=True)
 
-st.write("---")
+exibir_ticket_medio()
 
-# Filtrar dados para os anos 2023 e 2024
-df_filtered = data[(data['DATA EXECUÇÃO (INÍCIO)'].dt.year >= 2023) & (data['DATA EXECUÇÃO (INÍCIO)'].dt.year <= 2024)]
+st.write("---")
 
-# Dividir a página em duas colunas
-col10, col11 = st.columns([3, 1])
-
-# Seleção de período (data início e fim)
-with col11:
-    start_date = st.date_input("Data Início", value=datetime(2023, 1, 1), key='start_date_servicos')
-    end_date = st.date_input("Data Fim", value=datetime(2023, 1, 7), key='end_date_servicos')
-
-# Converter selected_date para pd.Timestamp
-start_date = pd.Timestamp(start_date).date()
-end_date = pd.Timestamp(end_date).date()
-
-# Filtrar dados pelo período selecionado
-df_filtered_by_date = df_filtered[(df_filtered['DATA EXECUÇÃO (INÍCIO)'].dt.date >= start_date) & (df_filtered['DATA FINALIZADO'].dt.date <= end_date)]
-
-# Gráfico Altair
-with col10:
-    chart = alt.Chart(df_filtered_by_date).mark_bar().encode(
-        x=alt.X('yearmonthdate(DATA EXECUÇÃO (INÍCIO)):T', title='Data'),
-        y=alt.Y('count()', title='Número de Serviços'),
-        color=alt.Color('yearmonth(DATA EXECUÇÃO (INÍCIO)):N', title='Mês/Ano')  # Colorido por mês/ano
-    ).properties(
-        width=800,
-        height=400
+marcar("serviços por período")
+# Índices ordenados das datas da planilha, inclusive as de execução (remontados só
+# quando a planilha muda)
+indices = carregar_indices("correios")
+
+# Fragmento dos serviços por período: as datas e a paginação dos detalhes
+# reexecutam só esta seção
+@st.fragment
+def exibir_servicos_periodo():
+    # Dividir a página em duas colunas
+    col10, col11 = st.columns([3, 1])
+
+    # Seleção de período (data início e fim)
+    with col11:
+        start_date = st.date_input("Data Início", value=datetime(2023, 1, 1), key='start_date_servicos')
+        end_date = st.date_input("Data Fim", value=datetime(2023, 1, 7), key='end_date_servicos')
+
+    # Converter selected_date para pd.Timestamp
+    start_date = pd.Timestamp(start_date).date()
+    end_date = pd.Timestamp(end_date).date()
+
+    # Filtrar dados pelo período selecionado, dentro dos anos 2023 e 2024 (busca binária no índice)
+    df_filtered_by_date = filtrar_intervalo(
+        data, indices, 'DATA EXECUÇÃO (INÍCIO)',
+        max(start_date, datetime(2023, 1, 1).date()), datetime(2025, 1, 1), incluir_fim=False
     )
-    st.altair_chart(chart, use_container_width=True)
-
-# Exibir tabela com os detalhes se um período for selecionado
-if not df_filtered_by_date.empty:
-    st.subheader("Detalhes dos Serviços")
-    st.dataframe(df_filtered_by_date[[
-        'ID', 'CONTRATO', 'OS', 'MCU', 'NORMAL / URGENTE', 'FISCAL', 
-        'PREVENTIVA / CORRETIVA', 'DISCIPLINAS', 'DESCRIÇÃO DO SERVIÇO', 
-        'DESCRIÇÃO DETALHADA', 'LOCAL CORREIOS', 'PREDIO CORREIOS', 
-        'MUNICÍPIO', 'DATA RECEBIDO', 'PRAZO DE ATENDIMENTO', 
-        'PREVISÃO DE INÍCIO', 'PREVISÃO DE FINALIZAÇÃO', 'STATUS*', 
-        'DATA DE ATUALIZAÇÃO', 'VALOR ORÇADO', 'DATA ORÇADO', 
-        'ORÇAMENTISTA', 'VALOR INSUMO', 'VALOR MÃO DE OBRA', 
-        'PERCENTUAL FD', 'VALOR FD', 'VALOR GASTO', 'VALOR APROVADO', 
-        'DATA APROVADO', 'LUCRO BRUTO', 'VALOR PAGO', 
-        'DESCRIÇÃO DA EXECUÇÃO', 'EXECUTADO', 'EXECUTADO (%)', 
-        'DATA EXECUÇÃO (INÍCIO)', 'DATA FINALIZADO', 'NOTA FISCAL', 
-        'DATA DE EMISSÃO DA NF', 'GLOSA', 'MEDIÇÃO', 'QUANTIDADE DE REVISÕES', 
-        'VISTORIA TECNICO', 'VISTORIA DATA', 'LEVANTAMENTO', 
-        'ASSINATURA DE FINALIZAÇÃO','FD', 'RM', 
-        'COMPRAS STATUS', 'PRAZO P/ ENTREGA', 'OBS: COMPRAS', 
-        'SOLICITANTE', 'SC', 'OC'
-    ]])
-else:
-    st.write("Nenhum serviço encontrado para o período selecionado.")
+    df_filtered_by_date = df_filtered_by_date[df_filtered_by_date['DATA FINALIZADO'].dt.date <= end_date]
+
+    # Função para montar o gráfico Altair do período selecionado
+    def grafico_servicos_periodo(inicio, fim):
+        servicos_por_dia = contar_por_dia(df_filtered_by_date, 'DATA EXECUÇÃO (INÍCIO)')
+        return alt.Chart(servicos_por_dia).mark_bar().encode(
+            x=alt.X('yearmonthdate(DATA EXECUÇÃO (INÍCIO)):T', title='Data'),
+            y=alt.Y('Quantidade:Q', title='Número de Serviços'),
+            color=alt.Color('yearmonth(DATA EXECUÇÃO (INÍCIO)):N', title='Mês/Ano')  # Colorido por mês/ano
+        ).properties(
+            width=800,
+            height=400
+        )
+
+    with col10:
+        st.vega_lite_chart(
+            especificar_grafico("correios", "servicos_periodo", grafico_servicos_periodo, start_date, end_date),
+            use_container_width=True
+        )
+
+    # Exibir tabela com os detalhes se um período for selecionado
+    if not df_filtered_by_date.empty:
+        st.subheader("Detalhes dos Serviços")
+        detalhes = detalhar("correios", df_filtered_by_date)
+        if detalhes is None:
+            # A planilha mudou desde o início da execução: refaz a página com a versão nova
+            st.rerun()
+        exibir_tabela_paginada(detalhes[[
+            'ID', 'CONTRATO', 'OS', 'MCU', 'NORMAL / URGENTE', 'FISCAL', 
+            'PREVENTIVA / CORRETIVA', 'DISCIPLINAS', 'DESCRIÇÃO DO SERVIÇO', 
+            'DESCRIÇÃO DETALHADA', 'LOCAL CORREIOS', 'PREDIO CORREIOS', 
+            'MUNICÍPIO', 'DATA RECEBIDO', 'PRAZO DE ATENDIMENTO', 
+            'PREVISÃO DE INÍCIO', 'PREVISÃO DE FINALIZAÇÃO', 'STATUS*', 
+            'DATA DE ATUALIZAÇÃO', 'VALOR ORÇADO', 'DATA ORÇADO', 
+            'ORÇAMENTISTA', 'VALOR INSUMO', 'VALOR MÃO DE OBRA', 
+            'PERCENTUAL FD', 'VALOR FD', 'VALOR GASTO', 'VALOR APROVADO', 
+            'DATA APROVADO', 'LUCRO BRUTO', 'VALOR PAGO', 
+            'DESCRIÇÃO DA EXECUÇÃO', 'EXECUTADO', 'EXECUTADO (%)', 
+            'DATA EXECUÇÃO (INÍCIO)', 'DATA FINALIZADO', 'NOTA FISCAL', 
+            'DATA DE EMISSÃO DA NF', 'GLOSA', 'MEDIÇÃO', 'QUANTIDADE DE REVISÕES', 
+            'VISTORIA TECNICO', 'VISTORIA DATA', 'LEVANTAMENTO', 
+            'ASSINATURA DE FINALIZAÇÃO','FD', 'RM', 
+            'COMPRAS STATUS', 'PRAZO P/ ENTREGA', 'OBS: COMPRAS', 
+            'SOLICITANTE', 'SC', 'OC'
+        ]], "detalhes_servicos")
+    else:
+        st.write("Nenhum serviço encontrado para o período selecionado.")
+
+exibir_servicos_periodo()
 
 st.write("---")
 
-# Contar a quantidade de serviços por "PREDIO CORREIOS"
-predio_counts = data['PREDIO CORREIOS'].value_counts().reset_index()
-predio_counts.columns = ['PREDIO CORREIOS', 'Quantidade']
+marcar("prédios")
+# Função para contar a quantidade de serviços por "PREDIO CORREIOS"
+def contar_predios():
+    predio_counts = consultar("correios", "contagem", coluna='PREDIO CORREIOS')
+    predio_counts.columns = ['PREDIO CORREIOS', 'Quantidade']
+    return predio_counts
 
-# Dividir a página em duas colunas
-col12, col13 = st.columns([2, 1])
-
-# Gráfico de barras mostrando a quantidade de serviços por "PREDIO CORREIOS"
-with col12:
-    chart = alt.Chart(predio_counts).mark_bar().encode(
+# Função para montar o gráfico de barras com a quantidade de serviços por "PREDIO CORREIOS"
+def grafico_predios():
+    return alt.Chart(contar_predios()).mark_bar().encode(
         x=alt.X('PREDIO CORREIOS:N', title='Prédio Correios'),
         y=alt.Y('Quantidade:Q', title='Quantidade de Serviços'),
         color=alt.Color('PREDIO CORREIOS:N', legend=None)  # Colorido por prédio
@@ -573,39 +609,53 @@ with col12:
         width=600,
         height=400
     )
-    st.altair_chart(chart, use_container_width=True)
 
-# Botão para mostrar/ocultar a tabela
-if 'show_table' not in st.session_state:
-    st.session_state.show_table = False
+# Dividir a página em duas colunas
+col12, col13 = st.columns([2, 1])
 
-def toggle_table():
-    st.session_state.show_table = not st.session_state.show_table
+with col12:
+    st.vega_lite_chart(especificar_grafico("correios", "predios", grafico_predios), use_container_width=True)
 
-with col13:
+# Inicializar estado da sessão para controlar a visibilidade da tabela de prédios
+if 'show_predio_table' not in st.session_state:
+    st.session_state.show_predio_table = False
+
+# Função para alternar a visibilidade da tabela de prédios
+def toggle_predio_table():
+    st.session_state.show_predio_table = not st.session_state.show_predio_table
+
+# Fragmento do botão e da tabela de prédios (o clique reexecuta só esta coluna)
+@st.fragment
+def exibir_tabela_predios():
     if st.button('Mostrar/Ocultar Tabela'):
-        toggle_table()
+        toggle_predio_table()
 
     # Mostrar ou ocultar a tabela com base no estado
-    if st.session_state.show_table:
+    if st.session_state.show_predio_table:
         st.write("Tabela de Quantidade de Serviços por Prédio Correios")
-        st.dataframe(predio_counts)
+        st.dataframe(contar_predios())
+
+with col13:
+    exibir_tabela_predios()
 
 st.write("---")
 
 # Calcular a média de serviços atendidos por dia para 2023 e 2024
-daily_avg = data[data['DATA EXECUÇÃO (INÍCIO)'].dt.year.isin([2023, 2024])].groupby([data['DATA EXECUÇÃO (INÍCIO)'].dt.date.rename('Data'), data['DATA EXECUÇÃO (INÍCIO)'].dt.year.rename('Ano')]).size().reset_index(name='Contagem')
+executadas = carregar_periodo(
+    "correios", datetime(2023, 1, 1), datetime(2025, 1, 1),
+    coluna='DATA EXECUÇÃO (INÍCIO)', colunas=['DATA EXECUÇÃO (INÍCIO)']
+)
+daily_avg = executadas.groupby([executadas['DATA EXECUÇÃO (INÍCIO)'].dt.normalize().rename('Data'), executadas['DATA EXECUÇÃO (INÍCIO)'].dt.year.rename('Ano')]).size().reset_index(name='Contagem')
+# Dias como texto AAAA-MM-DD, como o .dt.date gerava: o Vega-Lite lê essas datas em UTC
+daily_avg['Data'] = daily_avg['Data'].dt.strftime('%Y-%m-%d')
 
 # Calcular a média para cada ano
 avg_2023 = daily_avg[daily_avg['Ano'] == 2023]['Contagem'].mean()
 avg_2024 = daily_avg[daily_avg['Ano'] == 2024]['Contagem'].mean()
 
-# Dividir a página em duas colunas
-col14, col15 = st.columns([3, 1])
-
-# Gráfico de linhas mostrando a média de serviços atendidos por dia em 2023 e 2024
-with col14:
-    line_chart = alt.Chart(daily_avg).mark_line(point=True).encode(
+# Função para montar o gráfico de linhas com a média de serviços atendidos por dia em 2023 e 2024
+def grafico_media_diaria():
+    return alt.Chart(daily_avg).mark_line(point=True).encode(
         x=alt.X('Data:T', title='Data'),
         y=alt.Y('Contagem:Q', title='Média de Serviços Atendidos por Dia'),
         color=alt.Color('Ano:N', title='Ano')
@@ -614,7 +664,12 @@ with col14:
         width=800,
         height=400
     )
-    st.altair_chart(line_chart, use_container_width=True)
+
+# Dividir a página em duas colunas
+col14, col15 = st.columns([3, 1])
+
+with col14:
+    st.vega_lite_chart(especificar_grafico("correios", "media_diaria", grafico_media_diaria), use_container_width=True)
 
 # Exibir cartões de métricas para a média de serviços atendidos por dia em 2023 e 2024
 with col15:
@@ -623,3 +678,5 @@ with col15:
 
 st.write("---")
 
+# Exibir o perfil da execução (só com o perfil ligado)
+exibir_perfil()
@@ -1,17 +1,12 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from datetime import datetime
-from PIL import Image
+
+from utils.imagens import imagem_cabecalho
 
 # Configurar layout da página para largura completa
 st.set_page_config(layout="wide")
 
-# Carregar imagens
-imagem2 = Image.open("./image/inmetro.png")
-
-# Reduzir o tamanho das imagens
-imagem2 = imagem2.resize((100, 100))
+# Carregar a imagem já redimensionada (preparada uma vez por processo)
+imagem2 = imagem_cabecalho("./image/inmetro.png", (100, 100))
 
 # Definir estilo customizado
 st.markdown(
@@ -1,18 +1,20 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from PIL import Image
+
+from utils.carregamento import carregar_fontes
+from utils.fontes import COLUNAS_ETAPAS_SOP, COLUNAS_MEDICAO_SOP
+from utils.imagens import imagem_cabecalho
+from utils.importacao import alt
+from utils.perfil import exibir_perfil, iniciar_perfil, marcar
 
 # Configurar layout da página para largura completa
 st.set_page_config(layout="wide")
 
-# Carregar imagens
-imagem1 = Image.open("./image/genn.png")
-imagem2 = Image.open("./image/sop.png")
+# Perfil desta execução da página (só com ?perfil=1 na URL ou DASHBOARDS_PERFIL=1)
+iniciar_perfil("SOP")
+marcar("cabeçalho")
 
-# Reduzir o tamanho das imagens
-imagem1 = imagem1.resize((200, 200))
-imagem2 = imagem2.resize((350, 200))
+# Carregar a imagem já redimensionada (preparada uma vez por processo)
+imagem2 = imagem_cabecalho("./image/sop.png", (350, 200))
 
 # Definir estilo customizado
 st.markdown(
@@ -49,85 +51,32 @@ with col1:
     st.image(imagem2, caption=None, use_column_width=False)
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Função para carregar dados de uma URL CSV
-@st.cache_data(ttl=60)
-def load_data(url):
-    data = pd.read_csv(url)
-    return data
-
-# URLs dos CSVs
-urls = {
-    "data1": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQqArKQaOEijehSgxrnDUh7Pyo4VBM8ILxPnlcKTGy1zOaDS17C-2jQODUjBlhu2cEIJG59Euq0GQ5D/pub?gid=636293343&single=true&output=csv",
-    "data2": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQqArKQaOEijehSgxrnDUh7Pyo4VBM8ILxPnlcKTGy1zOaDS17C-2jQODUjBlhu2cEIJG59Euq0GQ5D/pub?gid=1758648028&single=true&output=csv",
-    "data3": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQqArKQaOEijehSgxrnDUh7Pyo4VBM8ILxPnlcKTGy1zOaDS17C-2jQODUjBlhu2cEIJG59Euq0GQ5D/pub?gid=607349672&single=true&output=csv",
-    "data4": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQqArKQaOEijehSgxrnDUh7Pyo4VBM8ILxPnlcKTGy1zOaDS17C-2jQODUjBlhu2cEIJG59Euq0GQ5D/pub?gid=1784106199&single=true&output=csv",
+# Planilhas da SOP (uma aba por conjunto de dados)
+fontes = {
+    "data1": "sop_ois",
+    "data2": "sop_etapas",
+    "data3": "sop_medicoes",
+    "data4": "sop_oat",
 }
 
-# Carregar os dados de todas as URLs
-data = {key: load_data(url) for key, url in urls.items()}
-
-# Converter colunas relevantes para strings para garantir que sejam exibidas corretamente
-for col in ["V.TOTAL LOTE 1", "V.TOTAL LOTE 4", "SALDO LOTE 1", "SALDO LOTE 4"]:
-    data["data1"][col] = data["data1"][col].astype(str)
-
-# Limpeza dos dados do segundo conjunto de dados
-expected_columns = [
-    "ETAPA 1 (CR.F.FINANCEIRO) 30 DIAS",
-    "ETAPA 2 (CR.F.FINANCEIRO) 60 DIAS",
-    "ETAPA 3 (CR.F.FINANCEIRO) 90 DIAS",
-    "ETAPA 4 (CR.F.FINANCEIRO) 120 DIAS",
-    "ETAPA 5 (CR.F.FINANCEIRO) 150 DIAS",
-    "ETAPA 6 (CR.F.FINANCEIRO) 180 DIAS",
-    "VALOR DO CONTRATO",
-]
-
-for col in expected_columns:
-    if col in data["data2"].columns:
-        data["data2"][col] = (
-            data["data2"][col].replace("[R$ ,]", "", regex=True).astype(float)
-        )
+marcar("carregamento")
+# Carregar os dados de todas as planilhas em paralelo (já tipados pelo carregador compartilhado)
+tabelas, falhas = carregar_fontes(fontes.values())
+data = {key: tabelas[nome] for key, nome in fontes.items()}
 
-# Limpeza e conversão dos dados do terceiro conjunto de dados
-def clean_and_convert(value):
-    if isinstance(value, str) and "TOTAL" in value:
-        return None
-    try:
-        return float(value.replace("R$", "").replace(".", "").replace(",", ".").strip())
-    except (ValueError, AttributeError):
-        return 0.0
+# Colunas financeiras do segundo conjunto de dados
+expected_columns = COLUNAS_ETAPAS_SOP
 
 # Extração e soma das colunas mensais
-monthly_columns = [
-    "MEDIÇÃO JUNHO",
-    "MEDIÇÃO JULHO",
-    "MEDIÇÃO AGOSTO",
-    "MEDIÇÃO SETEMBRO",
-    "MEDIÇÃO OUTUBRO",
-    "MEDIÇÃO NOVEMBRO",
-    "MEDIÇÃO DEZEMBRO",
-]
-
-monthly_totals = {}
-for month in monthly_columns:
-    data["data3"][month] = data["data3"][month].apply(clean_and_convert)
-    # Filtrar valores None que representam linhas 'TOTAL'
-    filtered_data = data["data3"][month].dropna()
-    monthly_totals[month] = filtered_data.sum()
+monthly_columns = COLUNAS_MEDICAO_SOP
 
 # Função para carregar CSS
 def local_css(file_name):
     with open(file_name) as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-# Função principal do Streamlit
-def sopoat():
-    # Carregar CSS local
-    local_css("./css/ois.css")
-
-    # Título e subtítulo da página
-    
-    st.subheader("Ordem de Inicio de Serviços - OIS")
-
+# Seção de métricas da OIS (primeiro conjunto de dados)
+def secao_ois():
     # Layout da página para métricas
     st.write("## Métricas")
     col1, col2, col3, col4 = st.columns(4)
@@ -173,6 +122,8 @@ def sopoat():
         st.write(data["data1"])
     st.write("---")
 
+# Seção de etapas financeiras por escola (segundo conjunto de dados)
+def secao_etapas():
     # Layout da página para gráficos interativos
     st.subheader("Visualização de Dados")
 
@@ -241,7 +192,15 @@ def sopoat():
 
     st.write("---")
 
+# Seção de medições mensais (terceiro conjunto de dados)
+def secao_medicoes():
     # Métricas dos dados do terceiro conjunto
+    monthly_totals = {}
+    for month in monthly_columns:
+        # Filtrar valores None que representam linhas 'TOTAL'
+        filtered_data = data["data3"][month].dropna()
+        monthly_totals[month] = filtered_data.sum()
+
     st.write("Medição 2024 || Prévia:")
 
     cols = st.columns(len(monthly_columns))
@@ -262,9 +221,8 @@ def sopoat():
     if st.checkbox("Mostrar dados brutos - Medições", key="mediciones_raw"):
         st.write(data["data3"])
 
-    # Ensure the 'STATUS' column is clean and properly formatted
-    data["data4"]["STATUS"] = data["data4"]["STATUS"].str.strip()
-
+# Seção de status da OAT (quarto conjunto de dados)
+def secao_oat():
     # Define the possible status values
     status_enum = [
         "RECEBIDO",
@@ -390,5 +348,31 @@ def sopoat():
 
         st.altair_chart(chart_municipio, use_container_width=True)
 
+# Função principal do Streamlit
+def sopoat():
+    # Carregar CSS local
+    local_css("./css/ois.css")
+
+    # Título e subtítulo da página
+    
+    st.subheader("Ordem de Inicio de Serviços - OIS")
+
+    # Cada seção é exibida de forma independente: se uma aba não carregar, as demais aparecem
+    secoes = {
+        "data1": secao_ois,
+        "data2": secao_etapas,
+        "data3": secao_medicoes,
+        "data4": secao_oat,
+    }
+    for key, secao in secoes.items():
+        marcar(fontes[key])
+        if data[key] is None:
+            st.warning(f"Não foi possível carregar a planilha {fontes[key]}: {falhas[fontes[key]]}")
+        else:
+            secao()
+
 if __name__ == "__main__":
     sopoat()
+
+# Exibir o perfil da execução (só com o perfil ligado)
+exibir_perfil()
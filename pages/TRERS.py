@@ -1,18 +1,22 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from PIL import Image
+from datetime import datetime
 
-# Função para carregar dados do Google Sheets CSV
-def load_data(url):
-    return pd.read_csv(url)
+from utils.carregamento import carregar_fonte, carregar_indices, carregar_periodo
+from utils.graficos import especificar_grafico
+from utils.imagens import imagem_cabecalho
+from utils.importacao import alt, pd
+from utils.indices import filtrar_intervalo
+from utils.perfil import exibir_perfil, iniciar_perfil, marcar
 
 # Configurar layout da página para largura completa
 st.set_page_config(layout="wide")
 
-# Carregar e redimensionar a imagem
-imagem2 = Image.open("image/trers.png")
-imagem2 = imagem2.resize((250, 200))
+# Perfil desta execução da página (só com ?perfil=1 na URL ou DASHBOARDS_PERFIL=1)
+iniciar_perfil("TRERS")
+marcar("cabeçalho")
+
+# Carregar a imagem já redimensionada (preparada uma vez por processo)
+imagem2 = imagem_cabecalho("image/trers.png", (250, 200))
 
 # Definir estilo customizado
 st.markdown(
@@ -57,81 +61,12 @@ with col1:
 with col3:
     st.markdown('<div class="text">Contrato Correios</div>', unsafe_allow_html=True)
 
-# Carregar dados do Google Sheets CSV
-url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR2Ql1eYWomSTjyQrylSBJ2tHgslpJEmA3iXrxJWTyJMNSkYRauZrJisIgEi1wT9D4Uu7S0Eyo04Xq3/pub?gid=1846942667&single=true&output=csv"
-data = load_data(url)
-
-# Limpar valores na coluna "VALOR ORÇADO" removendo pontuação, símbolos de moeda e espaços
-data["VALOR ORÇADO"] = (
-    data["VALOR ORÇADO"]
-    .str.replace(r"[^\d,]", "", regex=True)
-    .str.replace(",", ".")
-    .astype(float)
-)
-
-# Limpar valores na coluna "DATA FINALIZADO" formatando as datas corretamente
-data["DATA FINALIZADO"] = pd.to_datetime(
-    data["DATA FINALIZADO"], format="%d/%m/%Y", errors="coerce"
-)
-
-# Adicionar coluna "DATA RECEBIDO" formatando corretamente
-data["DATA RECEBIDO"] = pd.to_datetime(
-    data["DATA RECEBIDO"], format="%d/%m/%Y", errors="coerce"
-)
-
-# Filtrar dados para os anos de 2023 e 2024 e calcular valor orçado por mês
-data["Ano"] = data["DATA FINALIZADO"].dt.year
-data["Mes"] = data["DATA FINALIZADO"].dt.strftime("%B")
-data_filtered = data[(data["Ano"] == 2023) | (data["Ano"] == 2024)]
-
-# Agrupar dados por ano e mês
-grouped_data = data_filtered.groupby(["Ano", "Mes"])["VALOR ORÇADO"].sum().reset_index()
-
-# Ordenar os meses
-grouped_data["Mes"] = pd.Categorical(
-    grouped_data["Mes"],
-    categories=[
-        "January",
-        "February",
-        "March",
-        "April",
-        "May",
-        "June",
-        "July",
-        "August",
-        "September",
-        "October",
-        "November",
-        "December",
-    ],
-    ordered=True,
-)
-grouped_data = grouped_data.sort_values(["Ano", "Mes"])
-
 # Definir o esquema de cores personalizado
 color_scheme = ["#A9A9A9", "#87CEEB", "#66CDAA", "#F0F8FF", "#B0E0E6"]
 
-# Criar gráfico de barras com Altair
-chart1 = (
-    alt.Chart(grouped_data)
-    .mark_bar()
-    .encode(
-        x=alt.X("Mes:N", title="Mês"),
-        y=alt.Y("VALOR ORÇADO:Q", title="Valor Orçado"),
-        color=alt.Color(
-            "Ano:N",
-            title="Ano",
-            scale=alt.Scale(range=color_scheme)
-        ),
-        tooltip=["Ano", "Mes", "VALOR ORÇADO"],
-    )
-    .properties(width=600, height=400, title="Valor Orçado por Mês em 2023 e 2024")
-)
-
-# Filtrar dados para os anos de 2023 e 2024
-data_filtered_os = data[
-    (data["DATA RECEBIDO"].dt.year == 2023) | (data["DATA RECEBIDO"].dt.year == 2024)
-]
+marcar("OS por dia")
+# Filtrar dados para os anos de 2023 e 2024 (só as partições desses anos)
+data_filtered_os = carregar_periodo("trers", datetime(2023, 1, 1), datetime(2025, 1, 1))
 
 # Agrupar dados por dia
 os_grouped_data = (
@@ -140,104 +75,183 @@ os_grouped_data = (
 os_grouped_data["Ano"] = os_grouped_data["DATA RECEBIDO"].dt.year
 
 # Criar gráfico de barras para Quantidade de OS Recebidas por Dia
-chart2 = (
-    alt.Chart(os_grouped_data)
-    .mark_bar()
-    .encode(
-        x=alt.X("DATA RECEBIDO:T", title="Data Recebido"),
-        y=alt.Y("Quantidade OS:Q", title="Quantidade de OS"),
-        color=alt.Color(
-            "Ano:N",
-            title="Ano",
-            scale=alt.Scale(range=color_scheme)
-        ),
-        tooltip=["DATA RECEBIDO", "Quantidade OS"],
-    )
-    .properties(
-        width=600, height=400, title="Quantidade de OS Recebidas por Dia (2023 e 2024)"
+def grafico_os_dia():
+    return (
+        alt.Chart(os_grouped_data)
+        .mark_bar()
+        .encode(
+            x=alt.X("DATA RECEBIDO:T", title="Data Recebido"),
+            y=alt.Y("Quantidade OS:Q", title="Quantidade de OS"),
+            color=alt.Color(
+                "Ano:N",
+                title="Ano",
+                scale=alt.Scale(range=color_scheme)
+            ),
+            tooltip=["DATA RECEBIDO", "Quantidade OS"],
+        )
+        .properties(
+            width=600, height=400, title="Quantidade de OS Recebidas por Dia (2023 e 2024)"
+        )
     )
-)
 
 # Criar métrica com total de OS
 total_os = os_grouped_data["Quantidade OS"].sum()
 
+marcar("status e disciplinas")
 # Gráfico de colunas para Distribuição de Status
-status_grouped_data = data_filtered_os["STATUS*"].value_counts().reset_index()
+status_grouped_data = data_filtered_os["STATUS*"].value_counts()
+status_grouped_data = status_grouped_data[status_grouped_data > 0].reset_index()
 status_grouped_data.columns = ["Status", "Quantidade"]
 
-chart3 = (
-    alt.Chart(status_grouped_data)
-    .mark_bar()
-    .encode(
-        x=alt.X("Status:N", title="Status"),
-        y=alt.Y("Quantidade:Q", title="Quantidade"),
-        color=alt.Color(
-            "Status:N",
-            title="Status",
-            scale=alt.Scale(range=color_scheme),
-        ),
-        tooltip=["Status", "Quantidade"],
+def grafico_status():
+    return (
+        alt.Chart(status_grouped_data)
+        .mark_bar()
+        .encode(
+            x=alt.X("Status:N", title="Status"),
+            y=alt.Y("Quantidade:Q", title="Quantidade"),
+            color=alt.Color(
+                "Status:N",
+                title="Status",
+                scale=alt.Scale(range=color_scheme),
+            ),
+            tooltip=["Status", "Quantidade"],
+        )
+        .properties(width=600, height=400, title="Distribuição de Status")
     )
-    .properties(width=600, height=400, title="Distribuição de Status")
-)
+
+# Função para contar as OS de cada disciplina
+def contar_disciplinas():
+    disciplinas_grouped_data = data_filtered_os["DISCIPLINAS"].value_counts()
+    disciplinas_grouped_data = disciplinas_grouped_data[disciplinas_grouped_data > 0].reset_index()
+    disciplinas_grouped_data.columns = ["Disciplina", "Quantidade"]
+    return disciplinas_grouped_data
 
 # Gráfico de colunas para Distribuição de Disciplinas
-disciplinas_grouped_data = data_filtered_os["DISCIPLINAS"].value_counts().reset_index()
-disciplinas_grouped_data.columns = ["Disciplina", "Quantidade"]
-
-chart4 = (
-    alt.Chart(disciplinas_grouped_data)
-    .mark_bar()
-    .encode(
-        x=alt.X("Disciplina:N", title="Disciplina"),
-        y=alt.Y("Quantidade:Q", title="Quantidade"),
-        color=alt.Color(
-            "Disciplina:N",
-            title="Disciplina",
-            scale=alt.Scale(range=color_scheme),
-        ),
-        tooltip=["Disciplina", "Quantidade"],
+def grafico_disciplinas():
+    return (
+        alt.Chart(contar_disciplinas())
+        .mark_bar()
+        .encode(
+            x=alt.X("Disciplina:N", title="Disciplina"),
+            y=alt.Y("Quantidade:Q", title="Quantidade"),
+            color=alt.Color(
+                "Disciplina:N",
+                title="Disciplina",
+                scale=alt.Scale(range=color_scheme),
+            ),
+            tooltip=["Disciplina", "Quantidade"],
+        )
+        .properties(width=600, height=400, title="Distribuição de Disciplinas")
     )
-    .properties(width=600, height=400, title="Distribuição de Disciplinas")
-)
 
-# Agrupar dados por orçamentista e mês
-orcamentista_data = (
-    data_filtered.groupby(["ORÇAMENTISTA", "Mes"])["VALOR ORÇADO"].count().reset_index()
-)
-orcamentista_data.columns = ["Orçamentista", "Mês", "Quantidade"]
+marcar("carregamento")
+# Carregar dados do Google Sheets (já tipados pelo carregador compartilhado). Fica depois
+# das seções de 2023 e 2024, que num processo novo leem só as partições desses anos sem
+# esperar pela planilha inteira.
+data = carregar_fonte("trers")
+
+marcar("valor por mês")
+indices = carregar_indices("trers")
+
+# Função para acrescentar o ano e o nome do mês de "DATA FINALIZADO" (só nas linhas
+# usadas por um gráfico, em vez da planilha inteira a cada execução)
+def com_ano_mes(tabela):
+    return tabela.assign(
+        Ano=tabela["DATA FINALIZADO"].dt.year, Mes=tabela["DATA FINALIZADO"].dt.strftime("%B")
+    )
+
+# Função para ordenar os meses de uma tabela agrupada por ano e mês
+def ordenar_meses(agrupado):
+    agrupado["Mes"] = pd.Categorical(
+        agrupado["Mes"],
+        categories=[
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ],
+        ordered=True,
+    )
+    return agrupado.sort_values(["Ano", "Mes"])
 
+# Função para filtrar os dados finalizados em 2023 e 2024, com o ano e o mês
+def filtrar_finalizadas():
+    return com_ano_mes(filtrar_intervalo(
+        data, indices, "DATA FINALIZADO", datetime(2023, 1, 1), datetime(2025, 1, 1), incluir_fim=False
+    ))
+
+# Função para calcular o valor orçado por ano e mês em 2023 e 2024
+def agrupar_valor_mes():
+    grouped_data = filtrar_finalizadas().groupby(["Ano", "Mes"])["VALOR ORÇADO"].sum().reset_index()
+    return ordenar_meses(grouped_data)
+
+# Criar gráfico de barras com Altair
+def grafico_valor_mes():
+    return (
+        alt.Chart(agrupar_valor_mes())
+        .mark_bar()
+        .encode(
+            x=alt.X("Mes:N", title="Mês"),
+            y=alt.Y("VALOR ORÇADO:Q", title="Valor Orçado"),
+            color=alt.Color(
+                "Ano:N",
+                title="Ano",
+                scale=alt.Scale(range=color_scheme)
+            ),
+            tooltip=["Ano", "Mes", "VALOR ORÇADO"],
+        )
+        .properties(width=600, height=400, title="Valor Orçado por Mês em 2023 e 2024")
+    )
+
+marcar("orçamentistas")
 # Gráfico de barras para orçamentista e mês
-chart5 = (
-    alt.Chart(orcamentista_data)
-    .mark_bar()
-    .encode(
-        x=alt.X("Mês:N", title="Mês"),
-        y=alt.Y("Quantidade:Q", title="Quantidade de Orçamentos"),
-        color=alt.Color(
-            "Orçamentista:N", title="Orçamentista", scale=alt.Scale(range=color_scheme)
-        ),
-        tooltip=["Orçamentista", "Mês", "Quantidade"],
+def grafico_orcamentista_mes():
+    orcamentista_data = (
+        filtrar_finalizadas().groupby(["ORÇAMENTISTA", "Mes"], observed=True)["VALOR ORÇADO"].count().reset_index()
+    )
+    orcamentista_data.columns = ["Orçamentista", "Mês", "Quantidade"]
+
+    return (
+        alt.Chart(orcamentista_data)
+        .mark_bar()
+        .encode(
+            x=alt.X("Mês:N", title="Mês"),
+            y=alt.Y("Quantidade:Q", title="Quantidade de Orçamentos"),
+            color=alt.Color(
+                "Orçamentista:N", title="Orçamentista", scale=alt.Scale(range=color_scheme)
+            ),
+            tooltip=["Orçamentista", "Mês", "Quantidade"],
+        )
+        .properties(width=600, height=400, title="Orçamentos por Mês por Orçamentista")
     )
-    .properties(width=600, height=400, title="Orçamentos por Mês por Orçamentista")
-)
 
 # Gráfico de pizza para distribuição total de orçamentos por orçamentista
-total_orcamentista_data = data_filtered["ORÇAMENTISTA"].value_counts().reset_index()
-total_orcamentista_data.columns = ["Orçamentista", "Quantidade"]
-
-chart6 = (
-    alt.Chart(total_orcamentista_data)
-    .mark_arc()
-    .encode(
-        theta=alt.Theta(field="Quantidade", type="quantitative"),
-        color=alt.Color(field="Orçamentista", type="nominal", scale=alt.Scale(range=color_scheme)),
-        tooltip=["Orçamentista", "Quantidade"],
-    )
-    .properties(
-        width=400, height=400, title="Distribuição de Orçamentos por Orçamentista"
+def grafico_orcamentista():
+    total_orcamentista_data = filtrar_finalizadas()["ORÇAMENTISTA"].value_counts()
+    total_orcamentista_data = total_orcamentista_data[total_orcamentista_data > 0].reset_index()
+    total_orcamentista_data.columns = ["Orçamentista", "Quantidade"]
+
+    return (
+        alt.Chart(total_orcamentista_data)
+        .mark_arc()
+        .encode(
+            theta=alt.Theta(field="Quantidade", type="quantitative"),
+            color=alt.Color(field="Orçamentista", type="nominal", scale=alt.Scale(range=color_scheme)),
+            tooltip=["Orçamentista", "Quantidade"],
+        )
+        .properties(
+            width=400, height=400, title="Distribuição de Orçamentos por Orçamentista"
+        )
     )
-)
 
 # Estilos CSS personalizados para métricas e botões
 metric_css = """
@@ -278,152 +292,170 @@ metric_css = """
 # Inserir CSS personalizado na página
 st.markdown(metric_css, unsafe_allow_html=True)
 
+marcar("exibição dos gráficos")
 # Layout com gráfico de status na primeira linha
 st.write("### Distribuição de Status")
-st.altair_chart(chart3, use_container_width=True)
+st.vega_lite_chart(especificar_grafico("trers", "status", grafico_status), use_container_width=True)
+
+# Métricas e botões de status num fragmento: o clique num status reexecuta só esta
+# linha, sem recarregar a planilha nem remontar os gráficos da página
+@st.fragment
+def exibir_metricas_status():
+    # Layout com métricas na segunda linha
+    metric_columns = st.columns(len(status_grouped_data) + 1)
+
+    # Adicionar métrica para total de OS
+    with metric_columns[0]:
+        st.markdown("<div class='metric-label'>Total OS</div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='metric-value'>{total_os}</div>", unsafe_allow_html=True)
+
+    # Adicionar métricas de status com botões
+    for idx, row in status_grouped_data.iterrows():
+        with metric_columns[idx + 1]:
+            st.markdown(
+                f"<div class='metric-label'>{row['Status']}</div>", unsafe_allow_html=True
+            )
+            st.markdown(
+                f"<div class='metric-value'>{row['Quantidade']}</div>",
+                unsafe_allow_html=True,
+            )
+
+            if st.button(row["Status"], key=f"btn_{row['Status']}"):
+                status_filtered_data = data_filtered_os[
+                    data_filtered_os["STATUS*"] == row["Status"]
+                ]
+                st.write(f"Tabela - {row['Status']}")
+                st.write(status_filtered_data)
+
+exibir_metricas_status()
+
+marcar("valor por status")
+# Layout com gráfico de valor orçado por status
+st.write("---")
 
-# Layout com métricas na segunda linha
-metric_columns = st.columns(len(status_grouped_data) + 1)
+# Status disponíveis no seletor
+status_options = data["STATUS*"].unique()
 
-# Adicionar métrica para total de OS
-with metric_columns[0]:
-    st.markdown("<div class='metric-label'>Total OS</div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='metric-value'>{total_os}</div>", unsafe_allow_html=True)
+# Função para montar o gráfico de valor orçado por mês do status selecionado
+def grafico_valor_status(status):
+    # Agrupar dados por ano e mês para o status selecionado
+    grouped_data_status = (
+        com_ano_mes(data[data["STATUS*"] == status]).groupby(["Ano", "Mes"])["VALOR ORÇADO"].sum().reset_index()
+    )
 
-# Adicionar métricas de status com botões
-for idx, row in status_grouped_data.iterrows():
-    with metric_columns[idx + 1]:
-        st.markdown(
-            f"<div class='metric-label'>{row['Status']}</div>", unsafe_allow_html=True
+    # Ordenar os meses
+    grouped_data_status = ordenar_meses(grouped_data_status)
+
+    # Criar gráfico de barras com Altair para o status selecionado
+    return (
+        alt.Chart(grouped_data_status)
+        .mark_bar()
+        .encode(
+            x=alt.X("Mes:N", title="Mês"),
+            y=alt.Y("VALOR ORÇADO:Q", title="Valor Orçado"),
+            color=alt.Color(
+                "Ano:N",
+                title="Ano",
+                scale=alt.Scale(range=color_scheme)
+            ),
+            tooltip=["Ano", "Mes", "VALOR ORÇADO"],
         )
-        st.markdown(
-            f"<div class='metric-value'>{row['Quantidade']}</div>",
-            unsafe_allow_html=True,
+        .properties(
+            width=600,
+            height=400,
+            title=f"Valor Orçado por Mês para Status '{status}' em 2023 e 2024",
         )
+    )
 
-        if st.button(row["Status"], key=f"btn_{row['Status']}"):
-            status_filtered_data = data_filtered_os[
-                data_filtered_os["STATUS*"] == row["Status"]
-            ]
-            st.write(f"Tabela - {row['Status']}")
-            st.write(status_filtered_data)
-
-# Layout com gráfico de valor orçado por status
-st.write("---")
-col1, col2, col3 = st.columns([1, 4, 1])
-
-# Selectbox para escolher o status
-status_options = data["STATUS*"].unique()
-selected_status = col1.selectbox("Selecione o Status", status_options)
-
-# Filtrar os dados com base no status selecionado
-filtered_data_status = data[data["STATUS*"] == selected_status]
+# Fragmento do valor orçado por status: trocar o status reexecuta só esta seção
+@st.fragment
+def exibir_valor_status():
+    col1, col2, col3 = st.columns([1, 4, 1])
+    selected_status = col1.selectbox("Selecione o Status", status_options)
 
-# Agrupar dados por ano e mês para o status selecionado
-grouped_data_status = (
-    filtered_data_status.groupby(["Ano", "Mes"])["VALOR ORÇADO"].sum().reset_index()
-)
+    # Filtrar os dados com base no status selecionado
+    filtered_data_status = data[data["STATUS*"] == selected_status]
 
-# Ordenar os meses
-grouped_data_status["Mes"] = pd.Categorical(
-    grouped_data_status["Mes"],
-    categories=[
-        "January",
-        "February",
-        "March",
-        "April",
-        "May",
-        "June",
-        "July",
-        "August",
-        "September",
-        "October",
-        "November",
-        "December",
-    ],
-    ordered=True,
-)
-grouped_data_status = grouped_data_status.sort_values(["Ano", "Mes"])
-
-# Criar gráfico de barras com Altair para o status selecionado
-chart_status = (
-    alt.Chart(grouped_data_status)
-    .mark_bar()
-    .encode(
-        x=alt.X("Mes:N", title="Mês"),
-        y=alt.Y("VALOR ORÇADO:Q", title="Valor Orçado"),
-        color=alt.Color(
-            "Ano:N",
-            title="Ano",
-            scale=alt.Scale(range=color_scheme)
-        ),
-        tooltip=["Ano", "Mes", "VALOR ORÇADO"],
-    )
-    .properties(
-        width=600,
-        height=400,
-        title=f"Valor Orçado por Mês para Status '{selected_status}' em 2023 e 2024",
+    col2.vega_lite_chart(
+        especificar_grafico("trers", "valor_status", grafico_valor_status, selected_status),
+        use_container_width=True,
     )
-)
 
-col2.altair_chart(chart_status, use_container_width=True)
+    # Calcular métrica para o status selecionado
+    total_valor_orcado_status = filtered_data_status["VALOR ORÇADO"].sum()
 
-# Calcular métrica para o status selecionado
-total_valor_orcado_status = filtered_data_status["VALOR ORÇADO"].sum()
+    with col3:
+        st.markdown(
+            f"<div class='metric-label'>Total Valor Orçado ({selected_status})</div>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f"<div class='metric-value'>{total_valor_orcado_status:.2f}</div>",
+            unsafe_allow_html=True,
+        )
 
-with col3:
-    st.markdown(
-        f"<div class='metric-label'>Total Valor Orçado ({selected_status})</div>",
-        unsafe_allow_html=True,
-    )
-    st.markdown(
-        f"<div class='metric-value'>{total_valor_orcado_status:.2f}</div>",
-        unsafe_allow_html=True,
-    )
+exibir_valor_status()
 
 # Layout com gráficos e tabelas
 st.write("---")
 col1, col2 = st.columns([1, 6])
 
-with col1:
+# Fragmento da caixa de seleção e da tabela de valores (marcar a caixa reexecuta só
+# esta coluna, sem remontar o gráfico ao lado)
+@st.fragment
+def exibir_tabela_valor_mes():
     show_table1 = st.checkbox("Tabela Dados", key="table1_checkbox")
     if show_table1:
-        st.write(grouped_data[["Ano", "Mes", "VALOR ORÇADO"]])
+        st.write(agrupar_valor_mes()[["Ano", "Mes", "VALOR ORÇADO"]])
+
+with col1:
+    exibir_tabela_valor_mes()
 
 with col2:
-    st.altair_chart(chart1, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("trers", "valor_mes", grafico_valor_mes), use_container_width=True)
 
 st.write("---")
 col3, col4 = st.columns([5, 1])
 
 with col3:
-    st.altair_chart(chart2, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("trers", "os_dia", grafico_os_dia), use_container_width=True)
 
-with col4:
+# Fragmento da tabela de OS por dia
+@st.fragment
+def exibir_tabela_os_dia():
     show_table2 = st.checkbox("Mostrar Tabela 2", key="table2_checkbox")
     if show_table2:
         st.write(os_grouped_data)
 
+with col4:
+    exibir_tabela_os_dia()
+
 st.write("---")
 col7, col8 = st.columns([5, 1])
 
 with col7:
-    st.altair_chart(chart4, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("trers", "disciplinas", grafico_disciplinas), use_container_width=True)
 
-with col8:
+# Fragmento da tabela de disciplinas
+@st.fragment
+def exibir_tabela_disciplinas():
     show_table4 = st.checkbox("Mostrar Tabela 4", key="table4_checkbox")
     if show_table4:
-        st.write(disciplinas_grouped_data)
+        st.write(contar_disciplinas())
+
+with col8:
+    exibir_tabela_disciplinas()
 
 st.write("---")
 col9, col10 = st.columns([3, 5])
 
 with col9:
-    st.altair_chart(chart6, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("trers", "orcamentista", grafico_orcamentista), use_container_width=True)
 
 with col10:
-    st.altair_chart(chart5, use_container_width=True)
+    st.vega_lite_chart(especificar_grafico("trers", "orcamentista_mes", grafico_orcamentista_mes), use_container_width=True)
 
+marcar("serviços em andamento")
 # Filtrar dados pelos status "APROVADO", "RECEBIDO" e "EXECUÇÃO"
 filtered_status_data = data_filtered_os[
     data_filtered_os["STATUS*"].isin(["APROVADO", "RECEBIDO", "EXECUÇÃO"])
@@ -439,7 +471,8 @@ grouped_status_data = (
             "PREVISÃO DE INÍCIO",
             "PREVISÃO DE FINALIZAÇÃO",
             "OBSERVAÇÃO",
-        ]
+        ],
+        observed=True,
     )
     .size()
     .reset_index(name="Quantidade")
@@ -460,3 +493,5 @@ second_table = filtered_status_data[[
 
 st.write(second_table)
 
+# Exibir o perfil da execução (só com o perfil ligado)
+exibir_perfil()
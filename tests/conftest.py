@@ -0,0 +1,46 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from benchmarks.gerar_planilhas import gravar_planilha
+from utils import carregamento, fontes, snapshots
+
+# Linhas de cada planilha sintética usada nos testes
+LINHAS_TESTE = 300
+
+
+# Carregador com o estado zerado, snapshots num diretório temporário e sem o
+# atualizador em segundo plano
+@pytest.fixture
+def carregador(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "DIRETORIO_SNAPSHOTS", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(carregamento, "iniciar_atualizador", lambda: None)
+    monkeypatch.setattr(carregamento, "_estado", carregamento.defaultdict(dict))
+    monkeypatch.setattr(carregamento, "_derivados", {})
+    monkeypatch.setattr(carregamento, "_agenda", {})
+    return carregamento._estado
+
+
+# Planilhas sintéticas (benchmarks.gerar_planilhas) no lugar das publicadas: devolve
+# o diretório com um <nome>.csv por planilha
+@pytest.fixture
+def planilhas_locais(carregador, tmp_path, monkeypatch):
+    dados = tmp_path / "dados"
+    dados.mkdir()
+    for nome, fonte in fontes.FONTES.items():
+        caminho = dados / f"{nome}.csv"
+        gravar_planilha(caminho, nome, LINHAS_TESTE, 0)
+        monkeypatch.setitem(fontes.FONTES, nome, dataclasses.replace(fonte, url=str(caminho)))
+    return dados
+
+
+# Função para reescrever uma planilha local: `alterar` recebe a tabela do CSV (todas as
+# células como texto, vazias como "") e devolve a nova versão
+@pytest.fixture
+def reescrever():
+    def reescrever(caminho, alterar):
+        tabela = pd.read_csv(caminho, dtype=str, keep_default_na=False)
+        alterar(tabela).to_csv(caminho, index=False)
+
+    return reescrever
@@ -0,0 +1,47 @@
+from utils import aquecimento, telemetria
+from utils.carregamento import calcular_derivado, carregar_indices, carregar_periodo
+from utils.consultas import consultar
+from utils.metricas import COLUNAS_CUBO, montar_cubo
+
+
+# Função para ler quantas consultas ao cache de derivados deram cada resultado
+def _derivados():
+    return {
+        dict(rotulos)["resultado"]: valor
+        for (metrica, rotulos), valor in telemetria._valores.items()
+        if metrica == "dashboards_cache_total" and dict(rotulos)["cache"] == "derivado"
+    }
+
+
+def test_aquecimento_cobre_o_que_as_paginas_calculam(planilhas_locais):
+    assert aquecimento.aquecer() == {}
+    antes = _derivados()
+
+    # As mesmas chamadas das páginas na primeira visita
+    calcular_derivado("banrisul", montar_cubo, colunas=COLUNAS_CUBO)
+    carregar_indices("banrisul")
+    carregar_indices("correios")
+    carregar_indices("trers")
+    for nome in ["correios", "serpro", "trers"]:
+        carregar_periodo(nome, "2023-01-01", "2025-01-01", colunas=["DATA RECEBIDO"])
+    carregar_periodo("correios", "2023-01-01", "2025-01-01", coluna="DATA EXECUÇÃO (INÍCIO)")
+    carregar_periodo("trers", "2023-01-01", "2025-01-01")
+    consultar("correios", "contagem", coluna="STATUS*")
+    consultar("correios", "valores_mensais")
+    consultar("serpro", "contagem", coluna="DISCIPLINAS")
+
+    depois = _derivados()
+    novos = {resultado: depois.get(resultado, 0) - antes.get(resultado, 0) for resultado in ["hit", "miss", "stale"]}
+    assert novos["hit"] > 0
+    assert novos["miss"] == novos["stale"] == 0
+
+
+def test_iniciar_aquecimento_esperando_volta_com_os_caches_prontos(planilhas_locais, monkeypatch):
+    monkeypatch.setattr(aquecimento, "_aquecedor", None)
+    monkeypatch.setattr(aquecimento, "_situacao", {"estado": "parado", "duracao": None, "falhas": {}})
+    monkeypatch.setattr(aquecimento, "iniciar_exportacao", lambda: None)
+
+    aquecimento.iniciar_aquecimento(esperar=True)
+
+    assert aquecimento._situacao["estado"] == "pronto"
+    assert aquecimento._prontidao()[0] == 200
@@ -0,0 +1,236 @@
+import dataclasses
+import threading
+
+import pandas as pd
+import pytest
+
+from utils import carregamento
+from utils.perfil import iniciar_perfil
+
+
+# Função para publicar uma versão da planilha, como faz o atualizador
+def _publicar(estado, nome, valores, versao):
+    tabela = carregamento._marcar(pd.DataFrame({"VALOR": valores}), versao)
+    estado[nome].update(versao=versao, tabela=tabela)
+
+
+def test_carregar_fonte_entrega_a_versao_junto_com_a_tabela(carregador):
+    _publicar(carregador, "teste", [1, 2], "v1")
+
+    tabela = carregamento.carregar_fonte("teste", ["VALOR"])
+
+    assert tabela.attrs["versao"] == "v1"
+    assert carregamento.versoes_lidas("teste") >= {"v1"}
+
+
+def test_alteracao_da_pagina_nao_altera_o_cache(carregador):
+    _publicar(carregador, "teste", [1, 2], "v1")
+
+    tabela = carregamento.carregar_fonte("teste")
+    tabela.loc[0, "VALOR"] = 99
+
+    assert carregamento.carregar_fonte("teste")["VALOR"].tolist() == [1, 2]
+
+
+def test_versoes_lidas_esquecidas_no_inicio_da_pagina(carregador):
+    _publicar(carregador, "teste", [1, 2], "v1")
+    carregamento.carregar_fonte("teste")
+    _publicar(carregador, "teste", [1, 2], "v2")
+
+    iniciar_perfil("teste")
+    carregamento.carregar_fonte("teste")
+
+    assert carregamento.versoes_lidas("teste") == {"v2"}
+
+
+def test_carregar_fontes_anota_as_versoes_na_thread_da_pagina(carregador):
+    _publicar(carregador, "teste", [1, 2], "v1")
+    iniciar_perfil("teste")
+
+    tabelas, falhas = carregamento.carregar_fontes(["teste"])
+
+    assert not falhas
+    assert tabelas["teste"].attrs["versao"] == "v1"
+    assert carregamento.versoes_lidas("teste") == {"v1"}
+
+
+
+# Abas da planilha da SOP, carregadas juntas pela página
+ABAS_SOP = ["sop_ois", "sop_etapas", "sop_medicoes", "sop_oat"]
+
+
+def test_abas_da_sop_baixadas_ao_mesmo_tempo(planilhas_locais, monkeypatch):
+    # Cada download só termina quando os quatro estão em andamento
+    todas = threading.Barrier(len(ABAS_SOP), timeout=10)
+    requisitar = carregamento._requisitar
+
+    def requisitar_junto(url, estado):
+        todas.wait()
+        return requisitar(url, estado)
+
+    monkeypatch.setattr(carregamento, "_requisitar", requisitar_junto)
+
+    tabelas, falhas = carregamento.carregar_fontes(ABAS_SOP)
+
+    assert not falhas
+    assert all(len(tabelas[nome]) > 0 for nome in ABAS_SOP)
+
+
+def test_aba_com_falha_nao_impede_as_demais(planilhas_locais):
+    (planilhas_locais / "sop_medicoes.csv").unlink()
+
+    tabelas, falhas = carregamento.carregar_fontes(ABAS_SOP)
+
+    assert list(falhas) == ["sop_medicoes"]
+    assert tabelas["sop_medicoes"] is None
+    assert all(tabelas[nome] is not None for nome in ABAS_SOP if nome != "sop_medicoes")
+
+
+def test_atualizador_agenda_so_as_planilhas_lidas(carregador):
+    _publicar(carregador, "correios", [1, 2], "v1")
+
+    carregamento.carregar_fonte("correios")
+
+    assert list(carregamento._agenda) == ["correios"]
+
+
+def test_derivado_guardado_com_a_versao_usada_no_calculo(carregador):
+    _publicar(carregador, "teste", [1, 2], "v1")
+
+    # O atualizador troca a planilha enquanto o derivado da versão anterior é calculado
+    def somar(tabela):
+        _publicar(carregador, "teste", [10, 20], "v2")
+        return int(tabela["VALOR"].sum())
+
+    assert carregamento.calcular_derivado("teste", somar) == 3
+    assert carregamento.calcular_derivado("teste", lambda tabela: int(tabela["VALOR"].sum())) == 30
+    assert carregamento.calcular_derivado("teste", somar) == 30
+    (versao, _), = [valor for chave, valor in carregamento._derivados.items() if "somar" in chave[2]]
+    assert versao == "v2"
+
+
+
+def test_conteudo_igual_reaproveita_a_tabela_sem_preparar(planilhas_locais, monkeypatch):
+    tabela = carregamento._baixar("correios")
+    fonte = carregamento.FONTES["correios"]
+    preparadas = []
+
+    def preparar(bruta):
+        preparadas.append(bruta)
+        return fonte.preparar(bruta)
+
+    monkeypatch.setitem(carregamento.FONTES, "correios", dataclasses.replace(fonte, preparar=preparar))
+
+    # Mesmo conteúdo baixado de novo e resposta 304 (sem corpo)
+    assert carregamento._baixar("correios") is tabela
+    monkeypatch.setattr(carregamento, "_requisitar", lambda url, estado: (None, '"etag"', None))
+    assert carregamento._baixar("correios") is tabela
+
+    assert not preparadas
+    assert carregamento._estado["correios"]["etag"] == '"etag"'
+
+
+def test_colunas_declaradas_pelo_nome_preparado():
+    corpo = "ID,ORÇAMENTISTA ,VALOR ORÇADO,OBSERVAÇÃO\n1,Ana,\"R$ 1,00\",x\n".encode("utf-8")
+    colunas = {"ID": None, "ORCAMENTISTA": str, "VALOR ORCADO": str}
+
+    bruta = carregamento._ler_csv(corpo, colunas, carregamento.FONTES["serpro"].nomear)
+
+    assert list(bruta.columns) == ["ID", "ORÇAMENTISTA ", "VALOR ORÇADO"]
+    assert bruta["VALOR ORÇADO"].tolist() == ["R$ 1,00"]
+    preparada = carregamento.FONTES["serpro"].preparar(bruta)
+    assert preparada["VALOR ORCADO"].tolist() == [1.0]
+
+
+# Versão inicial da planilha dos Correios, com IDs vazios como na planilha real
+def _ids_vazios(tabela):
+    tabela.loc[:2, " ID"] = ""
+    return tabela
+
+
+# Nova versão: uma linha de ID vazio e uma com ID alterada, cinco removidas e três inseridas
+def _nova_versao(tabela):
+    tabela.loc[1, "STATUS*"] = "FINALIZADO"
+    tabela.loc[10, ["STATUS*", "VALOR ORÇADO"]] = ["EXECUÇÃO", "R$ 1.234,56"]
+    inseridas = tabela.iloc[30:33].assign(**{" ID": ["9001", "9002", "9003"]})
+    return pd.concat([tabela.drop(index=range(20, 25)), inseridas], ignore_index=True)
+
+
+def test_mescla_por_linhas_igual_a_preparacao_completa(planilhas_locais, reescrever):
+    caminho = planilhas_locais / "correios.csv"
+    reescrever(caminho, _ids_vazios)
+    carregamento._baixar("correios")
+    reescrever(caminho, _nova_versao)
+
+    mesclada = carregamento._baixar("correios")
+
+    delta = carregamento._estado["correios"]["delta"]
+    assert delta is not None
+    # Inseridas: 3 de ID vazio, 1 alterada e 3 novas; removidas: 3 de ID vazio, 1 alterada e 5
+    assert (len(delta["inseridas"]), len(delta["removidas"])) == (7, 9)
+    fonte = carregamento.FONTES["correios"]
+    completa = fonte.preparar(carregamento._ler_csv(caminho.read_bytes(), fonte.colunas, fonte.nomear))
+    pd.testing.assert_frame_equal(mesclada, completa, check_categorical=False)
+
+
+def test_chave_repetida_prepara_a_planilha_inteira(planilhas_locais, reescrever):
+    caminho = planilhas_locais / "correios.csv"
+    carregamento._baixar("correios")
+
+    def repetir_id(tabela):
+        tabela.loc[1, " ID"] = tabela.loc[0, " ID"]
+        return tabela
+
+    reescrever(caminho, repetir_id)
+    carregamento._baixar("correios")
+
+    assert carregamento._estado["correios"]["delta"] is None
+
+
+def test_periodo_lido_das_particoes_igual_ao_da_tabela_em_memoria(planilhas_locais, monkeypatch):
+    carregamento._baixar("correios")
+    memoria = carregamento.carregar_periodo("correios", "2023-03-01", "2023-06-01")
+    # Processo novo: só o snapshot em disco, sem a planilha em memória
+    monkeypatch.setattr(carregamento, "_estado", carregamento.defaultdict(dict))
+    monkeypatch.setattr(carregamento._executor, "submit", lambda *args: None)
+
+    particoes = carregamento.carregar_periodo("correios", "2023-03-01", "2023-06-01")
+
+    assert carregamento._estado["correios"].get("tabela") is None
+    assert len(particoes) > 0
+    pd.testing.assert_frame_equal(particoes, memoria, check_categorical=False)
+
+
+def test_planilha_completa_na_ordem_do_cabecalho(planilhas_locais):
+    carregamento._baixar("serpro")
+
+    completa = carregamento.carregar_fonte_completa("serpro")
+
+    fonte = carregamento.FONTES["serpro"]
+    cabecalho = pd.read_csv(planilhas_locais / "serpro.csv", nrows=0).columns
+    assert list(completa.columns) == [fonte.nomear(col) for col in cabecalho]
+    assert completa.attrs["versao"] == carregamento.versao_fonte("serpro")
+
+
+def test_planilha_completa_nao_usa_csv_de_outra_versao(planilhas_locais, reescrever):
+    carregamento._baixar("correios")
+    caminho = planilhas_locais / "correios.csv"
+    reescrever(caminho, lambda tabela: tabela.iloc[::-1])
+    carregamento.salvar_csv("correios", caminho.read_bytes())
+
+    with pytest.raises(RuntimeError):
+        carregamento.carregar_fonte_completa("correios")
+    assert "correios" not in [chave[0] for chave in carregamento._derivados]
+
+
+def test_detalhes_das_linhas_so_da_mesma_versao(planilhas_locais, reescrever):
+    carregamento._baixar("correios")
+    periodo = carregamento.carregar_periodo("correios", "2023-03-01", "2023-06-01")
+
+    detalhes = carregamento.detalhar("correios", periodo)
+
+    assert len(detalhes.columns) > len(periodo.columns)
+    pd.testing.assert_frame_equal(detalhes[periodo.columns], periodo, check_categorical=False)
+    reescrever(planilhas_locais / "correios.csv", _nova_versao)
+    carregamento._baixar("correios")
+    assert carregamento.detalhar("correios", periodo) is None
@@ -0,0 +1,54 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from utils import carregamento
+from utils.categorias import categorizar
+
+
+def test_variantes_do_mesmo_texto_viram_a_mesma_categoria():
+    decomposto = unicodedata.normalize("NFD", "HIDRÁULICA")
+    tabela = pd.DataFrame({"DISCIPLINAS": ["HIDRÁULICA", decomposto, " HIDRÁULICA ", "CIVIL", "CIVIL ", "ELÉTRICA"]})
+
+    categorizar(tabela, ["DISCIPLINAS"])
+
+    assert isinstance(tabela["DISCIPLINAS"].dtype, pd.CategoricalDtype)
+    assert tabela["DISCIPLINAS"].cat.categories.tolist() == ["CIVIL", "ELÉTRICA", "HIDRÁULICA"]
+    assert tabela["DISCIPLINAS"].tolist() == ["HIDRÁULICA"] * 3 + ["CIVIL"] * 2 + ["ELÉTRICA"]
+
+
+def test_espacos_internos_repetidos_reduzidos_a_um():
+    tabela = pd.DataFrame({"STATUS*": ["SOLICITAÇÃO  DE\tMATERIAL", "SOLICITAÇÃO DE MATERIAL"]})
+
+    categorizar(tabela, ["STATUS*"])
+
+    assert tabela["STATUS*"].cat.categories.tolist() == ["SOLICITAÇÃO DE MATERIAL"]
+
+
+def test_celulas_vazias_continuam_vazias():
+    tabela = pd.DataFrame({"STATUS*": ["RECEBIDO", None, np.nan, " RECEBIDO"]})
+
+    categorizar(tabela, ["STATUS*"])
+
+    assert tabela["STATUS*"].isna().tolist() == [False, True, True, False]
+    assert tabela["STATUS*"].cat.categories.tolist() == ["RECEBIDO"]
+
+
+def test_colunas_ausentes_ou_que_nao_sao_texto_ficam_como_estao():
+    tabela = pd.DataFrame({"VALOR": [1.0, 2.0], "CONTRATO": ["A", "B"]})
+
+    categorizar(tabela, ["VALOR", "NÃO EXISTE"])
+
+    assert tabela["VALOR"].dtype == float
+    assert tabela["CONTRATO"].dtype == object
+
+
+def test_planilha_preparada_com_o_texto_normalizado(planilhas_locais):
+    tabela = carregamento._baixar("correios")
+    bruta = pd.read_csv(planilhas_locais / "correios.csv", dtype=str)
+
+    for col in ["STATUS*", "DISCIPLINAS", "ORÇAMENTISTA"]:
+        esperado = bruta[col].map(lambda valor: " ".join(unicodedata.normalize("NFC", valor).split()), na_action="ignore")
+        assert isinstance(tabela[col].dtype, pd.CategoricalDtype), col
+        pd.testing.assert_series_equal(tabela[col].astype(object), esperado, check_names=False)
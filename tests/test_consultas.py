@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from utils import carregamento, consultas, fontes
+
+PLANILHAS = ["correios", "serpro"]
+
+
+# Todas as consultas registradas, com as colunas fixas pelos nomes de cada planilha
+def _consultas(nome, tabela):
+    nomear = fontes.FONTES[nome].nomear
+    return [
+        *(("contagem", {"coluna": nomear(col)}) for col in ["STATUS*", "DISCIPLINAS", "ORÇAMENTISTA"]),
+        ("orcamentos_mes", {}),
+        ("orcamentos_mes_orcamentista", {"orcamentista": tabela[nomear("ORÇAMENTISTA")].dropna().iloc[0]}),
+        ("valores_mensais", {}),
+        ("ticket_medio_mensal", {}),
+    ]
+
+
+# Resultados de todas as consultas de uma planilha pelo pandas e pelo DuckDB
+def _resultados(nome, tabela, monkeypatch, motor_sql):
+    monkeypatch.setattr(consultas, "MOTOR_SQL", motor_sql)
+    monkeypatch.setattr(consultas, "_resultados", {})
+    monkeypatch.setattr(carregamento, "_derivados", {})
+    return {
+        (consulta, tuple(parametros.items())): consultas.consultar(nome, consulta, **parametros)
+        for consulta, parametros in _consultas(nome, tabela)
+    }
+
+
+# Função para comparar o resultado do DuckDB com o do pandas, sem depender da ordem dos
+# empates nas contagens nem dos tipos das colunas
+def _comparar(sql, pandas):
+    assert list(sql.columns) == list(pandas.columns)
+    sql, pandas = (
+        tabela.astype({col: str for col in tabela.columns[:1]}).sort_values(list(tabela.columns[:1])).reset_index(drop=True)
+        for tabela in (sql, pandas)
+    )
+    pd.testing.assert_frame_equal(sql, pandas, check_dtype=False, check_column_type=False)
+
+
+@pytest.mark.parametrize("nome", PLANILHAS)
+def test_consultas_pelo_pandas_com_as_colunas_da_planilha(planilhas_locais, monkeypatch, nome):
+    tabela = carregamento._baixar(nome)
+
+    resultados = _resultados(nome, tabela, monkeypatch, False)
+
+    valores = resultados[("valores_mensais", ())]
+    assert list(valores.columns)[1:] == [
+        fontes.FONTES[nome].nomear(col) for col in ("VALOR INSUMO", "VALOR MÃO DE OBRA", "VALOR ORÇADO")
+    ]
+    assert valores.iloc[:, 1:].sum().gt(0).all()
+    for (consulta, _), resultado in resultados.items():
+        assert len(resultado) > 0, consulta
+
+
+@pytest.mark.parametrize("nome", PLANILHAS)
+def test_consultas_pelo_duckdb_iguais_as_do_pandas(planilhas_locais, monkeypatch, nome):
+    pytest.importorskip("duckdb")
+    tabela = carregamento._baixar(nome)
+
+    pandas = _resultados(nome, tabela, monkeypatch, False)
+    sql = _resultados(nome, tabela, monkeypatch, True)
+
+    assert sql.keys() == pandas.keys()
+    for chave in pandas:
+        _comparar(sql[chave], pandas[chave])
+
+
+def test_consulta_pelo_pandas_quando_nenhuma_origem_pode_ser_lida(planilhas_locais, monkeypatch):
+    duckdb = pytest.importorskip("duckdb")
+    tabela = carregamento._baixar("serpro")
+    pandas = _resultados("serpro", tabela, monkeypatch, False)[("valores_mensais", ())]
+
+    class CursorSemOrigem:
+        def register(self, *args):
+            pass
+
+        def execute(self, *args):
+            raise duckdb.IOException("origem indisponível")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(consultas, "MOTOR_SQL", True)
+    monkeypatch.setattr(consultas, "_cursor", CursorSemOrigem)
+    monkeypatch.setattr(consultas, "_resultados", {})
+    monkeypatch.setattr(carregamento, "_derivados", {})
+
+    pd.testing.assert_frame_equal(consultas.consultar("serpro", "valores_mensais"), pandas)
+
+
+def test_consulta_pelo_duckdb_le_o_snapshot_sem_carregar_a_planilha(planilhas_locais, monkeypatch):
+    pytest.importorskip("duckdb")
+    tabela = carregamento._baixar("correios")
+    pandas = _resultados("correios", tabela, monkeypatch, False)[("valores_mensais", ())]
+    # Processo novo: só o snapshot em disco, sem a planilha em memória
+    monkeypatch.setattr(carregamento, "_estado", carregamento.defaultdict(dict))
+    monkeypatch.setattr(consultas, "MOTOR_SQL", True)
+
+    sql = consultas.consultar("correios", "valores_mensais")
+
+    assert carregamento._estado["correios"].get("tabela") is None
+    assert carregamento.versoes_lidas("correios") >= {tabela.attrs["versao"]}
+    _comparar(sql, pandas)
@@ -0,0 +1,75 @@
+import ast
+import os
+
+import pytest
+
+PAGINAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+# Páginas com as seções interativas isoladas em fragmentos
+PAGINAS_FRAGMENTOS = ["CORREIOS.py", "SERPRO.py", "TRERS.py"]
+
+# Entradas do Streamlit que disparam um rerun quando alteradas
+ENTRADAS = {
+    "button", "checkbox", "toggle", "radio", "selectbox", "multiselect", "slider", "select_slider",
+    "date_input", "text_input", "number_input",
+}
+
+
+# Função para listar as entradas criadas fora de uma função decorada com st.fragment,
+# como (linha, entrada)
+def _entradas_fora_de_fragmentos(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+
+    fora = []
+
+    def visitar(no, em_fragmento):
+        for filho in ast.iter_child_nodes(no):
+            dentro = em_fragmento
+            if isinstance(filho, ast.FunctionDef):
+                dentro = em_fragmento or any(
+                    ast.unparse(decorador).startswith("st.fragment") for decorador in filho.decorator_list
+                )
+            if (
+                isinstance(filho, ast.Call)
+                and isinstance(filho.func, ast.Attribute)
+                and filho.func.attr in ENTRADAS
+                and not dentro
+            ):
+                fora.append((filho.lineno, filho.func.attr))
+            visitar(filho, dentro)
+
+    visitar(arvore, False)
+    return fora
+
+
+@pytest.mark.parametrize("pagina", PAGINAS_FRAGMENTOS)
+def test_entradas_das_paginas_dentro_de_fragmentos(pagina):
+    assert _entradas_fora_de_fragmentos(os.path.join(PAGINAS, pagina)) == []
+
+
+@pytest.mark.parametrize("pagina", PAGINAS_FRAGMENTOS)
+def test_cada_botao_e_caixa_da_pagina_mostra_a_sua_secao(planilhas_locais, pagina):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(PAGINAS, pagina), default_timeout=120).run()
+    assert not app.exception
+    entradas = [("button", posicao) for posicao in range(len(app.button))]
+    entradas += [("checkbox", posicao) for posicao in range(len(app.checkbox))]
+    assert entradas
+
+    for tipo, posicao in entradas:
+        tabelas = len(app.dataframe) + len(app.table)
+        if tipo == "button":
+            entrada = app.button[posicao]
+            entrada.click().run()
+        else:
+            entrada = app.checkbox[posicao]
+            entrada.check().run()
+
+        assert not app.exception, entrada.label
+        # Os botões "Mostrar/Ocultar" exibem a tabela da própria seção
+        if entrada.label.startswith("Mostrar"):
+            assert len(app.dataframe) + len(app.table) > tabelas, entrada.label
+        else:
+            assert len(app.dataframe) + len(app.table) >= tabelas, entrada.label
@@ -0,0 +1,99 @@
+import os
+import re
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils import carregamento, graficos
+from utils.perfil import iniciar_perfil
+
+PAGINAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+
+# Função para ler os dados de cada gráfico da página
+def _dados_dos_graficos(app):
+    dados = []
+    for grafico in app.get("vega_lite_chart"):
+        for conjunto in grafico.proto.datasets:
+            dados.append(pa.ipc.open_stream(conjunto.data.data).read_all().to_pandas())
+    return dados
+
+
+@pytest.mark.parametrize("pagina", ["CORREIOS.py", "SERPRO.py"])
+def test_contagens_por_dia_com_datas_sem_hora(planilhas_locais, pagina):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(PAGINAS, pagina), default_timeout=120).run()
+    assert not app.exception
+
+    # OS recebidas por dia e média de serviços atendidos por dia
+    dias = [tabela["Data"] for tabela in _dados_dos_graficos(app) if {"Data", "Contagem"} <= set(tabela)]
+    assert dias
+    for coluna in dias:
+        assert coluna.map(lambda dia: re.fullmatch(r"\d{4}-\d{2}-\d{2}", dia) is not None).all()
+
+
+# Cache de gráficos vazio, com a planilha de teste publicada na versão `v1`
+@pytest.fixture
+def cache_graficos(carregador, monkeypatch):
+    monkeypatch.setattr(graficos, "_especificacoes", graficos.OrderedDict())
+    _publicar(carregador, "v1")
+    return carregador
+
+
+# Função para publicar uma versão da planilha de teste, como faz o atualizador
+def _publicar(estado, versao):
+    tabela = carregamento._marcar(pd.DataFrame({"VALOR": [1, 2]}), versao)
+    estado["teste"].update(versao=versao, tabela=tabela)
+
+
+# Função para executar a página: lê a planilha e pede o gráfico, contando as montagens
+def _executar_pagina(montagens, *parametros):
+    iniciar_perfil("teste")
+    tabela = carregamento.carregar_fonte("teste")
+
+    def construir(*parametros):
+        montagens.append(parametros)
+        return alt.Chart(tabela).mark_bar().encode(x="VALOR:Q")
+
+    return graficos.especificar_grafico("teste", "valores", construir, *parametros)
+
+
+def test_grafico_montado_de_novo_so_quando_a_versao_ou_os_filtros_mudam(cache_graficos):
+    montagens = []
+
+    primeira = _executar_pagina(montagens, "2024")
+    primeira["mark"] = "line"
+    assert _executar_pagina(montagens, "2024")["mark"] == {"type": "bar"}
+    assert len(montagens) == 1
+
+    _executar_pagina(montagens, "2023")
+    assert len(montagens) == 2
+
+    _publicar(cache_graficos, "v2")
+    _executar_pagina(montagens, "2024")
+    _executar_pagina(montagens, "2024")
+    assert len(montagens) == 3
+
+
+def test_grafico_com_versoes_misturadas_nao_e_guardado(cache_graficos):
+    iniciar_perfil("teste")
+    carregamento.carregar_fonte("teste")
+    _publicar(cache_graficos, "v2")
+    carregamento.carregar_fonte("teste")
+
+    graficos.especificar_grafico("teste", "valores", lambda: alt.Chart(pd.DataFrame({"VALOR": [1]})).mark_bar())
+
+    assert not graficos._especificacoes
+
+
+def test_graficos_usados_ha_mais_tempo_saem_do_cache(cache_graficos, monkeypatch):
+    monkeypatch.setattr(graficos, "LIMITE_GRAFICOS", 2)
+    montagens = []
+
+    for parametro in ["a", "b", "a", "c", "a", "b"]:
+        _executar_pagina(montagens, parametro)
+
+    assert montagens == [("a",), ("b",), ("c",), ("b",)]
@@ -0,0 +1,53 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from utils import imagens
+
+
+# Imagens vazias e preparações contadas, com uma imagem de cabeçalho de 400 × 300
+@pytest.fixture
+def cabecalho(tmp_path, monkeypatch):
+    monkeypatch.setattr(imagens, "_imagens", {})
+    preparadas = []
+    preparar = imagens._preparar
+
+    def preparar_contando(caminho, tamanho):
+        preparadas.append((caminho, tamanho))
+        return preparar(caminho, tamanho)
+
+    monkeypatch.setattr(imagens, "_preparar", preparar_contando)
+    caminho = tmp_path / "cabecalho.png"
+    Image.new("RGB", (400, 300), "navy").save(caminho)
+    return str(caminho), preparadas
+
+
+def test_imagem_preparada_uma_vez_por_tamanho(cabecalho):
+    caminho, preparadas = cabecalho
+
+    reduzida = imagens.imagem_cabecalho(caminho, (200, 150))
+    assert imagens.imagem_cabecalho(caminho, (200, 150)) is reduzida
+    original = imagens.imagem_cabecalho(caminho)
+
+    assert len(preparadas) == 2
+    with Image.open(io.BytesIO(reduzida)) as imagem:
+        assert imagem.size == (200, 150)
+    with Image.open(io.BytesIO(original)) as imagem:
+        assert imagem.size == (400, 300)
+    assert len(original) <= os.path.getsize(caminho)
+
+
+def test_imagem_preparada_de_novo_quando_o_arquivo_muda(cabecalho):
+    caminho, preparadas = cabecalho
+    imagens.imagem_cabecalho(caminho, (200, 150))
+
+    Image.new("RGB", (400, 300), "white").save(caminho)
+    modificado = os.path.getmtime(caminho) + 10
+    os.utime(caminho, (modificado, modificado))
+    nova = imagens.imagem_cabecalho(caminho, (200, 150))
+
+    assert len(preparadas) == 2
+    with Image.open(io.BytesIO(nova)) as imagem:
+        assert imagem.getpixel((0, 0)) == (255, 255, 255)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import indices
+from utils.indices import filtrar_intervalo, montar_indices
+
+
+def _tabela(datas, versao):
+    tabela = pd.DataFrame({"DATA RECEBIDO": pd.to_datetime(datas), "OS": range(len(datas))})
+    tabela.attrs["versao"] = versao
+    return tabela
+
+
+def test_intervalo_pelo_indice_da_mesma_versao(monkeypatch):
+    tabela = _tabela(["2024-03-01", None, "2024-01-10", "2024-02-05"], "v1")
+    montados = montar_indices(tabela)
+    monkeypatch.setattr(indices, "indexar_datas", None)
+
+    filtrada = filtrar_intervalo(tabela, montados, "DATA RECEBIDO", "2024-01-01", "2024-03-01", incluir_fim=False)
+
+    assert filtrada["OS"].tolist() == [2, 3]
+
+
+def test_indice_de_outra_versao_com_o_mesmo_tamanho_e_remontado():
+    antiga = _tabela(["2024-01-10", "2024-05-01", "2024-06-01"], "v1")
+    nova = _tabela(["2024-05-01", "2024-01-10", "2024-01-20"], "v2")
+    montados = montar_indices(antiga)
+
+    filtrada = filtrar_intervalo(nova, montados, "DATA RECEBIDO", "2024-01-01", "2024-02-01")
+
+    assert filtrada["OS"].tolist() == [1, 2]
+
+
+def test_tabela_sem_versao_nao_usa_o_indice():
+    montados = montar_indices(_tabela(["2024-01-10", "2024-05-01"], None))
+    tabela = pd.DataFrame({"DATA RECEBIDO": pd.to_datetime(["2024-05-01", "2024-01-10"]), "OS": [0, 1]})
+
+    filtrada = filtrar_intervalo(tabela, montados, "DATA RECEBIDO", fim="2024-02-01")
+
+    assert filtrada["OS"].tolist() == [1]
+
+
+# Datas repetidas nos limites, com hora, vazias e fora de ordem
+DATAS_LIMITES = [
+    "2024-02-01 00:00",
+    "2024-01-01 00:00",
+    None,
+    "2024-02-01 10:30",
+    "2024-03-01 00:00",
+    "2024-01-01 00:00",
+    "2024-02-01 00:00",
+    None,
+]
+
+
+@pytest.mark.parametrize(
+    ("inicio", "fim", "incluir_fim", "esperado"),
+    [
+        ("2024-01-01", "2024-02-01", True, [0, 1, 5, 6]),
+        ("2024-01-01", "2024-02-01", False, [1, 5]),
+        ("2024-02-01", None, True, [0, 3, 4, 6]),
+        (None, "2024-01-01", True, [1, 5]),
+        (None, "2024-01-01", False, []),
+        (None, None, True, [0, 1, 3, 4, 5, 6]),
+        ("2023-01-01", "2023-12-31", True, []),
+        ("2024-03-02", None, True, []),
+        ("2024-03-01", "2024-01-01", True, []),
+    ],
+)
+def test_limites_do_intervalo(inicio, fim, incluir_fim, esperado):
+    indice = indices.indexar_datas(_tabela(DATAS_LIMITES, "v1")["DATA RECEBIDO"])
+
+    assert indice.posicoes_intervalo(inicio, fim, incluir_fim).tolist() == esperado
+
+
+def test_intervalos_iguais_aos_da_mascara():
+    gerador = np.random.default_rng(0)
+    datas = pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(gerador.integers(0, 60, 500), unit="D"))
+    datas[gerador.random(500) < 0.1] = pd.NaT
+    tabela = _tabela(datas, "v1")
+    montados = montar_indices(tabela)
+
+    for _ in range(50):
+        inicio, fim = sorted(pd.Timestamp("2023-12-25") + pd.to_timedelta(gerador.integers(0, 75, 2), unit="D"))
+        for incluir_fim in (True, False):
+            coluna = tabela["DATA RECEBIDO"]
+            mascara = (coluna >= inicio) & ((coluna <= fim) if incluir_fim else (coluna < fim))
+
+            filtrada = filtrar_intervalo(tabela, montados, "DATA RECEBIDO", inicio, fim, incluir_fim)
+
+            pd.testing.assert_frame_equal(filtrada, tabela[mascara])
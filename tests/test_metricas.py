@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+from utils import carregamento
+from utils.metricas import (
+    DIMENSOES_CUBO,
+    EVENTOS_CUBO,
+    VALORES_CUBO,
+    atualizar_cubo,
+    calcular_metricas_diarias,
+    fatiar_cubo,
+    montar_cubo,
+)
+
+
+# Nova versão da planilha: linhas com status, valor e data alterados, cinco removidas
+# e três inseridas
+def _nova_versao(tabela):
+    tabela.loc[3, "STATUS*"] = "FINALIZADO"
+    tabela.loc[4, "VALOR ORÇADO"] = "R$ 99.999,99"
+    tabela.loc[5, "DATA RECEBIDO"] = "01/02/2024"
+    tabela.loc[6, "DATA ORÇADO"] = ""
+    inseridas = tabela.iloc[40:43].assign(ID=["9001", "9002", "9003"])
+    return pd.concat([tabela.drop(index=range(20, 25)), inseridas], ignore_index=True)
+
+
+
+# Contagens de um contrato filtrando a planilha inteira para cada métrica, como a
+# página fazia antes do cálculo numa única passada
+def _metricas_por_filtros(tabela, contrato, data_dia, data_inicio, data_fim):
+    if contrato != "Todos":
+        tabela = tabela[tabela["CONTRATO"] == contrato]
+    dia = pd.Timestamp(data_dia).date()
+    return (
+        (tabela["DATA RECEBIDO"].dt.date == dia).sum(),
+        ((tabela["DATA FINALIZADO"].dt.date == dia) & (tabela["STATUS*"] == "EXECUTADO")).sum(),
+        tabela["DATA RECEBIDO"].between(pd.Timestamp(data_inicio), pd.Timestamp(data_fim)).sum(),
+    )
+
+
+def test_metricas_diarias_iguais_as_dos_filtros_por_contrato(planilhas_locais):
+    tabela = carregamento._baixar("banrisul")
+    periodo = ("2024-01-01", "2024-06-30")
+    executadas = tabela.loc[tabela["STATUS*"] == "EXECUTADO", "DATA FINALIZADO"]
+    # Dias com OS recebidas e com OS executadas, e um dia sem nenhuma
+    dias = [tabela["DATA RECEBIDO"].mode()[0], executadas.mode()[0], pd.Timestamp("2030-01-01")]
+
+    for data_dia in dias:
+        metricas = calcular_metricas_diarias(montar_cubo(tabela), data_dia, {"periodo": periodo})
+
+        for contrato in ["Todos", "0100215/2023", "0200215/2023", "sem OS"]:
+            calculadas = metricas.contrato(contrato)
+            assert (
+                calculadas.recebidas_dia,
+                calculadas.executadas_dia,
+                calculadas.recebidas_periodo["periodo"],
+            ) == _metricas_por_filtros(tabela, contrato, data_dia, *periodo), (data_dia, contrato)
+
+
+# Células de um evento do cubo numa ordem que não depende das categorias
+def _ordenar(celulas):
+    textos = {col: celulas[col].astype(str) for col in DIMENSOES_CUBO}
+    return celulas.assign(**textos).sort_values(DIMENSOES_CUBO + ["DIA"]).reset_index(drop=True)
+
+
+
+def test_cubo_somado_por_dimensoes_igual_ao_agrupamento_da_planilha(planilhas_locais):
+    tabela = carregamento._baixar("banrisul")
+    esperado = tabela.groupby(DIMENSOES_CUBO, dropna=False, observed=True)
+    esperado = esperado[VALORES_CUBO].sum().assign(QUANTIDADE=esperado.size())
+
+    for evento, celulas in montar_cubo(tabela).items():
+        somado = celulas.groupby(DIMENSOES_CUBO, dropna=False, observed=True)[["QUANTIDADE"] + VALORES_CUBO].sum()
+        pd.testing.assert_frame_equal(somado, esperado[somado.columns], check_dtype=False, obj=evento)
+
+
+# Recortes do cubo: (contrato, início, fim, status, disciplinas)
+RECORTES = [
+    ("Todos", None, None, None, None),
+    ("0100215/2023", "2023-03-01", "2023-09-30", None, None),
+    ("0200215/2023", "2024-01-01", None, ["EXECUTADO", "FINALIZADO"], None),
+    ("Todos", None, "2023-12-31", None, ["CIVIL", "HIDRÁULICA"]),
+]
+
+
+@pytest.mark.parametrize("recorte", RECORTES)
+def test_fatia_do_cubo_igual_ao_filtro_da_planilha(planilhas_locais, recorte):
+    contrato, inicio, fim, status, disciplinas = recorte
+    tabela = carregamento._baixar("banrisul")
+    cubo = montar_cubo(tabela)
+
+    for evento, coluna in EVENTOS_CUBO.items():
+        fatia = fatiar_cubo(cubo, evento, contrato, inicio, fim, status, disciplinas)
+
+        filtrada = tabela
+        if contrato != "Todos":
+            filtrada = filtrada[filtrada["CONTRATO"] == contrato]
+        if inicio is not None:
+            filtrada = filtrada[filtrada[coluna] >= pd.Timestamp(inicio)]
+        if fim is not None:
+            filtrada = filtrada[filtrada[coluna] <= pd.Timestamp(fim)]
+        if status is not None:
+            filtrada = filtrada[filtrada["STATUS*"].isin(status)]
+        if disciplinas is not None:
+            filtrada = filtrada[filtrada["DISCIPLINAS"].isin(disciplinas)]
+
+        assert fatia["QUANTIDADE"].sum() == len(filtrada), evento
+        for valor in VALORES_CUBO:
+            assert fatia[valor].sum() == pytest.approx(filtrada[valor].sum()), (evento, valor)
+
+
+def test_cubo_atualizado_igual_ao_montado_da_tabela_nova(planilhas_locais, reescrever):
+    cubo = montar_cubo(carregamento._baixar("banrisul"))
+    reescrever(planilhas_locais / "banrisul.csv", _nova_versao)
+    nova = carregamento._baixar("banrisul")
+    delta = carregamento._estado["banrisul"]["delta"]
+
+    atualizado = atualizar_cubo(cubo, delta["removidas"], delta["inseridas"])
+
+    esperado = montar_cubo(nova)
+    assert atualizado.keys() == esperado.keys()
+    for evento in esperado:
+        pd.testing.assert_frame_equal(_ordenar(atualizado[evento]), _ordenar(esperado[evento]))
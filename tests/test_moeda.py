@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.fontes import COLUNAS_ETAPAS_SOP, FONTES
+from utils.moeda import converter_moeda
+
+
+# Conversão usada antes de converter_moeda (replace + astype(float)), como referência
+def _converter_antigo(valores):
+    return (
+        valores.str.replace("R$", "", regex=False)
+        .str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .str.strip()
+        .astype(float)
+    )
+
+
+def test_valores_formatados_iguais_a_conversao_antiga():
+    valores = pd.Series(["R$ 1.234,56", "R$ 0,99", "R$ 1.000.000,00", "R$ 12,5", "R$ 7,00"])
+
+    convertido = converter_moeda(valores)
+
+    pd.testing.assert_series_equal(convertido, _converter_antigo(valores))
+    assert convertido.tolist() == [1234.56, 0.99, 1000000.0, 12.5, 7.0]
+
+
+def test_valores_sem_centavos():
+    valores = pd.Series(["R$ 1.234", "R$ 15", "2.500"])
+
+    convertido = converter_moeda(valores)
+
+    pd.testing.assert_series_equal(convertido, _converter_antigo(valores))
+    assert convertido.tolist() == [1234.0, 15.0, 2500.0]
+
+
+def test_negativos():
+    valores = pd.Series(["-R$ 1.234,56", "R$ -10,00", "(R$ 5,50)", "R$ 3,00"])
+
+    convertido = converter_moeda(valores)
+
+    assert convertido.tolist() == [-1234.56, -10.0, -5.5, 3.0]
+    # A conversão antiga só entendia o sinal depois do símbolo da moeda
+    assert convertido[1] == _converter_antigo(valores.iloc[[1]]).iloc[0]
+
+
+def test_vazios_e_nulos():
+    valores = pd.Series(["", "   ", None, np.nan, "R$ 2,00"], dtype=object)
+
+    convertido = converter_moeda(valores)
+
+    assert convertido.isna().tolist() == [True, True, True, True, False]
+    assert convertido.iloc[-1] == 2.0
+    assert converter_moeda(valores, vazio=0.0).tolist() == [0.0, 0.0, 0.0, 0.0, 2.0]
+
+
+def test_texto_invalido():
+    valores = pd.Series(["abc", "R$ 1,2,3", "R$ --", "R$ 4,00"])
+
+    # A conversão antiga falhava a coluna inteira; agora só as células inválidas viram nulas
+    with pytest.raises(ValueError):
+        _converter_antigo(valores)
+    convertido = converter_moeda(valores)
+    assert convertido.isna().tolist() == [True, True, True, False]
+    assert converter_moeda(valores, invalido=0.0).tolist() == [0.0, 0.0, 0.0, 4.0]
+
+
+def test_linhas_total():
+    valores = pd.Series(["TOTAL R$ 10,00", "R$ 10,00"])
+
+    assert converter_moeda(valores, total=-1.0).tolist() == [-1.0, 10.0]
+
+
+def test_coluna_numerica_e_mista():
+    numerica = pd.Series([1, 2, 3])
+    mista = pd.Series([1.5, "R$ 2,50", None], dtype=object)
+
+    assert converter_moeda(numerica).tolist() == [1.0, 2.0, 3.0]
+    convertido = converter_moeda(mista)
+    assert convertido.iloc[:2].tolist() == [1.5, 2.5]
+    assert np.isnan(convertido.iloc[2])
+
+
+def test_dataframe_igual_a_series():
+    tabela = pd.DataFrame(
+        {
+            "A": ["R$ 1.234,56", "", "(R$ 1,00)"],
+            "B": ["R$ 3", "x", "R$ 0,01"],
+            "C": [1, 2, 3],
+        },
+        index=[10, 20, 30],
+    )
+
+    convertido = converter_moeda(tabela)
+
+    for col in tabela.columns:
+        pd.testing.assert_series_equal(convertido[col], converter_moeda(tabela[col]))
+    assert list(convertido.index) == [10, 20, 30]
+
+
+def test_etapas_sop_no_formato_lido_pela_preparacao():
+    etapa = COLUNAS_ETAPAS_SOP[0]
+    tabela = pd.DataFrame({etapa: ["R$ 1,234.56", "R$ 999,999.99", np.nan, "-R$ 10.50"]})
+
+    preparada = FONTES["sop_etapas"].preparar(tabela)
+
+    assert preparada[etapa].tolist()[:2] == [1234.56, 999999.99]
+    assert np.isnan(preparada[etapa].iloc[2])
+    assert preparada[etapa].iloc[3] == -10.5
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from utils.tabelas import paginar
+
+
+def test_tabela_vazia():
+    tabela = pd.DataFrame({"OS": pd.Series([], dtype="int64")})
+
+    fatia, pagina, total_paginas, total_linhas = paginar(tabela, pagina=3, busca="x", coluna_busca="OS")
+
+    assert fatia.empty
+    assert (pagina, total_paginas, total_linhas) == (1, 1, 0)
+
+
+def test_pagina_depois_do_fim_vai_para_a_ultima():
+    tabela = pd.DataFrame({"OS": range(25)})
+
+    fatia, pagina, total_paginas, total_linhas = paginar(tabela, pagina=10, por_pagina=10)
+
+    assert (pagina, total_paginas, total_linhas) == (3, 3, 25)
+    assert fatia["OS"].tolist() == list(range(20, 25))
+
+
+def test_busca_em_coluna_categorica():
+    tabela = pd.DataFrame({
+        "STATUS": pd.Categorical(["FINALIZADO", "Orçado", None, "EM ORÇAMENTO", "FINALIZADO"]),
+        "OS": range(5),
+    })
+
+    fatia, _, _, total_linhas = paginar(tabela, coluna_busca="STATUS", busca="orçad")
+
+    assert total_linhas == 1
+    assert fatia["OS"].tolist() == [1]
+    fatia, _, _, total_linhas = paginar(tabela, coluna_busca="STATUS", busca="orça")
+    assert fatia["OS"].tolist() == [1, 3]
+
+
+def test_ordenacao_decrescente_estavel_com_nulos_no_fim():
+    tabela = pd.DataFrame({
+        "VALOR": [2.0, np.nan, 5.0, 2.0, np.nan, 5.0, 1.0],
+        "OS": range(7),
+    }, index=[70, 60, 50, 40, 30, 20, 10])
+
+    fatia, _, _, _ = paginar(tabela, ordenar_por="VALOR", decrescente=True)
+
+    # Empates mantêm a ordem original e os nulos ficam no fim, nos dois sentidos
+    assert fatia["OS"].tolist() == [2, 5, 0, 3, 6, 1, 4]
+    assert fatia.index.tolist() == [50, 20, 70, 40, 10, 60, 30]
+    fatia, _, _, _ = paginar(tabela, ordenar_por="VALOR")
+    assert fatia["OS"].tolist() == [6, 0, 3, 2, 5, 1, 4]
+
+
+def test_busca_e_ordenacao_com_rotulos_que_nao_sao_texto():
+    tabela = pd.DataFrame({0: ["a", "b", "ab"], 2024: [3, 1, 2]})
+
+    fatia, _, _, total_linhas = paginar(tabela, coluna_busca=0, busca="a", ordenar_por=2024)
+
+    assert total_linhas == 2
+    assert fatia[0].tolist() == ["ab", "a"]
+
+
+def test_seletores_com_rotulos_que_nao_sao_texto():
+    from streamlit.testing.v1 import AppTest
+
+    def pagina():
+        import pandas as pd
+
+        from utils.tabelas import exibir_tabela_paginada
+
+        exibir_tabela_paginada(pd.DataFrame({0: ["a", "b", "ab"], 2024: [3, 1, 2]}), "teste")
+
+    app = AppTest.from_function(pagina).run()
+    app.selectbox(key="teste_ordem").select(2024).run()
+    app.text_input(key="teste_busca").input("a").run()
+
+    assert not app.exception
+    assert app.dataframe[0].value[0].tolist() == ["ab", "a"]
@@ -0,0 +1,88 @@
+import threading
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from utils import telemetria
+
+
+# Métricas zeradas
+@pytest.fixture(autouse=True)
+def metricas(monkeypatch):
+    monkeypatch.setattr(telemetria, "_valores", defaultdict(int))
+    monkeypatch.setattr(telemetria, "_histogramas", {})
+    monkeypatch.setattr(telemetria, "_rotas", {})
+
+
+# Função para ler as amostras do texto exportado: {linha sem o valor: valor}
+def _amostras(texto):
+    return {
+        linha.rsplit(" ", 1)[0]: float(linha.rsplit(" ", 1)[1])
+        for linha in texto.splitlines()
+        if linha and not linha.startswith("#")
+    }
+
+
+def test_contadores_e_medidores_no_formato_de_texto():
+    telemetria.contar("dashboards_downloads_total", planilha="correios", resultado="novo")
+    telemetria.contar("dashboards_downloads_total", planilha="correios", resultado="novo")
+    telemetria.contar("dashboards_download_bytes_total", 1500, planilha="correios")
+    telemetria.definir("dashboards_linhas", 300, planilha="correios")
+    telemetria.definir("dashboards_linhas", 280, planilha="correios")
+
+    texto = telemetria.exportar()
+
+    for nome, (tipo, _) in telemetria.METRICAS.items():
+        assert f"# TYPE {nome} {tipo}\n" in texto
+    assert _amostras(texto) == {
+        'dashboards_downloads_total{planilha="correios",resultado="novo"}': 2,
+        'dashboards_download_bytes_total{planilha="correios"}': 1500,
+        'dashboards_linhas{planilha="correios"}': 280,
+    }
+
+
+def test_histograma_com_baldes_acumulados():
+    for segundos in (0.003, 0.2, 0.2, 120):
+        telemetria.observar("dashboards_download_segundos", segundos, planilha="serpro")
+
+    amostras = _amostras(telemetria.exportar())
+
+    baldes = {
+        chave: valor for chave, valor in amostras.items() if chave.startswith("dashboards_download_segundos_bucket")
+    }
+    assert len(baldes) == len(telemetria.BALDES_SEGUNDOS) + 1
+    assert amostras['dashboards_download_segundos_bucket{planilha="serpro",le="0.005"}'] == 1
+    assert amostras['dashboards_download_segundos_bucket{planilha="serpro",le="0.25"}'] == 3
+    assert amostras['dashboards_download_segundos_bucket{planilha="serpro",le="60"}'] == 3
+    assert amostras['dashboards_download_segundos_bucket{planilha="serpro",le="+Inf"}'] == 4
+    assert amostras['dashboards_download_segundos_count{planilha="serpro"}'] == 4
+    assert amostras['dashboards_download_segundos_sum{planilha="serpro"}'] == pytest.approx(120.403)
+
+
+def test_rotulos_escapados():
+    telemetria.contar("dashboards_cache_total", cache='a"b\\c\nd', resultado="hit")
+
+    assert 'dashboards_cache_total{cache="a\\"b\\\\c\\nd",resultado="hit"} 1\n' in telemetria.exportar()
+
+
+def test_metricas_e_rotas_servidas_por_http():
+    telemetria.contar("dashboards_cache_total", cache="planilha", resultado="hit")
+    telemetria.registrar_rota("/pronto", lambda: (503, "aquecendo\n"))
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), telemetria._Requisicao)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    endereco = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    try:
+        with urllib.request.urlopen(f"{endereco}/metrics") as resposta:
+            assert resposta.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert resposta.read().decode("utf-8") == telemetria.exportar()
+        for caminho, codigo in (("/pronto", 503), ("/outro", 404)):
+            with pytest.raises(urllib.error.HTTPError) as erro:
+                urllib.request.urlopen(f"{endereco}{caminho}")
+            assert erro.value.code == codigo
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,146 @@
+# Aquecimento dos caches: baixa e prepara todas as planilhas registradas e calcula os
+# agregados padrão das páginas, para o primeiro acesso a cada contrato não pagar o
+# download e a limpeza.
+#
+# Uso: python -m utils.aquecimento [opções do streamlit run]
+#
+# Assim o aquecimento termina antes de o servidor do Streamlit subir, no mesmo processo:
+# até lá a porta do painel não responde, nem a verificação de saúde do próprio
+# Streamlit (/_stcore/health), então qualquer balanceador só vê o servidor pronto
+# depois do aquecimento, com ou sem a porta de métricas. Com DASHBOARDS_METRICAS_PORTA
+# definida, /pronto também informa a situação do aquecimento e as planilhas que ainda
+# falham. Com "streamlit run HOME.py" direto, o aquecimento roda em segundo plano a
+# partir da primeira execução da HOME e nada espera por ele.
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from functools import partial
+
+from utils.carregamento import calcular_derivado, carregar_fontes, carregar_indices, fontes_carregadas
+from utils.consultas import consultar
+from utils.fontes import FONTES
+from utils.metricas import COLUNAS_CUBO, montar_cubo
+from utils.telemetria import PORTA_METRICAS, iniciar_exportacao, registrar_rota
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tempo máximo (em segundos) de espera pelas planilhas durante o aquecimento
+TEMPO_AQUECIMENTO = int(os.environ.get("DASHBOARDS_TEMPO_AQUECIMENTO", 300))
+
+# Agregados padrão calculados no aquecimento além dos declarados nas fontes:
+# (planilha, descrição, função), com a mesma chamada feita pela página
+AGREGADOS = [
+    ("banrisul", "cubo", partial(calcular_derivado, "banrisul", montar_cubo, colunas=COLUNAS_CUBO)),
+]
+
+# Módulos importados no aquecimento, para a primeira página aberta não pagar a importação
+# dos gráficos e das tabelas (as páginas só importam o que usam, na primeira execução)
+MODULOS = ["altair", "utils.graficos", "utils.tabelas"]
+
+# Situação do aquecimento deste processo, exibida em /pronto
+_situacao = {"estado": "parado", "duracao": None, "falhas": {}}
+_trava = threading.Lock()
+_aquecedor = None
+
+logger = logging.getLogger(__name__)
+
+
+# Função para listar os agregados aquecidos: os de AGREGADOS, os índices de datas e as
+# consultas declarados em cada fonte (`indices` e `consultas`), pelas mesmas funções que
+# as páginas chamam, para cair nas mesmas entradas do cache
+def _agregados():
+    agregados = list(AGREGADOS)
+    for nome, fonte in FONTES.items():
+        if fonte.indices:
+            agregados.append((nome, "índices", partial(carregar_indices, nome)))
+        for consulta, parametros in fonte.consultas:
+            descricao = " ".join([consulta, *map(str, parametros.values())])
+            agregados.append((nome, descricao, partial(consultar, nome, consulta, **parametros)))
+    return agregados
+
+
+# Função para aquecer os caches do processo. Devolve as falhas (planilha ou agregado
+# -> mensagem); as planilhas com falha continuam sendo tentadas pelo atualizador.
+def aquecer():
+    inicio = time.monotonic()
+    _situacao.update(estado="aquecendo", duracao=None, falhas={})
+    for modulo in MODULOS:
+        importlib.import_module(modulo)
+
+    tabelas, falhas = carregar_fontes(FONTES, tempo_limite=TEMPO_AQUECIMENTO)
+    for nome, descricao, calcular in _agregados():
+        if tabelas.get(nome) is None:
+            continue
+        try:
+            calcular()
+        except Exception as e:
+            falhas[f"{nome}: {descricao}"] = str(e)
+
+    duracao = round(time.monotonic() - inicio, 3)
+    _situacao.update(estado="pronto", duracao=duracao, falhas=falhas)
+    if falhas:
+        logger.warning("Aquecimento terminou em %.1fs com falhas: %s", duracao, falhas)
+    else:
+        logger.info("Aquecimento terminou em %.1fs", duracao)
+    return falhas
+
+
+def _aquecer_em_segundo_plano():
+    try:
+        aquecer()
+    except Exception as e:
+        _situacao.update(estado="falhou", falhas={"aquecimento": str(e)})
+        logger.warning("Falha no aquecimento: %s", e)
+
+
+# Função para iniciar o aquecimento em segundo plano (uma única vez por processo).
+# Com `esperar`, só volta quando o aquecimento terminar.
+def iniciar_aquecimento(esperar=False):
+    global _aquecedor
+    with _trava:
+        iniciar = _aquecedor is None
+        if iniciar:
+            _aquecedor = threading.Thread(target=_aquecer_em_segundo_plano, name="aquecimento", daemon=True)
+    if iniciar:
+        iniciar_exportacao()
+        if not PORTA_METRICAS:
+            logger.info("DASHBOARDS_METRICAS_PORTA não definida: /pronto não será servido")
+        _aquecedor.start()
+    if esperar:
+        _aquecedor.join()
+
+
+# Resposta da verificação de prontidão: 200 quando o aquecimento terminou e todas as
+# planilhas têm uma versão carregada; 503 enquanto isso não acontece. Uma planilha que
+# falhou no aquecimento fica pendente até o atualizador conseguir baixá-la.
+def _prontidao():
+    situacao = dict(_situacao)
+    carregadas = set(fontes_carregadas())
+    situacao["pendentes"] = [nome for nome in FONTES if nome not in carregadas]
+    codigo = 200 if situacao["estado"] == "pronto" and not situacao["pendentes"] else 503
+    return codigo, json.dumps(situacao, ensure_ascii=False)
+
+
+registrar_rota("/pronto", _prontidao)
+
+
+# Função para aquecer os caches e só então iniciar, no mesmo processo, o servidor do Streamlit
+def main():
+    logging.basicConfig(level=logging.INFO)
+    iniciar_aquecimento(esperar=True)
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", os.path.join(RAIZ, "HOME.py"), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    # Importa o módulo pelo nome do pacote, para a HOME compartilhar a mesma situação
+    from utils.aquecimento import main as iniciar
+
+    iniciar()
@@ -0,0 +1,612 @@
+import hashlib
+import inspect
+import io
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as TempoEsgotado
+
+from utils.categorias import empilhar
+from utils.fontes import FONTES
+from utils.importacao import np, pd
+from utils.indices import filtrar_intervalo, montar_indices
+from utils.metricas import atualizar_cubo, montar_cubo
+from utils.perfil import ao_iniciar_pagina, secao
+from utils.snapshots import (
+    ler_csv,
+    ler_metadados_snapshot,
+    ler_snapshot,
+    renovar_snapshot,
+    salvar_csv,
+    salvar_snapshot,
+)
+from utils.telemetria import contar, cronometrar, definir, iniciar_exportacao
+
+# Intervalo padrão (em segundos) entre atualizações de uma mesma planilha
+INTERVALO_ATUALIZACAO = int(os.environ.get("DASHBOARDS_INTERVALO", 60))
+
+# Variação aleatória aplicada ao intervalo (fração), para as planilhas não serem
+# atualizadas todas no mesmo instante
+JITTER = 0.1
+
+# Tempo máximo (em segundos) de espera por uma resposta do Google Sheets
+TEMPO_LIMITE = 30
+
+# Último download de cada planilha: validadores HTTP, versão (hash do conteúdo) e tabela tipada
+_estado = defaultdict(dict)
+_travas = defaultdict(threading.Lock)
+
+# Resultados derivados de cada planilha, válidos enquanto a versão não mudar
+_derivados = {}
+
+# Versões de cada planilha entregues à execução da página na thread atual (o Streamlit
+# roda cada sessão na sua própria thread, e as anotações são esquecidas no início de cada
+# execução); duas versões já bastam para saber que a execução misturou dados de
+# downloads diferentes
+_lidas = threading.local()
+
+# Derivados que sabem se atualizar a partir das linhas alteradas de uma versão para a
+# seguinte: função -> atualizar(resultado, removidas, inseridas, *args)
+_INCREMENTAIS = {montar_cubo: atualizar_cubo}
+
+# Threads usadas para baixar várias planilhas ao mesmo tempo
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="carregamento")
+
+# Copy-on-write do pandas já ligado neste processo
+_copy_on_write = False
+
+# Agenda do atualizador em segundo plano: próximo instante de atualização de cada planilha
+# já lida neste processo (as que nenhuma sessão abriu não são baixadas)
+_agenda = {}
+_agenda_alterada = threading.Condition()
+_atualizador = None
+
+logger = logging.getLogger(__name__)
+
+
+# Função para ligar o copy-on-write do pandas, uma vez por processo, antes de a primeira
+# tabela em cache ser entregue. As páginas recebem cópias rasas das planilhas e dos
+# derivados, que compartilham a memória do cache; com o copy-on-write, qualquer
+# alteração feita pela página gera uma cópia local em vez de alterar o cache das
+# demais sessões. A opção vale para o processo inteiro e fica fora da importação, que
+# só acontece no primeiro uso do pandas.
+def ligar_copy_on_write():
+    global _copy_on_write
+    if not _copy_on_write:
+        pd.set_option("mode.copy_on_write", True)
+        _copy_on_write = True
+
+
+# Função para marcar a tabela com a versão da planilha de onde ela veio. A marca fica em
+# `attrs` e acompanha as cópias e recortes entregues às páginas e aos derivados, então a
+# tabela e a sua versão são sempre lidas juntas, sem risco de o atualizador trocar a
+# planilha entre uma leitura e outra.
+def _marcar(tabela, versao):
+    tabela.attrs["versao"] = versao
+    return tabela
+
+
+# Função para anotar que uma versão da planilha foi entregue à execução da página na
+# thread atual. Chamada pela thread da página, mesmo quando a planilha foi carregada
+# por outra thread.
+def registrar_leitura(nome, versao):
+    if not hasattr(_lidas, "versoes"):
+        _lidas.versoes = defaultdict(set)
+    versoes = _lidas.versoes[nome]
+    if len(versoes) < 2:
+        versoes.add(versao)
+
+
+# Função para esquecer as versões lidas pela execução anterior da página nesta thread
+def _esquecer_leituras():
+    _lidas.versoes = defaultdict(set)
+
+
+# Função para listar as versões de uma planilha já entregues à execução atual da
+# página, para os caches das páginas usarem a versão dos dados realmente lidos
+def versoes_lidas(nome):
+    return frozenset(getattr(_lidas, "versoes", {}).get(nome, ()))
+
+
+ao_iniciar_pagina(_esquecer_leituras)
+
+
+# Função para buscar o CSV enviando os validadores do último download.
+# Devolve (corpo, etag, last_modified); corpo é None quando o servidor responde 304.
+def _requisitar(url, estado):
+    # Fonte apontando para um CSV no disco
+    if os.path.exists(url):
+        with open(url, "rb") as arquivo:
+            return arquivo.read(), None, None
+
+    cabecalhos = {}
+    if estado.get("etag"):
+        cabecalhos["If-None-Match"] = estado["etag"]
+    if estado.get("modificado"):
+        cabecalhos["If-Modified-Since"] = estado["modificado"]
+
+    requisicao = urllib.request.Request(url, headers=cabecalhos)
+    try:
+        with urllib.request.urlopen(requisicao, timeout=TEMPO_LIMITE) as resposta:
+            return (
+                resposta.read(),
+                resposta.headers.get("ETag"),
+                resposta.headers.get("Last-Modified"),
+            )
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, estado.get("etag"), estado.get("modificado")
+        raise
+
+
+# Função para separar as colunas do cabeçalho do CSV entre as declaradas em `colunas`
+# (comparando o nome que cada uma recebe na preparação, dado por `nomear`) e as
+# demais, na ordem do arquivo
+def _projetar(cabecalho, colunas, nomear=str.strip):
+    principais = [col for col in cabecalho if nomear(col) in colunas]
+    demais = [col for col in cabecalho if nomear(col) not in colunas]
+    return principais, demais
+
+
+# Função para ler o CSV de uma planilha. Com `colunas` declaradas, só elas são
+# lidas, já com o tipo declarado, e o restante do arquivo nem é convertido.
+def _ler_csv(corpo, colunas=None, nomear=str.strip):
+    if colunas is None:
+        return pd.read_csv(io.BytesIO(corpo))
+    cabecalho = pd.read_csv(io.BytesIO(corpo), nrows=0).columns
+    principais, _ = _projetar(cabecalho, colunas, nomear)
+    tipos = {col: colunas[nomear(col)] for col in principais if colunas[nomear(col)] is not None}
+    return pd.read_csv(io.BytesIO(corpo), usecols=principais, dtype=tipos)
+
+
+# Função para calcular o hash de cada linha do CSV, indexado pela chave da planilha
+# (nula nas linhas com a chave vazia). Devolve None quando a planilha não tem chave ou
+# quando uma chave preenchida se repete; nesses casos a planilha é sempre preparada inteira.
+def _hashes_linhas(bruta, chave, nomear=str.strip):
+    colunas = [col for col in bruta.columns if chave is not None and nomear(col) == chave]
+    if len(colunas) != 1:
+        return None
+    chaves = pd.Index(bruta[colunas[0]])
+    if not chaves.dropna().is_unique:
+        return None
+    return pd.Series(pd.util.hash_pandas_object(bruta, index=False).to_numpy(), index=chaves)
+
+
+# Função para aplicar à tabela anterior só as linhas inseridas, alteradas e removidas
+# no CSV novo, comparando o hash de cada linha pela chave; só as linhas inseridas e
+# alteradas passam pela preparação. Linhas com a chave vazia não têm com o que ser
+# comparadas: as do CSV novo são preparadas de novo (contam como inseridas) e as da
+# tabela anterior saem (contam como removidas). Devolve (tabela, delta), com as linhas que saíram e
+# as que entraram na tabela para atualizar os derivados, ou None quando a planilha
+# precisa ser preparada inteira (sem tabela anterior comparável ou com outro esquema).
+def _mesclar(nome, estado, bruta, hashes, tipos, versao):
+    fonte = FONTES[nome]
+    anterior = estado.get("tabela")
+    anteriores = estado.get("hashes")
+    if (
+        hashes is None
+        or anterior is None
+        or anteriores is None
+        or len(anterior) != len(anteriores)
+        or estado.get("tipos") != tipos
+    ):
+        return None
+
+    comparaveis = np.flatnonzero(anteriores.index.notna())
+    posicoes = anteriores.index[comparaveis].get_indexer(hashes.index)
+    existentes = posicoes >= 0
+    posicoes[existentes] = comparaveis[posicoes[existentes]]
+    iguais = existentes.copy()
+    iguais[existentes] = anteriores.to_numpy()[posicoes[existentes]] == hashes.to_numpy()[existentes]
+
+    novas = anterior.iloc[:0]
+    if not iguais.all():
+        novas = fonte.preparar(bruta[~iguais])
+        if list(novas.columns) != list(anterior.columns):
+            return None
+    mantidas = anterior.iloc[posicoes[iguais]]
+    mantidas.index = np.flatnonzero(iguais)
+    novas.index = np.flatnonzero(~iguais)
+    tabela = empilhar([mantidas, novas]).sort_index().reset_index(drop=True)
+
+    # Linhas anteriores que saíram: removidas ou substituídas pela versão alterada
+    saidas = np.setdiff1d(np.arange(len(anterior)), posicoes[iguais])
+    inseridas = int((~existentes).sum())
+    atualizadas = len(novas) - inseridas
+    contagens = {"inseridas": inseridas, "atualizadas": atualizadas, "removidas": len(saidas) - atualizadas}
+    for tipo, quantidade in contagens.items():
+        contar("dashboards_linhas_alteradas_total", quantidade, planilha=nome, tipo=tipo)
+    logger.info("Planilha %s atualizada por linhas: %s", nome, contagens)
+
+    delta = {
+        "de": estado.get("versao"),
+        "para": versao,
+        "removidas": anterior.iloc[saidas].reset_index(drop=True),
+        "inseridas": novas.reset_index(drop=True),
+    }
+    return tabela, delta
+
+
+# Função para baixar e tipar uma planilha. Quando o servidor responde 304 ou o
+# conteúdo tem o mesmo hash do último download, a tabela já tipada é reaproveitada
+# sem repetir a limpeza; quando muda e a planilha tem chave, só as linhas alteradas são
+# preparadas. Se o download falhar, o último snapshot é usado no lugar.
+def _baixar(nome):
+    fonte = FONTES[nome]
+    with _travas[nome]:
+        estado = _estado[nome]
+        if not estado:
+            estado.update(ler_metadados_snapshot(nome))
+
+        try:
+            with secao(f"{nome}: download"), cronometrar("dashboards_download_segundos", planilha=nome):
+                corpo, etag, modificado = _requisitar(fonte.url, estado)
+        except Exception:
+            contar("dashboards_downloads_total", planilha=nome, resultado="erro")
+            tabela = estado.get("tabela")
+            if tabela is None:
+                tabela = ler_snapshot(nome)
+            if tabela is None:
+                raise
+            if "versao" not in tabela.attrs:
+                _marcar(tabela, ler_metadados_snapshot(nome).get("versao"))
+            return tabela
+
+        versao = estado.get("versao") if corpo is None else hashlib.sha256(corpo).hexdigest()
+        if corpo is None:
+            contar("dashboards_downloads_total", planilha=nome, resultado="nao_modificado")
+        else:
+            contar("dashboards_download_bytes_total", len(corpo), planilha=nome)
+            resultado = "igual" if versao == estado.get("versao") else "novo"
+            contar("dashboards_downloads_total", planilha=nome, resultado=resultado)
+
+        if versao is not None and versao == estado.get("versao"):
+            tabela = estado.get("tabela")
+            if tabela is None:
+                tabela = ler_snapshot(nome)
+            if tabela is not None:
+                _marcar(tabela, versao)
+                estado.update(etag=etag, modificado=modificado, tabela=tabela)
+                definir("dashboards_linhas", len(tabela), planilha=nome)
+                renovar_snapshot(nome)
+                # CSV guardado por um processo anterior (ou perdido) volta a ser o desta versão
+                if corpo is not None and fonte.colunas is not None and estado.get("versao_csv") != versao:
+                    salvar_csv(nome, corpo)
+                    estado["versao_csv"] = versao
+                return tabela
+            if corpo is None:
+                # Snapshot perdido depois de um 304: baixa de novo sem validadores
+                corpo, etag, modificado = _requisitar(fonte.url, {})
+                versao = hashlib.sha256(corpo).hexdigest()
+                contar("dashboards_download_bytes_total", len(corpo), planilha=nome)
+
+        with secao(f"{nome}: leitura do CSV") as registro, cronometrar("dashboards_leitura_segundos", planilha=nome):
+            bruta = _ler_csv(corpo, fonte.colunas, fonte.nomear)
+            registro["linhas"] = len(bruta)
+        with secao(f"{nome}: preparação") as registro, cronometrar("dashboards_preparacao_segundos", planilha=nome):
+            # Hashes e tipos calculados antes da preparação, que altera a tabela lida
+            hashes = _hashes_linhas(bruta, fonte.chave, fonte.nomear)
+            tipos = bruta.dtypes.to_dict()
+            mescla = _mesclar(nome, estado, bruta, hashes, tipos, versao)
+            if mescla is None:
+                tabela, delta = fonte.preparar(bruta), None
+            else:
+                tabela, delta = mescla
+            _marcar(tabela, versao)
+            registro["linhas"] = len(tabela)
+        definir("dashboards_linhas", len(tabela), planilha=nome)
+        estado.update(
+            etag=etag, modificado=modificado, versao=versao, tabela=tabela, hashes=hashes, tipos=tipos, delta=delta
+        )
+        with secao(f"{nome}: snapshot"):
+            salvar_snapshot(
+                nome, tabela, {"etag": etag, "modificado": modificado, "versao": versao}, particao=fonte.particao
+            )
+            if fonte.colunas is not None:
+                salvar_csv(nome, corpo)
+                estado["versao_csv"] = versao
+        return tabela
+
+
+# Função para sortear o próximo intervalo de atualização de uma planilha
+def _proximo_intervalo(nome):
+    intervalo = FONTES[nome].intervalo or INTERVALO_ATUALIZACAO
+    return intervalo * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+# Laço do atualizador: atualiza cada planilha da agenda quando chega a sua vez.
+# As sessões continuam lendo a última versão boa enquanto o download acontece.
+def _atualizar_periodicamente():
+    while True:
+        with _agenda_alterada:
+            if not _agenda:
+                _agenda_alterada.wait()
+                continue
+            nome, quando = min(_agenda.items(), key=lambda item: item[1])
+            espera = quando - time.monotonic()
+            if espera > 0:
+                _agenda_alterada.wait(espera)
+                continue
+            _agenda[nome] = time.monotonic() + _proximo_intervalo(nome)
+
+        try:
+            _baixar(nome)
+        except Exception as e:
+            logger.warning("Falha ao atualizar a planilha %s: %s", nome, e)
+
+
+# Função para iniciar o atualizador em segundo plano (uma única vez por processo),
+# junto com a exportação das métricas, quando configurada
+def iniciar_atualizador():
+    global _atualizador
+    with _agenda_alterada:
+        if _atualizador is not None:
+            return
+        _atualizador = threading.Thread(
+            target=_atualizar_periodicamente, name="atualizador-planilhas", daemon=True
+        )
+        _atualizador.start()
+    iniciar_exportacao()
+
+
+# Função para incluir uma planilha na agenda do atualizador, na primeira vez em que ela
+# é lida no processo, iniciando o atualizador se preciso. Nas demais leituras não há
+# trava nem chamada ao atualizador; planilhas sem fonte registrada ficam de fora.
+def _agendar(nome):
+    if nome in _agenda or nome not in FONTES:
+        return
+    with _agenda_alterada:
+        _agenda.setdefault(nome, time.monotonic() + _proximo_intervalo(nome))
+        _agenda_alterada.notify()
+    iniciar_atualizador()
+
+
+# Função para antecipar a atualização de uma planilha para agora
+def _pedir_atualizacao(nome):
+    with _agenda_alterada:
+        _agenda[nome] = time.monotonic()
+        _agenda_alterada.notify()
+
+
+# Função para pedir ao atualizador um download completo (sem os validadores HTTP, que
+# poderiam trazer um 304 sem corpo), para voltar a guardar o CSV da versão atual
+def _pedir_csv(nome):
+    with _travas[nome]:
+        _estado[nome].update(etag=None, modificado=None, versao_csv=None)
+    _pedir_atualizacao(nome)
+
+
+# Função para obter a última versão boa de uma planilha. Só bloqueia quando o
+# processo ainda não tem nenhuma versão: primeiro tenta o snapshot local (mesmo
+# antigo, que é atualizado logo em seguida em segundo plano) e, sem ele, baixa agora.
+# A planilha entra na agenda do atualizador.
+def _tabela_atual(nome):
+    ligar_copy_on_write()
+    _agendar(nome)
+    estado = _estado[nome]
+    tabela = estado.get("tabela")
+    if tabela is not None:
+        contar("dashboards_cache_total", cache="planilha", resultado="hit")
+        return tabela
+
+    with _travas[nome]:
+        tabela = estado.get("tabela")
+        if tabela is None:
+            with secao(f"{nome}: leitura do snapshot"):
+                tabela = ler_snapshot(nome)
+            if tabela is not None:
+                metadados = ler_metadados_snapshot(nome)
+                estado.update(metadados, tabela=_marcar(tabela, metadados.get("versao")))
+                definir("dashboards_linhas", len(tabela), planilha=nome)
+                contar("dashboards_cache_total", cache="planilha", resultado="stale")
+                _pedir_atualizacao(nome)
+    if tabela is None:
+        contar("dashboards_cache_total", cache="planilha", resultado="miss")
+        tabela = _baixar(nome)
+    return tabela
+
+
+# Função para obter uma planilha já tipada sem acessar a rede a cada rerun.
+# `colunas` limita a tabela às colunas usadas pela página; a versão da planilha
+# entregue fica em `tabela.attrs["versao"]`.
+def carregar_fonte(nome, colunas=None):
+    tabela = _tabela_atual(nome)
+    registrar_leitura(nome, tabela.attrs.get("versao"))
+    if colunas is not None:
+        return tabela[list(colunas)]
+    return tabela.copy(deep=False)
+
+
+# Função para obter várias planilhas em paralelo. Devolve (tabelas, falhas): as
+# planilhas que deram erro ou não chegaram dentro de `tempo_limite` segundos ficam
+# como None em `tabelas`, com a mensagem em `falhas`, para a página exibir o restante.
+# As versões entregues são anotadas na thread de quem chamou, não nas de carregamento.
+def carregar_fontes(nomes, tempo_limite=TEMPO_LIMITE):
+    futuros = {nome: _executor.submit(_tabela_atual, nome) for nome in nomes}
+    prazo = time.monotonic() + tempo_limite
+
+    tabelas, falhas = {}, {}
+    for nome, futuro in futuros.items():
+        try:
+            tabela = futuro.result(timeout=max(prazo - time.monotonic(), 0))
+            registrar_leitura(nome, tabela.attrs.get("versao"))
+            tabelas[nome] = tabela.copy(deep=False)
+        except TempoEsgotado:
+            tabelas[nome] = None
+            falhas[nome] = f"tempo limite de {tempo_limite}s excedido"
+        except Exception as e:
+            tabelas[nome] = None
+            falhas[nome] = str(e)
+    return tabelas, falhas
+
+
+# Função para obter só as linhas de uma planilha com `coluna` (por padrão, a coluna de
+# partição da planilha) de `inicio` (inclusivo) até `fim` (exclusivo). Com a planilha em
+# memória, o intervalo sai do índice ordenado da coluna; num processo que ainda não a
+# carregou, só as partições do snapshot que cruzam o intervalo são lidas, e a planilha
+# inteira é carregada em segundo plano. Nos dois casos o índice é a posição de cada linha
+# na planilha. `colunas` limita as colunas devolvidas. As páginas chamam esta função
+# antes de carregar a planilha inteira, para a primeira seção não esperar por ela.
+def carregar_periodo(nome, inicio=None, fim=None, coluna=None, colunas=None):
+    coluna = coluna or FONTES[nome].particao
+    lidas = None if colunas is None else list(dict.fromkeys([*colunas, coluna]))
+
+    periodo = None
+    if _estado[nome].get("tabela") is None and coluna == FONTES[nome].particao:
+        with secao(f"{nome}: leitura das partições") as registro:
+            tabela = ler_snapshot(nome, lidas, inicio=inicio, fim=fim)
+            if tabela is not None:
+                _marcar(tabela, ler_metadados_snapshot(nome).get("versao"))
+                registrar_leitura(nome, tabela.attrs["versao"])
+                mascara = pd.Series(True, index=tabela.index)
+                if inicio is not None:
+                    mascara &= tabela[coluna] >= pd.Timestamp(inicio)
+                if fim is not None:
+                    mascara &= tabela[coluna] < pd.Timestamp(fim)
+                periodo = tabela[mascara]
+                registro["linhas"] = len(periodo)
+        if periodo is not None:
+            _executor.submit(_tabela_atual, nome)
+
+    if periodo is None:
+        indices = carregar_indices(nome, [coluna])
+        periodo = filtrar_intervalo(carregar_fonte(nome, lidas), indices, coluna, inicio, fim, incluir_fim=False)
+    return periodo if colunas is None else periodo[list(colunas)]
+
+
+# Função para obter os índices ordenados de colunas de datas de uma planilha (por padrão,
+# as declaradas em `indices` da fonte), um derivado por coluna, remontado só quando a
+# planilha muda. Páginas, carregar_periodo e o aquecimento caem na mesma entrada do cache.
+def carregar_indices(nome, colunas=None):
+    indices = {}
+    for coluna in FONTES[nome].indices if colunas is None else colunas:
+        indices.update(calcular_derivado(nome, montar_indices, (coluna,), colunas=[coluna]))
+    return indices
+
+
+# Função para listar as planilhas que já têm uma versão carregada neste processo
+def fontes_carregadas():
+    return [nome for nome in FONTES if _estado[nome].get("tabela") is not None]
+
+
+# Função para obter a versão (hash do conteúdo) da planilha carregada
+def versao_fonte(nome):
+    versao = _estado[nome].get("versao")
+    if versao is None:
+        versao = ler_metadados_snapshot(nome).get("versao")
+    return versao
+
+
+# Função para calcular um resultado derivado de uma planilha (agregações, tabelas
+# filtradas) apenas quando a planilha muda; enquanto a versão for a mesma, todas as
+# sessões reaproveitam o resultado já calculado. Os derivados incrementais da versão
+# imediatamente anterior são atualizados só com as linhas que mudaram. O resultado é
+# guardado com a versão da tabela usada no cálculo, lida junto com ela.
+def calcular_derivado(nome, funcao, *args, colunas=None):
+    tabela = carregar_fonte(nome, colunas)
+    versao = tabela.attrs.get("versao")
+    chave = (nome, funcao.__code__.co_filename, funcao.__qualname__, args, colunas and tuple(colunas))
+
+    em_cache = _derivados.get(chave)
+    delta = _estado[nome].get("delta")
+    atualizar = _INCREMENTAIS.get(inspect.unwrap(funcao))
+    if (
+        versao is not None
+        and em_cache is not None
+        and em_cache[0] != versao
+        and atualizar is not None
+        and delta is not None
+        and (delta["de"], delta["para"]) == (em_cache[0], versao)
+    ):
+        contar("dashboards_cache_total", cache="derivado", resultado="delta")
+        removidas, inseridas = delta["removidas"], delta["inseridas"]
+        if colunas is not None:
+            removidas, inseridas = removidas[list(colunas)], inseridas[list(colunas)]
+        with secao(f"{nome}: {funcao.__qualname__} (linhas alteradas)"):
+            em_cache = (versao, atualizar(em_cache[1], removidas, inseridas, *args))
+        _derivados[chave] = em_cache
+    elif versao is None or em_cache is None or em_cache[0] != versao:
+        resultado = "miss" if em_cache is None else "stale"
+        contar("dashboards_cache_total", cache="derivado", resultado=resultado)
+        with secao(f"{nome}: {funcao.__qualname__}") as registro:
+            em_cache = (versao, funcao(tabela, *args))
+            if isinstance(em_cache[1], (pd.DataFrame, pd.Series)):
+                registro["linhas"] = len(em_cache[1])
+        _derivados[chave] = em_cache
+    else:
+        contar("dashboards_cache_total", cache="derivado", resultado="hit")
+
+    resultado = em_cache[1]
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return resultado.copy(deep=False)
+    return resultado
+
+
+# Função para ler o CSV guardado de uma planilha, só se ele for da `versao` pedida
+def _csv_da_versao(nome, versao):
+    corpo = ler_csv(nome)
+    if corpo is None or hashlib.sha256(corpo).hexdigest() != versao:
+        return None
+    return corpo
+
+
+# Função para acrescentar à tabela principal as colunas não declaradas da planilha,
+# lidas do CSV guardado no download da mesma versão da tabela (linha a linha, o mesmo
+# arquivo de onde a tabela saiu) e devolvidas na ordem original do cabeçalho. Se o CSV
+# guardado for de outra versão, espera um download em andamento, que grava o CSV logo
+# depois de publicar a tabela; sem ele, pede um novo download e falha, em vez de juntar
+# linhas de versões diferentes ou baixar a planilha durante a execução da página.
+def _completar(tabela, nome):
+    fonte = FONTES[nome]
+    versao = tabela.attrs.get("versao")
+    corpo = _csv_da_versao(nome, versao)
+    if corpo is None:
+        with _travas[nome]:
+            corpo = _csv_da_versao(nome, versao)
+    if corpo is None:
+        _pedir_csv(nome)
+        raise RuntimeError(f"As colunas completas de {nome} ainda não estão disponíveis; tente de novo em instantes")
+
+    cabecalho = list(pd.read_csv(io.BytesIO(corpo), nrows=0).columns)
+    _, demais = _projetar(cabecalho, fonte.colunas, fonte.nomear)
+    if not demais:
+        return tabela
+
+    extras = fonte.preparar(pd.read_csv(io.BytesIO(corpo), usecols=demais))
+    if len(extras) == len(tabela):
+        extras.index = tabela.index
+    else:
+        logger.warning("CSV de %s com %d linhas para uma tabela de %d", nome, len(extras), len(tabela))
+        extras = extras.reindex(tabela.index)
+
+    # Posição de cada coluna no cabeçalho, pelo nome que ela recebe na preparação
+    posicoes = {fonte.nomear(col): posicao for posicao, col in enumerate(cabecalho)}
+    completa = pd.concat([tabela, extras], axis=1)
+    completa = completa[sorted(completa.columns, key=lambda col: posicoes.get(col, len(cabecalho)))]
+    return _marcar(completa, versao)
+
+
+# Função para obter uma planilha com todas as colunas, inclusive as que ficam fora
+# da tabela principal (descrições e observações longas). Usada só pelas tabelas de
+# dados; o resultado vale enquanto a planilha não mudar.
+def carregar_fonte_completa(nome):
+    if FONTES[nome].colunas is None:
+        return carregar_fonte(nome)
+    return calcular_derivado(nome, _completar, nome)
+
+
+# Função para obter todas as colunas das `linhas` que a página recortou de uma planilha
+# (de carregar_fonte ou carregar_periodo, com a posição de cada linha como índice). As
+# posições só valem na versão de onde as linhas vieram: se a planilha completa já for de
+# outra versão, devolve None e a página deve ser executada de novo com a versão nova.
+def detalhar(nome, linhas):
+    completa = carregar_fonte_completa(nome)
+    if completa.attrs.get("versao") != linhas.attrs.get("versao"):
+        return None
+    return completa.loc[linhas.index]
@@ -0,0 +1,47 @@
+import re
+import unicodedata
+from functools import reduce
+
+from utils.importacao import np, pd
+
+# Sequências de espaços (inclusive não separáveis) reduzidas a um espaço simples
+_ESPACOS = re.compile(r"\s+")
+
+
+# Função para normalizar um valor de texto: Unicode composto (NFC), sem espaços
+# nas pontas e com espaços internos repetidos reduzidos a um
+def _normalizar(valor):
+    if not isinstance(valor, str):
+        return valor
+    return _ESPACOS.sub(" ", unicodedata.normalize("NFC", valor)).strip()
+
+
+# Função para converter colunas de texto com poucos valores distintos em categorias.
+# A normalização é aplicada só ao dicionário de valores distintos, não a cada célula,
+# e valores que ficam iguais depois de normalizados passam a ser a mesma categoria.
+# As categorias ficam em ordem alfabética, a mesma dos agrupamentos sobre texto.
+def categorizar(tabela, colunas):
+    for col in colunas:
+        if col not in tabela.columns or not pd.api.types.is_object_dtype(tabela[col]):
+            continue
+        codigos, distintos = pd.factorize(tabela[col])
+        codigos_normalizados, categorias = pd.factorize(
+            pd.Index([_normalizar(valor) for valor in distintos], dtype=object), sort=True
+        )
+        # O -1 acrescentado no fim mantém as células vazias (código -1) vazias
+        mapa = np.append(codigos_normalizados, -1)
+        tabela[col] = pd.Categorical.from_codes(mapa[codigos], categories=categorias)
+    return tabela
+
+
+# Função para empilhar tabelas com as mesmas colunas sem perder as categorias: cada
+# coluna categórica passa a ter a união das categorias das partes (em ordem alfabética,
+# como em `categorizar`), em vez de virar texto como no pd.concat de categorias diferentes
+def empilhar(partes):
+    for col in partes[0].columns:
+        tipos = [parte[col].dtype for parte in partes if isinstance(parte[col].dtype, pd.CategoricalDtype)]
+        if not tipos:
+            continue
+        tipo = pd.CategoricalDtype(reduce(pd.Index.union, (tipo.categories for tipo in tipos)))
+        partes = [parte.assign(**{col: parte[col].astype(tipo)}) for parte in partes]
+    return pd.concat(partes)
@@ -0,0 +1,248 @@
+# Agregações das páginas (contagens, valores e ticket médio por mês), escritas uma vez
+# em SQL e executadas pelo DuckDB, embutido no processo, vetorizado e em paralelo, direto
+# sobre os arquivos Parquet do snapshot da planilha. O DuckDB é opcional: sem o pacote
+# (ou com DASHBOARDS_SQL=0), cada consulta usa o equivalente em pandas sobre a tabela
+# em memória, com o mesmo resultado.
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from utils.carregamento import calcular_derivado, ligar_copy_on_write, registrar_leitura, versao_fonte
+from utils.fontes import FONTES
+from utils.importacao import duckdb
+from utils.perfil import secao
+from utils.snapshots import arquivos_snapshot
+from utils.telemetria import contar
+
+# Consultas pelo DuckDB quando ele estiver instalado; "0" força o pandas
+MOTOR_SQL = os.environ.get("DASHBOARDS_SQL", "1") not in ("", "0")
+
+# Conexão do DuckDB (em memória) do processo; cada consulta usa o seu próprio cursor
+_conexao = None
+_trava = threading.Lock()
+
+# Resultados das consultas feitas direto sobre o snapshot, por (planilha, consulta,
+# parâmetros): (versão, resultado), válidos enquanto a versão não mudar
+_resultados = {}
+
+logger = logging.getLogger(__name__)
+
+
+# Colunas fixas das consultas, pelo nome na planilha dos Correios. Cada planilha dá o
+# seu nome a elas (FONTES[nome].nomear); o SQL as recebe como {data_orcado}, {orcamentista}...
+COLUNAS = {
+    "data_orcado": "DATA ORÇADO",
+    "orcamentista": "ORÇAMENTISTA",
+    "valor_insumo": "VALOR INSUMO",
+    "valor_mao_de_obra": "VALOR MÃO DE OBRA",
+    "valor_orcado": "VALOR ORÇADO",
+}
+
+
+# Consulta registrada: o SQL, com {origem} no lugar da tabela, {coluna} no lugar do
+# parâmetro `coluna` (um nome de coluna, não um valor) e as colunas fixas de COLUNAS, e o
+# equivalente em pandas, que recebe a tabela e os nomes dessas colunas na planilha
+@dataclass(frozen=True)
+class Consulta:
+    sql: str
+    pandas: Callable
+
+
+# Mês de cada orçamento (as OS sem data de orçamento ficam de fora dos agrupamentos)
+def _mes_orcamento(tabela, colunas):
+    return tabela[colunas["data_orcado"]].dt.to_period("M").rename("AnoMes")
+
+
+def _contagem(tabela, colunas, coluna):
+    contagem = tabela[coluna].value_counts()
+    return contagem[contagem > 0].rename("Contagem").reset_index()
+
+
+def _orcamentos_mes(tabela, colunas, orcamentista=None):
+    if orcamentista is not None:
+        tabela = tabela[tabela[colunas["orcamentista"]] == orcamentista]
+    contagem = tabela.groupby(_mes_orcamento(tabela, colunas)).size().reset_index(name="Contagem")
+    contagem["AnoMes"] = contagem["AnoMes"].astype(str)
+    return contagem
+
+
+def _valores_mensais(tabela, colunas):
+    valores = tabela.groupby(_mes_orcamento(tabela, colunas)).agg({
+        colunas["valor_insumo"]: "sum",
+        colunas["valor_mao_de_obra"]: "sum",
+        colunas["valor_orcado"]: "sum",
+    }).reset_index()
+    valores["AnoMes"] = valores["AnoMes"].astype(str)
+    return valores
+
+
+def _ticket_medio_mensal(tabela, colunas):
+    ticket = tabela.groupby(_mes_orcamento(tabela, colunas))[colunas["valor_orcado"]].mean().reset_index()
+    ticket.columns = ["AnoMes", "Ticket Médio"]
+    ticket["AnoMes"] = ticket["AnoMes"].astype(str)
+    return ticket
+
+
+# Consultas disponíveis às páginas, pelo nome
+CONSULTAS = {
+    # Quantidade de OS por valor de `coluna`, da mais frequente para a menos frequente
+    "contagem": Consulta(
+        sql="""
+            SELECT {coluna}, count(*) AS "Contagem"
+            FROM {origem}
+            WHERE {coluna} IS NOT NULL
+            GROUP BY 1
+            ORDER BY 2 DESC, 1
+        """,
+        pandas=_contagem,
+    ),
+    # Orçamentos feitos em cada mês
+    "orcamentos_mes": Consulta(
+        sql="""
+            SELECT strftime({data_orcado}, '%Y-%m') AS "AnoMes", count(*) AS "Contagem"
+            FROM {origem}
+            WHERE {data_orcado} IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """,
+        pandas=_orcamentos_mes,
+    ),
+    # Orçamentos feitos em cada mês por um orçamentista
+    "orcamentos_mes_orcamentista": Consulta(
+        sql="""
+            SELECT strftime({data_orcado}, '%Y-%m') AS "AnoMes", count(*) AS "Contagem"
+            FROM {origem}
+            WHERE {data_orcado} IS NOT NULL AND {orcamentista} = $orcamentista
+            GROUP BY 1
+            ORDER BY 1
+        """,
+        pandas=_orcamentos_mes,
+    ),
+    # Valores de insumo, mão de obra e orçado somados por mês de orçamento
+    "valores_mensais": Consulta(
+        sql="""
+            SELECT
+                strftime({data_orcado}, '%Y-%m') AS "AnoMes",
+                coalesce(sum({valor_insumo}), 0) AS {valor_insumo},
+                coalesce(sum({valor_mao_de_obra}), 0) AS {valor_mao_de_obra},
+                coalesce(sum({valor_orcado}), 0) AS {valor_orcado}
+            FROM {origem}
+            WHERE {data_orcado} IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """,
+        pandas=_valores_mensais,
+    ),
+    # Valor orçado médio por mês de orçamento
+    "ticket_medio_mensal": Consulta(
+        sql="""
+            SELECT strftime({data_orcado}, '%Y-%m') AS "AnoMes", avg({valor_orcado}) AS "Ticket Médio"
+            FROM {origem}
+            WHERE {data_orcado} IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """,
+        pandas=_ticket_medio_mensal,
+    ),
+}
+
+
+def _identificador(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _literal(texto):
+    return "'" + texto.replace("'", "''") + "'"
+
+
+# Função para obter um cursor da conexão do DuckDB do processo (aberta no primeiro uso)
+def _cursor():
+    global _conexao
+    with _trava:
+        if _conexao is None:
+            _conexao = duckdb.connect()
+        return _conexao.cursor()
+
+
+# Função para obter os nomes que as colunas fixas das consultas têm numa planilha
+def _colunas(nome):
+    return {chave: FONTES[nome].nomear(coluna) for chave, coluna in COLUNAS.items()}
+
+
+# Função para executar uma consulta no DuckDB sobre `origem`: os arquivos Parquet do
+# snapshot (read_parquet) ou a `tabela` em memória, lida via Arrow como "planilha".
+# Devolve None se a origem não puder ser lida (um arquivo trocado por uma gravação mais
+# nova durante a leitura).
+def _executar_sql(origem, nome, definicao, parametros, tabela=None):
+    identificadores = {chave: _identificador(coluna) for chave, coluna in _colunas(nome).items()}
+    coluna = parametros.get("coluna")
+    valores = {chave: valor for chave, valor in parametros.items() if chave != "coluna"}
+    sql = definicao.sql.format(origem=origem, coluna=coluna and _identificador(coluna), **identificadores)
+
+    cursor = _cursor()
+    try:
+        if tabela is not None:
+            cursor.register("planilha", tabela)
+        return cursor.execute(sql, valores or None).df()
+    except duckdb.IOException as e:
+        logger.warning("Não foi possível ler %s para a consulta: %s", nome, e)
+        return None
+    finally:
+        cursor.close()
+
+
+# Função para consultar direto os arquivos Parquet do snapshot da versão atual de uma
+# planilha, sem carregar a tabela no pandas. Devolve None quando o snapshot não é da
+# versão atual (a planilha acabou de mudar e o snapshot ainda está sendo gravado) ou
+# não pode ser lido; a consulta então é feita sobre a tabela em memória.
+def _consultar_snapshot(nome, consulta, parametros):
+    ligar_copy_on_write()
+    versao = versao_fonte(nome)
+    arquivos = arquivos_snapshot(nome, versao)
+    if not arquivos:
+        return None
+
+    chave = (nome, consulta, parametros)
+    em_cache = _resultados.get(chave)
+    if em_cache is None or em_cache[0] != versao:
+        contar("dashboards_cache_total", cache="consulta", resultado="miss" if em_cache is None else "stale")
+        origem = f"read_parquet([{', '.join(map(_literal, arquivos))}])"
+        with secao(f"{nome}: SQL {consulta} (snapshot)"):
+            resultado = _executar_sql(origem, nome, CONSULTAS[consulta], dict(parametros))
+        if resultado is None:
+            return None
+        em_cache = _resultados[chave] = (versao, resultado)
+    else:
+        contar("dashboards_cache_total", cache="consulta", resultado="hit")
+
+    registrar_leitura(nome, versao)
+    return em_cache[1].copy(deep=False)
+
+
+# Função executada como derivado da planilha em memória: a consulta pelo DuckDB (a
+# tabela lida via Arrow) ou pelo pandas, que também responde se o DuckDB não puder ler
+def _executar(tabela, nome, consulta, parametros):
+    definicao = CONSULTAS[consulta]
+    parametros = dict(parametros)
+    if duckdb is not None and MOTOR_SQL:
+        with secao(f"{nome}: SQL {consulta}"):
+            resultado = _executar_sql("planilha", nome, definicao, parametros, tabela)
+        if resultado is not None:
+            return resultado
+    return definicao.pandas(tabela, _colunas(nome), **parametros)
+
+
+# Função para obter o resultado de uma consulta registrada sobre a versão atual de uma
+# planilha, com os parâmetros nomeados da consulta. Com o DuckDB, a consulta lê direto
+# os arquivos Parquet do snapshot da versão atual; sem ele (ou sem snapshot dessa
+# versão), é um derivado da tabela em memória. Nos dois casos o resultado é calculado
+# uma vez por versão e compartilhado entre as sessões.
+def consultar(nome, consulta, **parametros):
+    parametros = tuple(sorted(parametros.items()))
+    if duckdb is not None and MOTOR_SQL:
+        resultado = _consultar_snapshot(nome, consulta, parametros)
+        if resultado is not None:
+            return resultado
+    return calcular_derivado(nome, _executar, nome, consulta, parametros)
@@ -0,0 +1,273 @@
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from utils.categorias import categorizar
+from utils.importacao import pd
+from utils.moeda import converter_moeda
+from utils.perfil import secao
+
+
+# Descrição de uma planilha publicada: de onde baixar, como tipar as colunas e,
+# opcionalmente, de quantos em quantos segundos atualizá-la. `colunas` declara as
+# colunas da tabela principal (nome no cabeçalho -> tipo na leitura do CSV, None para
+# inferir); as demais só são lidas quando a página pede a planilha completa. `chave` é
+# a coluna que identifica cada linha (o ID da OS), usada para aplicar a cada download
+# só as linhas inseridas, alteradas e removidas. `particao` é a coluna de datas principal,
+# que divide o snapshot em partições por ano e mês para as consultas por período.
+# `nomear` dá o nome que cada coluna do cabeçalho recebe na preparação; `colunas`,
+# `chave` e `particao` usam esse nome, o mesmo que as páginas veem. `indices` são as
+# colunas de datas que as páginas filtram por intervalo (cada uma com um índice
+# ordenado) e `consultas` as consultas de utils.consultas feitas pelas páginas ao abrir,
+# como pares (consulta, parâmetros); os dois são calculados no aquecimento.
+@dataclass(frozen=True)
+class Fonte:
+    url: str
+    preparar: Callable[["pd.DataFrame"], "pd.DataFrame"]
+    intervalo: Optional[int] = None
+    colunas: Optional[dict] = None
+    chave: Optional[str] = None
+    particao: Optional[str] = None
+    nomear: Callable[[str], str] = str.strip
+    indices: tuple = ()
+    consultas: tuple = ()
+
+
+# Colunas financeiras das etapas da planilha de contratos da SOP
+COLUNAS_ETAPAS_SOP = [
+    "ETAPA 1 (CR.F.FINANCEIRO) 30 DIAS",
+    "ETAPA 2 (CR.F.FINANCEIRO) 60 DIAS",
+    "ETAPA 3 (CR.F.FINANCEIRO) 90 DIAS",
+    "ETAPA 4 (CR.F.FINANCEIRO) 120 DIAS",
+    "ETAPA 5 (CR.F.FINANCEIRO) 150 DIAS",
+    "ETAPA 6 (CR.F.FINANCEIRO) 180 DIAS",
+    "VALOR DO CONTRATO",
+]
+
+# Colunas de medição mensal da planilha de medições da SOP
+COLUNAS_MEDICAO_SOP = [
+    "MEDIÇÃO JUNHO",
+    "MEDIÇÃO JULHO",
+    "MEDIÇÃO AGOSTO",
+    "MEDIÇÃO SETEMBRO",
+    "MEDIÇÃO OUTUBRO",
+    "MEDIÇÃO NOVEMBRO",
+    "MEDIÇÃO DEZEMBRO",
+]
+
+# Colunas usadas pelos gráficos e métricas da página dos Correios. Datas e valores
+# chegam como texto e são convertidos na preparação; o restante da planilha (descrições,
+# observações etc.) só aparece nas tabelas de dados e é lido quando elas são abertas.
+COLUNAS_CORREIOS = {
+    "ID": None,
+    "STATUS*": str,
+    "DISCIPLINAS": str,
+    "ORÇAMENTISTA": str,
+    "NORMAL / URGENTE": str,
+    "PREDIO CORREIOS": str,
+    "DATA RECEBIDO": str,
+    "DATA ORÇADO": str,
+    "DATA EXECUÇÃO (INÍCIO)": str,
+    "DATA FINALIZADO": str,
+    "VALOR ORÇADO": str,
+    "VALOR INSUMO": str,
+    "VALOR MÃO DE OBRA": str,
+}
+
+
+# Função para remover acentos de um nome de coluna
+def _nome_ascii(nome):
+    return unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("utf-8").strip()
+
+
+# Colunas usadas pelos gráficos e métricas da página do SERPRO (mesmo layout dos
+# Correios, com a coluna "PRÉDIO" no lugar de "PREDIO CORREIOS"), pelos nomes sem
+# acentos que a preparação da planilha dá às colunas
+COLUNAS_SERPRO = {
+    **{_nome_ascii(col): tipo for col, tipo in COLUNAS_CORREIOS.items() if col != "PREDIO CORREIOS"},
+    _nome_ascii("PRÉDIO"): str,
+}
+
+# Função para listar as consultas feitas ao abrir as páginas dos Correios e do SERPRO
+# (as que dependem de um filtro escolhido na página ficam de fora), com as colunas
+# contadas pelos nomes de cada planilha
+def _consultas_os(contadas):
+    return (
+        *(("contagem", {"coluna": col}) for col in contadas),
+        ("orcamentos_mes", {}),
+        ("valores_mensais", {}),
+        ("ticket_medio_mensal", {}),
+    )
+
+
+# Colunas de texto com poucos valores distintos, guardadas como categorias
+COLUNAS_CATEGORICAS = [
+    "STATUS*",
+    "DISCIPLINAS",
+    "CONTRATO",
+    "ORÇAMENTISTA",
+    "NORMAL / URGENTE",
+    "PREDIO CORREIOS",
+    "MUNICÍPIO",
+]
+
+
+# Função para preparar a planilha do Banrisul
+def _preparar_banrisul(tabela):
+    date_columns = ["DATA RECEBIDO", "DATA FINALIZADO", "DATA ORÇADO"]
+    with secao("datas"):
+        for col in date_columns:
+            if col in tabela.columns:
+                tabela[col] = pd.to_datetime(
+                    tabela[col], format="%d/%m/%Y", dayfirst=True, errors="coerce"
+                )
+
+    # Convertendo colunas de valores para numérico
+    valor_columns = [
+        col for col in ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"] if col in tabela.columns
+    ]
+    with secao("valores"):
+        tabela[valor_columns] = converter_moeda(tabela[valor_columns])
+
+    with secao("categorias"):
+        return categorizar(tabela, COLUNAS_CATEGORICAS)
+
+
+# Função para preparar a planilha dos Correios (a tabela principal ou as colunas
+# lidas sob demanda, por isso cada conversão confere se a coluna está presente)
+def _preparar_correios(tabela):
+    # Remover espaços em branco ao redor dos nomes das colunas
+    tabela.columns = tabela.columns.str.strip()
+
+    # Certificar-se de que as colunas de valores sejam numéricas ('VALOR ORÇADO' vazio conta como zero)
+    with secao("valores"):
+        if "VALOR ORÇADO" in tabela.columns:
+            tabela["VALOR ORÇADO"] = converter_moeda(tabela["VALOR ORÇADO"], vazio=0.0, invalido=0.0)
+        valor_columns = [col for col in ["VALOR INSUMO", "VALOR MÃO DE OBRA"] if col in tabela.columns]
+        tabela[valor_columns] = converter_moeda(tabela[valor_columns])
+
+    # Converter colunas de datas para o formato datetime
+    with secao("datas"):
+        for col in ["DATA RECEBIDO", "DATA ORÇADO", "DATA EXECUÇÃO (INÍCIO)", "DATA FINALIZADO"]:
+            if col in tabela.columns:
+                tabela[col] = pd.to_datetime(tabela[col], format="%d/%m/%Y", errors="coerce")
+
+    # Categorias com espaços e acentuação normalizados
+    with secao("categorias"):
+        return categorizar(tabela, COLUNAS_CATEGORICAS)
+
+
+# Função para preparar a planilha do SERPRO
+def _preparar_serpro(tabela):
+    # Normalizar nomes das colunas
+    tabela.columns = [_nome_ascii(col) for col in tabela.columns]
+
+    # Verificar e converter colunas de data (pelos nomes já sem acentos)
+    date_columns = [
+        _nome_ascii(col) for col in ["DATA RECEBIDO", "DATA ORÇADO", "DATA EXECUÇÃO (INÍCIO)", "DATA FINALIZADO"]
+    ]
+    with secao("datas"):
+        for col in date_columns:
+            if col in tabela.columns:
+                tabela[col] = pd.to_datetime(tabela[col], format="%d/%m/%Y", errors="coerce")
+
+    # Converter colunas de valores presentes na planilha
+    valor_columns = [
+        _nome_ascii(col)
+        for col in ["VALOR INSUMO", "VALOR MÃO DE OBRA", "VALOR ORÇADO"]
+        if _nome_ascii(col) in tabela.columns
+    ]
+    with secao("valores"):
+        tabela[valor_columns] = converter_moeda(tabela[valor_columns])
+
+    # Categorias com espaços e acentuação normalizados (nomes das colunas já sem acentos)
+    with secao("categorias"):
+        return categorizar(tabela, [_nome_ascii(col) for col in COLUNAS_CATEGORICAS])
+
+
+# Função para preparar a planilha do TRE-RS
+def _preparar_trers(tabela):
+    # Converter a coluna "VALOR ORÇADO" do formato "R$ 1.234,56" para número
+    with secao("valores"):
+        tabela["VALOR ORÇADO"] = converter_moeda(tabela["VALOR ORÇADO"])
+
+    with secao("datas"):
+        for col in ["DATA FINALIZADO", "DATA RECEBIDO"]:
+            tabela[col] = pd.to_datetime(tabela[col], format="%d/%m/%Y", errors="coerce")
+
+    with secao("categorias"):
+        return categorizar(tabela, COLUNAS_CATEGORICAS)
+
+
+# Função para preparar a planilha de OIS da SOP
+def _preparar_sop_ois(tabela):
+    # Converter colunas relevantes para strings para garantir que sejam exibidas corretamente
+    for col in ["V.TOTAL LOTE 1", "V.TOTAL LOTE 4", "SALDO LOTE 1", "SALDO LOTE 4"]:
+        tabela[col] = tabela[col].astype(str)
+    return tabela
+
+
+# Função para preparar a planilha de etapas financeiras da SOP
+def _preparar_sop_etapas(tabela):
+    for col in COLUNAS_ETAPAS_SOP:
+        if col in tabela.columns:
+            tabela[col] = tabela[col].replace("[R$ ,]", "", regex=True).astype(float)
+    return tabela
+
+
+# Função para preparar a planilha de medições da SOP (linhas 'TOTAL' viram nulas)
+def _preparar_sop_medicoes(tabela):
+    tabela[COLUNAS_MEDICAO_SOP] = converter_moeda(
+        tabela[COLUNAS_MEDICAO_SOP], vazio=0.0, invalido=0.0
+    )
+    return tabela
+
+
+# Função para preparar a planilha de OAT da SOP
+def _preparar_sop_oat(tabela):
+    tabela["STATUS"] = tabela["STATUS"].str.strip()
+    return tabela
+
+
+_SOP = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQqArKQaOEijehSgxrnDUh7Pyo4VBM8ILxPnlcKTGy1zOaDS17C-2jQODUjBlhu2cEIJG59Euq0GQ5D/pub?gid={gid}&single=true&output=csv"
+
+# Planilhas conhecidas pelo painel, indexadas pelo nome usado nas páginas
+FONTES = {
+    "banrisul": Fonte(
+        url="https://docs.google.com/spreadsheets/d/e/2PACX-1vTlBXGpJ6j2i-C6edJ-eB4X2DD-7KA7Ys1bIR-tCFeYt6B-7S30bcY_bd0TUtEbttDiMBtexpD-2C4-/pub?gid=1319816246&single=true&output=csv",
+        preparar=_preparar_banrisul,
+        chave="ID",
+        particao="DATA RECEBIDO",
+        indices=("DATA RECEBIDO", "DATA ORÇADO", "DATA FINALIZADO"),
+    ),
+    "correios": Fonte(
+        url="https://docs.google.com/spreadsheets/d/e/2PACX-1vTfXp-_Anw2MhzZAfBhLrITSzXy_AVm-K81tFSRLz4xBhuWq7KIdYDFqtdJZ9zGOJpV32H4qPeJ4BrD/pub?gid=1596975483&single=true&output=csv",
+        preparar=_preparar_correios,
+        colunas=COLUNAS_CORREIOS,
+        chave="ID",
+        particao="DATA RECEBIDO",
+        indices=("DATA RECEBIDO", "DATA EXECUÇÃO (INÍCIO)"),
+        consultas=_consultas_os(["STATUS*", "DISCIPLINAS", "ORÇAMENTISTA", "NORMAL / URGENTE", "PREDIO CORREIOS"]),
+    ),
+    "serpro": Fonte(
+        url="https://docs.google.com/spreadsheets/d/e/2PACX-1vRLqMLkFbkIyDOoUw_tUt1Hd-M37UaCtSnz2L4SeDnrJdCD3HRIzp-RjfdE-WWcl7vU1P0lw3aOXxrZ/pub?gid=1230307202&single=true&output=csv",
+        preparar=_preparar_serpro,
+        colunas=COLUNAS_SERPRO,
+        chave="ID",
+        particao="DATA RECEBIDO",
+        nomear=_nome_ascii,
+        indices=("DATA RECEBIDO",),
+        consultas=(("contagem", {"coluna": "STATUS*"}), ("contagem", {"coluna": "DISCIPLINAS"})),
+    ),
+    "trers": Fonte(
+        url="https://docs.google.com/spreadsheets/d/e/2PACX-1vR2Ql1eYWomSTjyQrylSBJ2tHgslpJEmA3iXrxJWTyJMNSkYRauZrJisIgEi1wT9D4Uu7S0Eyo04Xq3/pub?gid=1846942667&single=true&output=csv",
+        preparar=_preparar_trers,
+        chave="ID",
+        particao="DATA RECEBIDO",
+        indices=("DATA RECEBIDO", "DATA FINALIZADO"),
+    ),
+    "sop_ois": Fonte(url=_SOP.format(gid=636293343), preparar=_preparar_sop_ois),
+    "sop_etapas": Fonte(url=_SOP.format(gid=1758648028), preparar=_preparar_sop_etapas),
+    "sop_medicoes": Fonte(url=_SOP.format(gid=607349672), preparar=_preparar_sop_medicoes),
+    "sop_oat": Fonte(url=_SOP.format(gid=1784106199), preparar=_preparar_sop_oat),
+}
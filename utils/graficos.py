@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from utils.carregamento import versao_fonte, versoes_lidas
+from utils.importacao import alt
+from utils.perfil import secao
+from utils.telemetria import contar
+
+# Quantidade máxima de gráficos guardados; os usados há mais tempo saem primeiro
+LIMITE_GRAFICOS = int(os.environ.get("DASHBOARDS_LIMITE_GRAFICOS", 256))
+
+# Especificações Vega-Lite já serializadas, por (planilha, versão, gráfico, parâmetros)
+_especificacoes = OrderedDict()
+_trava = threading.Lock()
+
+# O tema e o transformador de dados do Altair são globais ao processo
+_trava_altair = threading.Lock()
+
+
+# Função para contar as linhas de cada dia de uma coluna de datas. Os gráficos
+# recebem uma linha por dia já agregada, em vez de todas as linhas da planilha
+# para o navegador contar; datas vazias ficam de fora, como no count() do Vega.
+def contar_por_dia(tabela, coluna, nome="Quantidade"):
+    dias = tabela[coluna].dt.normalize()
+    contagem = dias.value_counts(sort=False).sort_index()
+    return contagem.rename_axis(coluna).reset_index(name=nome)
+
+
+# Função para serializar um gráfico do Altair em JSON do Vega-Lite, sem o tema
+# padrão (o Streamlit também o desliga) e sem limite de linhas nos dados embutidos
+def _serializar(grafico):
+    with _trava_altair:
+        with alt.theme.enable("none"), alt.data_transformers.enable("default", max_rows=None):
+            return grafico.to_json(indent=None, sort_keys=False)
+
+
+# Função para obter a especificação Vega-Lite de um gráfico de uma planilha.
+# `construir(*parametros)` só é chamado quando o gráfico ainda não foi guardado para
+# a versão da planilha lida por esta execução da página com os mesmos `parametros`
+# (filtros escolhidos na página); nos outros reruns, como os cliques em
+# "Mostrar/Ocultar", o JSON guardado é reaproveitado. Um gráfico só é guardado quando
+# tudo o que a execução leu da planilha, antes e durante a montagem, é da mesma versão.
+def especificar_grafico(nome, grafico, construir, *parametros):
+    lidas = versoes_lidas(nome)
+    if not lidas:
+        versao = versao_fonte(nome)
+    else:
+        versao = next(iter(lidas)) if len(lidas) == 1 else None
+    chave = (nome, versao, grafico, parametros)
+
+    especificacao = None
+    if versao is not None:
+        with _trava:
+            especificacao = _especificacoes.get(chave)
+            if especificacao is not None:
+                _especificacoes.move_to_end(chave)
+
+    contar("dashboards_cache_total", cache="grafico", resultado="miss" if especificacao is None else "hit")
+    if especificacao is None:
+        with secao(f"gráfico {grafico}: montagem"):
+            montado = construir(*parametros)
+        with secao(f"gráfico {grafico}: serialização"):
+            especificacao = _serializar(montado)
+        if versao is not None and versoes_lidas(nome) <= {versao}:
+            with _trava:
+                _especificacoes[chave] = especificacao
+                while len(_especificacoes) > LIMITE_GRAFICOS:
+                    _especificacoes.popitem(last=False)
+
+    # O Streamlit altera a especificação recebida, então cada rerun recebe a sua cópia
+    return json.loads(especificacao)
@@ -0,0 +1,40 @@
+import io
+import os
+import threading
+
+# Imagens já redimensionadas e codificadas, por (caminho, tamanho, data de modificação)
+_imagens = {}
+_trava = threading.Lock()
+
+
+# Função para abrir, redimensionar e codificar uma imagem em PNG otimizado. Sem
+# redimensionamento, o arquivo original é mantido quando já é menor que o recodificado.
+# O Pillow só é importado aqui, na primeira vez que uma imagem precisa ser preparada.
+def _preparar(caminho, tamanho):
+    from PIL import Image
+
+    with Image.open(caminho) as imagem:
+        if tamanho is not None:
+            imagem = imagem.resize(tamanho)
+        saida = io.BytesIO()
+        imagem.save(saida, format="PNG", optimize=True)
+    if tamanho is None:
+        with open(caminho, "rb") as arquivo:
+            return min(arquivo.read(), saida.getvalue(), key=len)
+    return saida.getvalue()
+
+
+# Função para obter os bytes da imagem de um cabeçalho, redimensionada para
+# `tamanho` (largura, altura) ou no tamanho original quando None. A imagem é
+# decodificada e redimensionada uma única vez por processo (de novo só se o
+# arquivo mudar); os reruns reaproveitam os bytes já codificados.
+def imagem_cabecalho(caminho, tamanho=None):
+    chave = (os.path.normpath(caminho), tamanho, os.path.getmtime(caminho))
+    dados = _imagens.get(chave)
+    if dados is None:
+        with _trava:
+            dados = _imagens.get(chave)
+            if dados is None:
+                dados = _preparar(caminho, tamanho)
+                _imagens[chave] = dados
+    return dados
@@ -0,0 +1,46 @@
+# Módulos pesados (pandas, numpy, pyarrow, altair, duckdb) importados só no primeiro
+# uso. Cada nome exportado aqui é um substituto do módulo: o primeiro acesso a um
+# atributo (pd.DataFrame, alt.Chart...) importa o módulo de verdade e repassa o
+# acesso a ele. Assim importar as páginas e os utilitários não carrega esses módulos,
+# e uma página só paga pelo Altair quando monta o primeiro gráfico.
+import importlib
+import importlib.util
+import threading
+
+
+# Módulo importado no primeiro acesso a um atributo. Os atributos não são guardados
+# no substituto, para que alterações no módulo real continuem valendo.
+class ModuloSobDemanda:
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+        self._trava = threading.Lock()
+
+    # Função para importar o módulo na primeira vez
+    def _carregar(self):
+        if self._modulo is None:
+            with self._trava:
+                if self._modulo is None:
+                    self._modulo = importlib.import_module(self._nome)
+        return self._modulo
+
+    def __getattr__(self, nome):
+        return getattr(self._carregar(), nome)
+
+    def __repr__(self):
+        estado = "importado" if self._modulo is not None else "não importado"
+        return f"<módulo {self._nome} sob demanda ({estado})>"
+
+
+# Função para indicar se um módulo opcional está instalado, sem importá-lo
+def disponivel(nome):
+    return importlib.util.find_spec(nome) is not None
+
+
+pd = ModuloSobDemanda("pandas")
+np = ModuloSobDemanda("numpy")
+pa = ModuloSobDemanda("pyarrow")
+pc = ModuloSobDemanda("pyarrow.compute")
+pq = ModuloSobDemanda("pyarrow.parquet")
+alt = ModuloSobDemanda("altair")
+duckdb = ModuloSobDemanda("duckdb") if disponivel("duckdb") else None
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.importacao import np, pd
+
+# Colunas de data indexadas nas planilhas de OS
+COLUNAS_INDICE = ("DATA RECEBIDO", "DATA ORÇADO", "DATA FINALIZADO", "DATA EXECUÇÃO (INÍCIO)")
+
+
+# Índice ordenado de uma coluna de datas: as datas preenchidas em ordem crescente
+# e a posição de cada uma na tabela, para responder intervalos com busca binária,
+# com a versão da planilha de onde a coluna veio
+@dataclass(frozen=True)
+class IndiceDatas:
+    datas: "np.ndarray"
+    posicoes: "np.ndarray"
+    linhas: int
+    versao: Optional[str] = None
+
+    # Posições (na ordem original da tabela) das linhas com data entre `inicio` e
+    # `fim`; None deixa o lado aberto e `incluir_fim=False` exclui o próprio `fim`
+    def posicoes_intervalo(self, inicio=None, fim=None, incluir_fim=True):
+        esquerda = 0
+        direita = len(self.datas)
+        if inicio is not None:
+            esquerda = np.searchsorted(self.datas, np.datetime64(pd.Timestamp(inicio)), side="left")
+        if fim is not None:
+            lado = "right" if incluir_fim else "left"
+            direita = np.searchsorted(self.datas, np.datetime64(pd.Timestamp(fim)), side=lado)
+        return np.sort(self.posicoes[esquerda:max(esquerda, direita)])
+
+
+# Função para montar o índice de uma coluna de datas (datas vazias ficam de fora)
+def indexar_datas(coluna):
+    valores = coluna.to_numpy(dtype="datetime64[ns]")
+    preenchidas = np.flatnonzero(~np.isnat(valores))
+    ordem = preenchidas[np.argsort(valores[preenchidas], kind="stable")]
+    return IndiceDatas(
+        datas=valores[ordem], posicoes=ordem, linhas=len(coluna), versao=coluna.attrs.get("versao")
+    )
+
+
+# Função para montar os índices das colunas de data presentes (e já tipadas) na tabela
+def montar_indices(tabela, colunas=COLUNAS_INDICE):
+    return {
+        col: indexar_datas(tabela[col])
+        for col in colunas
+        if col in tabela.columns and pd.api.types.is_datetime64_any_dtype(tabela[col])
+    }
+
+
+# Função para filtrar as linhas com `coluna` no intervalo usando o índice, sem
+# percorrer a tabela inteira. O índice só é usado quando foi montado da mesma versão
+# da planilha que a tabela (attrs["versao"], marcado pelo carregador); de outra versão,
+# ou de uma tabela sem versão, ele é remontado na hora.
+def filtrar_intervalo(tabela, indices, coluna, inicio=None, fim=None, incluir_fim=True):
+    indice = indices.get(coluna)
+    if (
+        indice is None
+        or indice.versao is None
+        or indice.versao != tabela.attrs.get("versao")
+        or indice.linhas != len(tabela)
+    ):
+        indice = indexar_datas(tabela[coluna])
+    return tabela.iloc[indice.posicoes_intervalo(inicio, fim, incluir_fim)]
@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+
+from utils.categorias import empilhar
+from utils.importacao import pd
+
+# Eventos do cubo e a coluna de data que posiciona cada OS no dia do evento
+EVENTOS_CUBO = {
+    "recebido": "DATA RECEBIDO",
+    "finalizado": "DATA FINALIZADO",
+    "orcado": "DATA ORÇADO",
+}
+
+# Dimensões e valores somados em cada célula do cubo
+DIMENSOES_CUBO = ["CONTRATO", "DISCIPLINAS", "STATUS*"]
+VALORES_CUBO = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
+
+# Colunas da planilha necessárias para montar o cubo
+COLUNAS_CUBO = DIMENSOES_CUBO + list(EVENTOS_CUBO.values()) + VALORES_CUBO
+
+
+# Função para montar o cubo contrato × disciplina × status × dia de uma planilha.
+# Para cada evento guarda a quantidade de OS e as somas de valores de cada célula;
+# OS sem data entram com DIA vazio, para as contagens que não dependem de período.
+def montar_cubo(tabela):
+    cubo = {}
+    for evento, coluna in EVENTOS_CUBO.items():
+        dia = tabela[coluna].dt.normalize().rename("DIA")
+        agrupado = tabela.groupby(DIMENSOES_CUBO + [dia], dropna=False, observed=True)
+        celulas = agrupado[VALORES_CUBO].sum()
+        celulas.insert(0, "QUANTIDADE", agrupado.size())
+        cubo[evento] = celulas.reset_index()
+    return cubo
+
+
+# Função para atualizar o cubo com as linhas que mudaram desde a versão anterior da
+# planilha: as células das linhas que saíram (removidas, ou a versão antiga de uma linha
+# alterada) são subtraídas e as das linhas que entraram, somadas. Células que ficam sem
+# nenhuma OS saem do cubo; o resultado é o mesmo de montar o cubo da tabela nova.
+def atualizar_cubo(cubo, removidas, inseridas):
+    saidas = montar_cubo(removidas)
+    entradas = montar_cubo(inseridas)
+    somadas = ["QUANTIDADE"] + VALORES_CUBO
+
+    atualizado = {}
+    for evento, celulas in cubo.items():
+        negativas = saidas[evento]
+        negativas[somadas] = -negativas[somadas]
+        juntas = empilhar([celulas, negativas, entradas[evento]])
+        agrupado = juntas.groupby(DIMENSOES_CUBO + ["DIA"], dropna=False, observed=True)[somadas].sum()
+        atualizado[evento] = agrupado[agrupado["QUANTIDADE"] != 0].reset_index()
+    return atualizado
+
+
+# Função para recortar um evento do cubo por contrato ("Todos" não filtra), por
+# intervalo de dias (inclusivo; None deixa o lado aberto) e por listas de status e disciplinas
+def fatiar_cubo(
+    cubo, evento, contrato="Todos", inicio=None, fim=None, status=None, disciplinas=None
+):
+    celulas = cubo[evento]
+    mascara = pd.Series(True, index=celulas.index)
+    if contrato != "Todos":
+        mascara &= celulas["CONTRATO"] == contrato
+    if inicio is not None:
+        mascara &= celulas["DIA"] >= pd.Timestamp(inicio).normalize()
+    if fim is not None:
+        mascara &= celulas["DIA"] <= pd.Timestamp(fim).normalize()
+    if status is not None:
+        mascara &= celulas["STATUS*"].isin(status)
+    if disciplinas is not None:
+        mascara &= celulas["DISCIPLINAS"].isin(disciplinas)
+    return celulas[mascara]
+
+
+# Contadores de um contrato (ou de todos) para o dia e os períodos pedidos
+@dataclass(frozen=True)
+class MetricasContrato:
+    recebidas_dia: int = 0
+    executadas_dia: int = 0
+    recebidas_periodo: dict = field(default_factory=dict)
+
+
+# Resultado do cálculo das métricas diárias para todos os contratos
+@dataclass(frozen=True)
+class MetricasDiarias:
+    por_contrato: dict
+    total: MetricasContrato
+
+    # Métricas de um contrato; "Todos" devolve o total geral e um contrato sem
+    # nenhuma OS, zero em todas as métricas (inclusive nos períodos)
+    def contrato(self, contrato):
+        if contrato == "Todos":
+            return self.total
+        vazio = MetricasContrato(recebidas_periodo=dict.fromkeys(self.total.recebidas_periodo, 0))
+        return self.por_contrato.get(contrato, vazio)
+
+
+# Função para calcular, a partir do cubo e agrupando por contrato, as OS recebidas
+# e executadas no dia e as OS recebidas em cada período de `periodos`
+# (dicionário nome -> (data_inicio, data_fim), limites inclusivos)
+def calcular_metricas_diarias(cubo, data_dia, periodos=None):
+    periodos = periodos or {}
+
+    def _contar(fatia):
+        return fatia.groupby("CONTRATO", dropna=False, observed=True)["QUANTIDADE"].sum()
+
+    colunas = {
+        "recebidas_dia": _contar(fatiar_cubo(cubo, "recebido", inicio=data_dia, fim=data_dia)),
+        "executadas_dia": _contar(
+            fatiar_cubo(cubo, "finalizado", inicio=data_dia, fim=data_dia, status=["EXECUTADO"])
+        ),
+    }
+    for nome, (data_inicio, data_fim) in periodos.items():
+        colunas[nome] = _contar(fatiar_cubo(cubo, "recebido", inicio=data_inicio, fim=data_fim))
+
+    contagens = pd.DataFrame(colunas).fillna(0)
+
+    def _montar(linha):
+        return MetricasContrato(
+            recebidas_dia=int(linha["recebidas_dia"]),
+            executadas_dia=int(linha["executadas_dia"]),
+            recebidas_periodo={nome: int(linha[nome]) for nome in periodos},
+        )
+
+    return MetricasDiarias(
+        por_contrato={contrato: _montar(linha) for contrato, linha in contagens.iterrows()},
+        total=_montar(contagens.sum()),
+    )
@@ -0,0 +1,75 @@
+import math
+
+from utils.importacao import np, pa, pc, pd
+
+# Símbolos descartados antes da conversão ("R$", espaços e pontos de milhar)
+_DESCARTAR = ["R$", " ", "\xa0", "."]
+
+# Marcas de valor negativo: sinal antes ou depois do símbolo da moeda, ou parênteses
+_SINAIS = ["-", "(", ")"]
+
+
+# Função para converter textos "R$ 1.234,56" em float usando os kernels do Arrow,
+# sem nenhuma chamada Python por célula
+def _converter_texto(valores, vazio, invalido, total):
+    soltos = None
+    try:
+        texto = pa.array(valores, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Coluna mista: números soltos são mantidos como estão e só os textos são convertidos
+        serie = pd.Series(valores)
+        eh_texto = serie.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+        soltos = pd.to_numeric(serie.where(~eh_texto), errors="coerce").to_numpy(dtype="float64")
+        texto = pa.array(serie.where(eh_texto), type=pa.string(), from_pandas=True)
+
+    vazios = pc.fill_null(pc.equal(pc.utf8_trim_whitespace(texto), ""), True)
+    totais = pc.fill_null(pc.match_substring(texto, "TOTAL"), False)
+
+    limpo = texto
+    for simbolo in _DESCARTAR:
+        limpo = pc.replace_substring(limpo, simbolo, "")
+    negativos = pc.fill_null(pc.or_(pc.starts_with(limpo, "-"), pc.starts_with(limpo, "(")), False)
+    for simbolo in _SINAIS:
+        limpo = pc.replace_substring(limpo, simbolo, "")
+    limpo = pc.replace_substring(limpo, ",", ".")
+
+    validos = pc.fill_null(pc.match_substring_regex(limpo, r"^\d+(\.\d*)?$"), False)
+    numeros = pc.cast(pc.if_else(validos, limpo, None), pa.float64())
+
+    resultado = numeros.to_numpy(zero_copy_only=False)
+    resultado = np.where(negativos.to_numpy(zero_copy_only=False), -resultado, resultado)
+    resultado = np.where(validos.to_numpy(zero_copy_only=False), resultado, invalido)
+    resultado = np.where(vazios.to_numpy(zero_copy_only=False), vazio, resultado)
+    resultado = np.where(totais.to_numpy(zero_copy_only=False), total, resultado)
+    if soltos is not None:
+        resultado = np.where(np.isnan(soltos), resultado, soltos)
+    return resultado
+
+
+# Função para converter valores monetários no formato brasileiro para float.
+# Aceita uma série ou um DataFrame; no DataFrame todas as colunas de texto são
+# empilhadas e convertidas numa única passada. Células vazias viram `vazio`,
+# linhas marcadas com "TOTAL" viram `total` e textos que não são números viram `invalido`.
+def converter_moeda(valores, vazio=math.nan, invalido=math.nan, total=math.nan):
+    if isinstance(valores, pd.Series):
+        if pd.api.types.is_numeric_dtype(valores):
+            return valores.astype("float64")
+        convertido = _converter_texto(valores.to_numpy(dtype=object), vazio, invalido, total)
+        return pd.Series(convertido, index=valores.index, name=valores.name)
+
+    resultado = valores.copy()
+    textos = []
+    for col in valores.columns:
+        if pd.api.types.is_numeric_dtype(valores[col]):
+            resultado[col] = valores[col].astype("float64")
+        else:
+            textos.append(col)
+
+    if textos:
+        empilhado = valores[textos].to_numpy(dtype=object).ravel(order="F")
+        convertido = _converter_texto(empilhado, vazio, invalido, total)
+        convertido = convertido.reshape((len(valores), len(textos)), order="F")
+        for i, col in enumerate(textos):
+            resultado[col] = convertido[:, i]
+
+    return resultado
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from utils.telemetria import observar
+
+# Perfil ligado em todas as execuções; sem a variável, só quando a URL tem ?perfil=1
+PERFIL_ATIVO = os.environ.get("DASHBOARDS_PERFIL", "") not in ("", "0")
+
+# Arquivo onde cada execução perfilada é acrescentada como uma linha JSON
+ARQUIVO_PERFIL = os.environ.get("DASHBOARDS_PERFIL_ARQUIVO", "perfil.jsonl")
+
+# Execução perfilada da thread atual (cada sessão roda a página na sua própria thread)
+_execucao = threading.local()
+_trava_arquivo = threading.Lock()
+
+# Funções chamadas no início de cada execução de página, para os utilitários que guardam
+# estado por execução (as reexecuções de fragmentos não passam por aqui)
+_ao_iniciar = []
+
+
+# Função para ler a memória residente do processo em MB (None fora do Linux)
+def _memoria():
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Função para abrir o registro de uma seção da execução atual
+def _abrir(execucao, nome, profundidade):
+    registro = {
+        "nome": nome,
+        "profundidade": profundidade,
+        "inicio": time.perf_counter(),
+        "memoria_inicial": _memoria(),
+        "linhas": None,
+    }
+    execucao["secoes"].append(registro)
+    return registro
+
+
+# Função para fechar o registro de uma seção com a duração e a variação de memória
+def _fechar(registro):
+    registro["fim"] = time.perf_counter()
+    memoria = _memoria()
+    if memoria is not None and registro["memoria_inicial"] is not None:
+        registro["memoria"] = memoria - registro["memoria_inicial"]
+
+
+# Função para registrar uma função chamada no início de cada execução de página
+def ao_iniciar_pagina(funcao):
+    _ao_iniciar.append(funcao)
+
+
+# Função para começar o perfil de uma execução da página, chamada no topo de cada página
+# (também avisa as funções registradas em ao_iniciar_pagina). O detalhamento por seção
+# só tem efeito com o perfil ligado (variável DASHBOARDS_PERFIL ou ?perfil=1 na URL);
+# desligado, as seções não medem nada e só a duração total vai para as métricas.
+def iniciar_perfil(pagina):
+    for funcao in _ao_iniciar:
+        funcao()
+    ativo = PERFIL_ATIVO or st.query_params.get("perfil") not in (None, "", "0")
+    _execucao.pagina = (pagina, time.perf_counter())
+    _execucao.atual = None
+    if ativo:
+        _execucao.atual = {
+            "pagina": pagina,
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "inicio": time.perf_counter(),
+            "secoes": [],
+            "pilha": [],
+            "marca": None,
+        }
+
+
+# Função para marcar o início de um trecho da página; o trecho anterior termina aqui.
+# As seções abertas dentro de um trecho aparecem aninhadas a ele.
+def marcar(nome):
+    execucao = getattr(_execucao, "atual", None)
+    if execucao is None:
+        return
+    if execucao["marca"] is not None:
+        _fechar(execucao["marca"])
+    execucao["marca"] = _abrir(execucao, nome, 0)
+
+
+# Gerenciador de contexto para medir uma seção (download, limpeza, agregação, gráfico).
+# Devolve o registro da seção, onde o chamador pode anotar a quantidade de `linhas`.
+@contextmanager
+def secao(nome):
+    execucao = getattr(_execucao, "atual", None)
+    if execucao is None:
+        yield {}
+        return
+    profundidade = len(execucao["pilha"]) + (execucao["marca"] is not None)
+    registro = _abrir(execucao, nome, profundidade)
+    execucao["pilha"].append(registro)
+    try:
+        yield registro
+    finally:
+        execucao["pilha"].pop()
+        _fechar(registro)
+
+
+# Função para acrescentar a execução ao arquivo de perfil (uma linha JSON por execução)
+def _gravar(execucao, total, secoes):
+    linha = {
+        "pagina": execucao["pagina"],
+        "data": execucao["data"],
+        "total_ms": round(total, 3),
+        "secoes": secoes,
+    }
+    with _trava_arquivo, open(ARQUIVO_PERFIL, "a", encoding="utf-8") as arquivo:
+        arquivo.write(json.dumps(linha, ensure_ascii=False, default=str) + "\n")
+
+
+# Função para encerrar o perfil da execução atual: registra a duração nas métricas e,
+# com o perfil ligado, grava a linha no arquivo de perfil e exibe, recolhida no fim da
+# página, a cascata de seções com duração, linhas e memória. O Altair e o pandas só são
+# importados com o perfil ligado.
+def exibir_perfil():
+    pagina = getattr(_execucao, "pagina", None)
+    if pagina is not None:
+        _execucao.pagina = None
+        observar("dashboards_execucao_segundos", time.perf_counter() - pagina[1], pagina=pagina[0])
+
+    execucao = getattr(_execucao, "atual", None)
+    if execucao is None:
+        return
+    _execucao.atual = None
+
+    import altair as alt
+    import pandas as pd
+
+    if execucao["marca"] is not None:
+        _fechar(execucao["marca"])
+    total = (time.perf_counter() - execucao["inicio"]) * 1000
+
+    # Seções que não terminaram (interrompidas por uma exceção) ficam de fora
+    registros = [
+        {
+            "ordem": ordem,
+            "seção": f"{ordem + 1}. {'  ' * registro['profundidade']}{registro['nome']}",
+            "profundidade": registro["profundidade"],
+            "início (ms)": round((registro["inicio"] - execucao["inicio"]) * 1000, 3),
+            "fim (ms)": round((registro["fim"] - execucao["inicio"]) * 1000, 3),
+            "duração (ms)": round((registro["fim"] - registro["inicio"]) * 1000, 3),
+            "linhas": registro["linhas"],
+            "memória (MB)": None if registro.get("memoria") is None else round(registro["memoria"], 3),
+        }
+        for ordem, registro in enumerate(r for r in execucao["secoes"] if "fim" in r)
+    ]
+    secoes = pd.DataFrame(
+        registros,
+        columns=[
+            "ordem", "seção", "profundidade", "início (ms)", "fim (ms)", "duração (ms)", "linhas", "memória (MB)",
+        ],
+    )
+    try:
+        _gravar(execucao, total, registros)
+    except OSError as e:
+        st.warning(f"Não foi possível gravar o perfil em {ARQUIVO_PERFIL}: {e}")
+
+    with st.expander(f"Perfil da execução ({total:.0f} ms)"):
+        cascata = alt.Chart(secoes).mark_bar().encode(
+            x=alt.X(field="início (ms)", type="quantitative", title="ms desde o início da execução"),
+            x2=alt.X2(field="fim (ms)"),
+            y=alt.Y(field="seção", type="nominal", sort=alt.EncodingSortField(field="ordem"), title=None),
+            color=alt.Color(field="profundidade", type="ordinal", legend=None),
+            tooltip=["seção", "duração (ms)", "linhas", "memória (MB)"],
+        ).properties(
+            height=max(20 * len(secoes), 100)
+        )
+        st.altair_chart(cascata, use_container_width=True)
+        st.dataframe(secoes.drop(columns=["ordem", "fim (ms)"]), hide_index=True, use_container_width=True)
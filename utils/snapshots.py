@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from utils.categorias import empilhar
+from utils.importacao import np, pa, pd, pq
+
+# Diretório onde ficam os snapshots Parquet das planilhas já tipadas
+DIRETORIO_SNAPSHOTS = os.environ.get("DASHBOARDS_SNAPSHOTS", "snapshots")
+
+# Chave dos metadados próprios (validadores HTTP e versão) no esquema do Parquet
+_CHAVE_METADADOS = b"dashboards"
+
+# Partição das linhas sem data nos snapshots particionados (as demais são "AAAA-MM")
+SEM_DATA = "sem-data"
+
+# Coluna com a posição de cada linha na planilha, gravada nas partições para a tabela
+# ser remontada na ordem original
+_COLUNA_POSICAO = "__posicao"
+
+logger = logging.getLogger(__name__)
+
+
+def _caminho(nome):
+    return os.path.join(DIRETORIO_SNAPSHOTS, f"{nome}.parquet")
+
+
+def _diretorio(nome):
+    return os.path.join(DIRETORIO_SNAPSHOTS, nome)
+
+
+def _caminho_manifesto(nome):
+    return os.path.join(_diretorio(nome), "manifesto.json")
+
+
+# Função para ler o manifesto de um snapshot particionado (vazio se não houver)
+def _ler_manifesto(nome):
+    try:
+        with open(_caminho_manifesto(nome), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+
+# Função para gravar uma tabela num arquivo Parquet de forma atômica
+def _gravar_parquet(arrow, caminho):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(arrow, temporario)
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+# Função para dividir a tabela em partições por ano e mês de `coluna`: devolve, para
+# cada partição, as posições das suas linhas na tabela
+def _particionar(tabela, coluna):
+    meses = tabela[coluna].dt.to_period("M")
+    grupos = pd.Series(np.arange(len(tabela))).groupby(meses.to_numpy(), dropna=False, sort=True).indices
+    return {SEM_DATA if pd.isna(mes) else str(mes): posicoes for mes, posicoes in grupos.items()}
+
+
+# Função para gravar o snapshot de uma planilha dividido em partições por ano e mês de
+# `coluna`. O arquivo de cada partição leva no nome o hash do conteúdo, então só as
+# partições que mudaram são regravadas; o manifesto, gravado por último e de forma
+# atômica, lista os arquivos da versão atual, e os que saíram dele são apagados.
+def _salvar_particoes(nome, tabela, metadados, coluna):
+    diretorio = _diretorio(nome)
+    os.makedirs(diretorio, exist_ok=True)
+    anteriores = set(_ler_manifesto(nome).get("particoes", {}).values())
+
+    # Conversão para Arrow e hash das linhas feitos uma vez para a tabela inteira
+    posicionada = tabela.assign(**{_COLUNA_POSICAO: np.arange(len(tabela))})
+    arrow = pa.Table.from_pandas(posicionada, preserve_index=False)
+    hashes = pd.util.hash_pandas_object(posicionada, index=False).to_numpy()
+
+    particoes = {}
+    for chave, posicoes in _particionar(tabela, coluna).items():
+        conteudo = hashes[posicoes].tobytes()
+        arquivo = f"{chave}.{hashlib.sha256(conteudo).hexdigest()[:16]}.parquet"
+        caminho = os.path.join(diretorio, arquivo)
+        if arquivo not in anteriores or not os.path.exists(caminho):
+            _gravar_parquet(arrow.take(posicoes), caminho)
+        particoes[chave] = arquivo
+
+    manifesto = _caminho_manifesto(nome)
+    temporario = f"{manifesto}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump({"coluna": coluna, "metadados": metadados or {}, "particoes": particoes}, arquivo)
+    os.replace(temporario, manifesto)
+
+    for arquivo in os.listdir(diretorio):
+        if arquivo.endswith(".parquet") and arquivo not in particoes.values():
+            os.remove(os.path.join(diretorio, arquivo))
+    if os.path.exists(_caminho(nome)):
+        os.remove(_caminho(nome))
+
+
+# Função para gravar o snapshot de uma planilha tipada (datas, valores e categorias
+# são preservados pelo esquema do Parquet). A gravação é atômica: a página nunca lê
+# um arquivo pela metade. `metadados` guarda os validadores do último download. Com
+# `particao` (coluna de datas), o snapshot é dividido em partições por ano e mês.
+def salvar_snapshot(nome, tabela, metadados=None, particao=None):
+    if particao is not None and pd.api.types.is_datetime64_any_dtype(tabela[particao]):
+        try:
+            _salvar_particoes(nome, tabela, metadados, particao)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning("Não foi possível gravar o snapshot de %s: %s", nome, e)
+        return
+
+    caminho = _caminho(nome)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(DIRETORIO_SNAPSHOTS, exist_ok=True)
+        arrow = pa.Table.from_pandas(tabela)
+        if metadados:
+            esquema = dict(arrow.schema.metadata or {})
+            esquema[_CHAVE_METADADOS] = json.dumps(metadados).encode()
+            arrow = arrow.replace_schema_metadata(esquema)
+        pq.write_table(arrow, temporario)
+        os.replace(temporario, caminho)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning("Não foi possível gravar o snapshot de %s: %s", nome, e)
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+# Função para marcar um snapshot como conferido agora, sem regravá-lo
+def renovar_snapshot(nome):
+    caminho = _caminho_manifesto(nome)
+    if not os.path.exists(caminho):
+        caminho = _caminho(nome)
+    try:
+        os.utime(caminho)
+    except OSError:
+        pass
+
+
+# Função para ler os metadados gravados junto com o snapshot (vazio se não houver)
+def ler_metadados_snapshot(nome):
+    manifesto = _ler_manifesto(nome)
+    if manifesto:
+        return manifesto.get("metadados", {})
+    try:
+        esquema = pq.read_schema(_caminho(nome))
+    except (OSError, pa.ArrowException):
+        return {}
+    bruto = (esquema.metadata or {}).get(_CHAVE_METADADOS)
+    return json.loads(bruto) if bruto else {}
+
+
+# Função para listar os arquivos Parquet do snapshot de uma planilha, para leitura
+# direta por outro motor de consultas. Vazio quando o snapshot não é da `versao` pedida.
+def arquivos_snapshot(nome, versao):
+    if versao is None or ler_metadados_snapshot(nome).get("versao") != versao:
+        return []
+    manifesto = _ler_manifesto(nome)
+    if manifesto:
+        return [os.path.join(_diretorio(nome), arquivo) for arquivo in manifesto["particoes"].values()]
+    return [_caminho(nome)]
+
+
+# Função para saber se a partição "AAAA-MM" cruza o intervalo de `inicio` (inclusivo)
+# até `fim` (exclusivo); a partição sem data só entra quando não há limites
+def _particao_no_intervalo(chave, inicio, fim):
+    if chave == SEM_DATA:
+        return inicio is None and fim is None
+    comeco = pd.Timestamp(f"{chave}-01")
+    termino = comeco + pd.offsets.MonthBegin()
+    return (inicio is None or termino > pd.Timestamp(inicio)) and (fim is None or comeco < pd.Timestamp(fim))
+
+
+# Função para ler um snapshot particionado: só as partições que cruzam o intervalo
+# pedido, remontadas na ordem original das linhas e com a posição de cada linha na
+# planilha como índice (o mesmo das linhas filtradas da tabela em memória)
+def _ler_particoes(nome, particoes, colunas, inicio, fim):
+    selecionadas = [arquivo for chave, arquivo in sorted(particoes.items()) if _particao_no_intervalo(chave, inicio, fim)]
+    if colunas is not None:
+        colunas = [*colunas, _COLUNA_POSICAO]
+
+    partes = [
+        pq.read_table(os.path.join(_diretorio(nome), arquivo), columns=colunas, memory_map=True).to_pandas()
+        for arquivo in selecionadas or list(particoes.values())[:1]
+    ]
+    if not partes:
+        return None
+    tabela = empilhar(partes)
+    if not selecionadas:
+        tabela = tabela.iloc[:0]
+    tabela = tabela.sort_values(_COLUNA_POSICAO).set_index(_COLUNA_POSICAO).rename_axis(None)
+    if len(selecionadas) == len(particoes):
+        tabela = tabela.reset_index(drop=True)
+    return tabela
+
+
+# Função para ler o último snapshot de uma planilha, apenas com as colunas pedidas.
+# Devolve None quando não há snapshot ou quando ele é mais antigo que `idade_maxima` segundos.
+# Num snapshot particionado, `inicio` e `fim` limitam a leitura às partições que cruzam
+# o intervalo (as linhas das pontas ainda precisam ser filtradas por quem chama).
+def ler_snapshot(nome, colunas=None, idade_maxima=None, inicio=None, fim=None):
+    manifesto = _ler_manifesto(nome)
+    caminho = _caminho_manifesto(nome) if manifesto else _caminho(nome)
+    try:
+        idade = time.time() - os.path.getmtime(caminho)
+    except OSError:
+        return None
+    if idade_maxima is not None and idade > idade_maxima:
+        return None
+
+    if manifesto:
+        try:
+            return _ler_particoes(nome, manifesto["particoes"], colunas, inicio, fim)
+        except (OSError, pa.ArrowException) as e:
+            # Partição apagada por uma gravação mais nova entre a leitura do manifesto e a do arquivo
+            logger.warning("Não foi possível ler o snapshot de %s: %s", nome, e)
+            return None
+
+    tabela = pq.read_table(caminho, columns=colunas, memory_map=True)
+    return tabela.to_pandas()
+
+
+def _caminho_csv(nome):
+    return os.path.join(DIRETORIO_SNAPSHOTS, f"{nome}.csv")
+
+
+# Função para guardar o CSV baixado de uma planilha, de onde as colunas fora da
+# tabela principal são lidas sob demanda. A gravação também é atômica.
+def salvar_csv(nome, corpo):
+    caminho = _caminho_csv(nome)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(DIRETORIO_SNAPSHOTS, exist_ok=True)
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(corpo)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        logger.warning("Não foi possível guardar o CSV de %s: %s", nome, e)
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+# Função para ler o último CSV guardado de uma planilha (None se não houver)
+def ler_csv(nome):
+    try:
+        with open(_caminho_csv(nome), "rb") as arquivo:
+            return arquivo.read()
+    except OSError:
+        return None
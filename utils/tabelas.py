@@ -0,0 +1,79 @@
+import math
+
+import streamlit as st
+
+from utils.importacao import np, pd
+
+# Quantidade padrão de linhas por página das tabelas paginadas
+LINHAS_POR_PAGINA = 50
+
+# Opção do seletor de ordenação que mantém a ordem original da tabela
+SEM_ORDENACAO = "(ordem original)"
+
+
+# Função para marcar as linhas cuja `coluna` contém o texto buscado (sem diferenciar
+# maiúsculas). Em colunas categóricas a busca percorre só as categorias distintas.
+def _filtrar(tabela, coluna, busca):
+    serie = tabela[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        encontradas = serie.cat.categories.astype(str).str.contains(busca, case=False, regex=False)
+        return serie.cat.codes.isin(np.flatnonzero(encontradas)).to_numpy()
+    return serie.astype(str).str.contains(busca, case=False, regex=False, na=False).to_numpy()
+
+
+# Função para paginar uma tabela: mantém as linhas cuja `coluna_busca` contém `busca`,
+# ordena por `ordenar_por` e devolve (linhas da página, página, total de páginas,
+# total de linhas), com a página limitada ao intervalo válido
+def paginar(tabela, pagina=1, por_pagina=LINHAS_POR_PAGINA, coluna_busca=None, busca="",
+            ordenar_por=None, decrescente=False):
+    posicoes = np.arange(len(tabela))
+    if coluna_busca is not None and busca:
+        posicoes = posicoes[_filtrar(tabela, coluna_busca, busca)]
+
+    # Ordena só a coluna escolhida (nas linhas filtradas) e não a tabela inteira
+    if ordenar_por is not None:
+        chaves = tabela[ordenar_por].iloc[posicoes].reset_index(drop=True)
+        ordem = chaves.sort_values(ascending=not decrescente, kind="stable", na_position="last").index
+        posicoes = posicoes[ordem.to_numpy()]
+
+    total_linhas = len(posicoes)
+    total_paginas = max(math.ceil(total_linhas / por_pagina), 1)
+    pagina = min(max(pagina, 1), total_paginas)
+    inicio = (pagina - 1) * por_pagina
+    return tabela.iloc[posicoes[inicio:inicio + por_pagina]], pagina, total_paginas, total_linhas
+
+
+# Função para exibir uma tabela grande paginada: busca, ordenação e paginação são
+# feitas no servidor e só as linhas da página atual são enviadas ao navegador.
+# `chave` identifica os controles da tabela no estado da sessão. Os seletores mostram
+# o nome de cada coluna como texto, mas devolvem o rótulo original (que pode ser um
+# número ou uma data), usado para acessar a coluna na tabela.
+def exibir_tabela_paginada(tabela, chave, por_pagina=LINHAS_POR_PAGINA):
+    colunas = list(tabela.columns)
+    col_busca, col_texto, col_ordem, col_sentido, col_pagina = st.columns([2, 3, 2, 1, 1])
+    coluna_busca = col_busca.selectbox(
+        "Buscar na coluna", colunas, format_func=str, key=f"{chave}_coluna_busca"
+    )
+    busca = col_texto.text_input("Buscar", key=f"{chave}_busca")
+    ordenar_por = col_ordem.selectbox(
+        "Ordenar por", [SEM_ORDENACAO] + colunas, format_func=str, key=f"{chave}_ordem"
+    )
+    decrescente = col_sentido.checkbox("Decrescente", key=f"{chave}_decrescente")
+    pagina = col_pagina.number_input("Página", min_value=1, step=1, key=f"{chave}_pagina")
+
+    fatia, pagina, total_paginas, total_linhas = paginar(
+        tabela,
+        pagina=int(pagina),
+        por_pagina=por_pagina,
+        coluna_busca=coluna_busca,
+        busca=busca,
+        ordenar_por=None if ordenar_por == SEM_ORDENACAO else ordenar_por,
+        decrescente=decrescente,
+    )
+    st.dataframe(fatia)
+
+    inicio = (pagina - 1) * por_pagina
+    st.caption(
+        f"Linhas {min(inicio + 1, total_linhas)}–{inicio + len(fatia)} de {total_linhas} "
+        f"(página {pagina} de {total_paginas})"
+    )
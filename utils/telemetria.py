@@ -0,0 +1,204 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Porta onde /metrics é servido no formato de texto do Prometheus (desligado se vazio)
+PORTA_METRICAS = os.environ.get("DASHBOARDS_METRICAS_PORTA", "")
+
+# Endereço da porta de métricas (só a máquina local, a menos que seja configurado)
+HOST_METRICAS = os.environ.get("DASHBOARDS_METRICAS_HOST", "127.0.0.1")
+
+# Arquivo regravado periodicamente com as métricas, para o coletor de arquivos de texto
+# do node_exporter (desligado se vazio). "{pid}" no nome separa as réplicas de uma máquina.
+ARQUIVO_METRICAS = os.environ.get("DASHBOARDS_METRICAS_ARQUIVO", "")
+
+# Intervalo (em segundos) entre gravações do arquivo de métricas
+INTERVALO_METRICAS = int(os.environ.get("DASHBOARDS_METRICAS_INTERVALO", 15))
+
+# Limites dos baldes dos histogramas de duração, em segundos
+BALDES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Métricas exportadas: nome -> (tipo, descrição)
+METRICAS = {
+    "dashboards_download_segundos": ("histogram", "Duração da requisição de cada planilha"),
+    "dashboards_downloads_total": (
+        "counter",
+        "Downloads por resultado: novo (conteúdo mudou), igual (mesmo hash), "
+        "nao_modificado (304) ou erro",
+    ),
+    "dashboards_download_bytes_total": ("counter", "Bytes baixados de cada planilha"),
+    "dashboards_leitura_segundos": ("histogram", "Duração da leitura do CSV de cada planilha"),
+    "dashboards_preparacao_segundos": ("histogram", "Duração da limpeza e tipagem de cada planilha"),
+    "dashboards_linhas": ("gauge", "Linhas da última versão de cada planilha"),
+    "dashboards_cache_total": (
+        "counter",
+        "Consultas aos caches (planilha, derivado, grafico) por resultado: hit, miss, "
+        "stale (versão antiga servida ou substituída) ou delta (derivado atualizado só "
+        "com as linhas alteradas)",
+    ),
+    "dashboards_linhas_alteradas_total": (
+        "counter",
+        "Linhas aplicadas a cada planilha sem prepará-la inteira: inseridas, atualizadas ou removidas",
+    ),
+    "dashboards_execucao_segundos": ("histogram", "Duração de cada execução (rerun) das páginas"),
+}
+
+# Valores atuais, por (métrica, rótulos ordenados)
+_valores = defaultdict(int)
+_histogramas = {}
+_trava = threading.Lock()
+
+# Exportação iniciada (uma única vez por processo)
+_exportando = False
+
+# Outras rotas da porta de métricas: caminho -> função que devolve (código HTTP, texto)
+_rotas = {}
+
+logger = logging.getLogger(__name__)
+
+
+# Função para somar `valor` a um contador
+def contar(nome, valor=1, **rotulos):
+    with _trava:
+        _valores[(nome, tuple(sorted(rotulos.items())))] += valor
+
+
+# Função para definir o valor atual de um medidor (gauge)
+def definir(nome, valor, **rotulos):
+    with _trava:
+        _valores[(nome, tuple(sorted(rotulos.items())))] = valor
+
+
+# Função para registrar uma observação num histograma
+def observar(nome, valor, **rotulos):
+    chave = (nome, tuple(sorted(rotulos.items())))
+    with _trava:
+        baldes, soma, quantidade = _histogramas.get(chave) or ([0] * len(BALDES_SEGUNDOS), 0.0, 0)
+        posicao = bisect.bisect_left(BALDES_SEGUNDOS, valor)
+        if posicao < len(baldes):
+            baldes[posicao] += 1
+        _histogramas[chave] = (baldes, soma + valor, quantidade + 1)
+
+
+# Gerenciador de contexto para observar a duração do bloco num histograma
+@contextmanager
+def cronometrar(nome, **rotulos):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(nome, time.perf_counter() - inicio, **rotulos)
+
+
+# Função para montar os rótulos de uma amostra, com os valores escapados como pede o formato
+def _rotulos(pares):
+    if not pares:
+        return ""
+    escapados = (
+        (chave, str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for chave, valor in pares
+    )
+    return "{" + ",".join(f'{chave}="{valor}"' for chave, valor in escapados) + "}"
+
+
+# Função para gerar o texto de exposição do Prometheus com os valores atuais
+def exportar():
+    with _trava:
+        valores = dict(_valores)
+        histogramas = {chave: (list(b), s, q) for chave, (b, s, q) in _histogramas.items()}
+
+    linhas = []
+    for nome, (tipo, descricao) in METRICAS.items():
+        linhas.append(f"# HELP {nome} {descricao}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        if tipo == "histogram":
+            for (metrica, pares), (baldes, soma, quantidade) in sorted(histogramas.items()):
+                if metrica != nome:
+                    continue
+                acumulado = 0
+                for limite, contagem in zip(BALDES_SEGUNDOS, baldes):
+                    acumulado += contagem
+                    linhas.append(f"{nome}_bucket{_rotulos(pares + (('le', limite),))} {acumulado}")
+                linhas.append(f"{nome}_bucket{_rotulos(pares + (('le', '+Inf'),))} {quantidade}")
+                linhas.append(f"{nome}_sum{_rotulos(pares)} {soma}")
+                linhas.append(f"{nome}_count{_rotulos(pares)} {quantidade}")
+        else:
+            for (metrica, pares), valor in sorted(valores.items()):
+                if metrica == nome:
+                    linhas.append(f"{nome}{_rotulos(pares)} {valor}")
+    return "\n".join(linhas) + "\n"
+
+
+# Função para servir mais um caminho na porta de métricas (verificações de prontidão)
+def registrar_rota(caminho, funcao):
+    _rotas[caminho] = funcao
+
+
+# Respostas do endpoint /metrics e das rotas registradas
+class _Requisicao(BaseHTTPRequestHandler):
+    def do_GET(self):
+        caminho = self.path.split("?")[0]
+        if caminho in ("/metrics", "/"):
+            codigo, texto = 200, exportar()
+        elif caminho in _rotas:
+            codigo, texto = _rotas[caminho]()
+        else:
+            self.send_error(404)
+            return
+        corpo = texto.encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+# Função para regravar o arquivo de métricas (gravação atômica, como os snapshots)
+def _gravar_arquivo(caminho):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(exportar())
+        os.replace(temporario, caminho)
+    except OSError as e:
+        logger.warning("Não foi possível gravar as métricas em %s: %s", caminho, e)
+
+
+def _gravar_periodicamente(caminho):
+    while True:
+        _gravar_arquivo(caminho)
+        time.sleep(INTERVALO_METRICAS)
+
+
+# Função para começar a exportar as métricas (uma única vez por processo): na porta
+# DASHBOARDS_METRICAS_PORTA e/ou no arquivo DASHBOARDS_METRICAS_ARQUIVO. Sem nenhuma
+# das duas variáveis, as métricas só são acumuladas em memória.
+def iniciar_exportacao():
+    global _exportando
+    with _trava:
+        if _exportando:
+            return
+        _exportando = True
+
+    if PORTA_METRICAS:
+        try:
+            servidor = ThreadingHTTPServer((HOST_METRICAS, int(PORTA_METRICAS)), _Requisicao)
+        except (OSError, ValueError) as e:
+            logger.warning("Não foi possível servir as métricas na porta %s: %s", PORTA_METRICAS, e)
+        else:
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+
+    if ARQUIVO_METRICAS:
+        caminho = ARQUIVO_METRICAS.format(pid=os.getpid())
+        threading.Thread(
+            target=_gravar_periodicamente, args=(caminho,), name="metricas-arquivo", daemon=True
+        ).start()